@@ -0,0 +1,6 @@
+"""Headless benchmarks. Run a module with python -m benchmarks.<name>"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
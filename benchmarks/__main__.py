@@ -0,0 +1,132 @@
+"""Runs the benchmark suite, or compares two of its results.
+
+Usage:
+    python -m benchmarks run [--json FILE] [--filter TEXT] [--repeat N]
+    python -m benchmarks compare BASELINE CURRENT [--threshold FRACTION]
+
+compare exits with status 1 when a case got slower than the threshold.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from timeit import Timer
+
+import numpy as np
+import pygame
+
+from .suite import CASES
+
+MIN_SECONDS = 0.1  # Each timing loop runs at least this long
+
+
+def measure(function, repeat):
+    """Returns the best and median seconds per call, and calls per loop."""
+    timer = Timer(function)
+    number = timer.autorange()[0]
+    number = max(1, int(number * MIN_SECONDS / 0.2))
+    loops = timer.repeat(repeat=repeat, number=number)
+    seconds = sorted(t / number for t in loops)
+    return seconds[0], seconds[len(seconds) // 2], number
+
+
+def run(args):
+    pygame.init()
+    results = {}
+    for name, setup, per in CASES:
+        if args.filter and args.filter not in name:
+            continue
+        best, median, number = measure(setup(), args.repeat)
+        results[name] = {
+            "seconds": best / per,
+            "median": median / per,
+            "number": number,
+            "per": per,
+        }
+        print("%-44s %12.3f us" % (name, best / per * 1e6), flush=True)
+
+    if args.json:
+        report = {
+            "meta": {
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "platform": platform.platform(),
+            },
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+    return 0
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.current) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    for name in sorted(set(baseline) | set(current)):
+        if name not in current:
+            print("%-44s %12s" % (name, "missing"))
+            continue
+        if name not in baseline:
+            print("%-44s %12s" % (name, "new"))
+            continue
+        ratio = current[name]["seconds"] / baseline[name]["seconds"]
+        if ratio > 1.0 + args.threshold:
+            flag = "SLOWER"
+            regressions += 1
+        elif ratio < 1.0 / (1.0 + args.threshold):
+            flag = "faster"
+        else:
+            flag = ""
+        print(
+            "%-44s %12.3f us %12.3f us  x%5.2f  %s"
+            % (
+                name,
+                baseline[name]["seconds"] * 1e6,
+                current[name]["seconds"] * 1e6,
+                ratio,
+                flag,
+            )
+        )
+    print("%i regressions past %.0f%%" % (regressions, args.threshold * 100.0))
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command")
+
+    runner = commands.add_parser("run", help="times every case")
+    runner.add_argument("--json", metavar="FILE", help="writes results to FILE")
+    runner.add_argument(
+        "--filter", metavar="TEXT", help="only runs cases whose name has TEXT"
+    )
+    runner.add_argument("--repeat", type=int, default=5)
+    runner.set_defaults(function=run)
+
+    comparer = commands.add_parser("compare", help="flags regressions")
+    comparer.add_argument("baseline")
+    comparer.add_argument("current")
+    comparer.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown tolerated, as a fraction (default 0.1)",
+    )
+    comparer.set_defaults(function=compare)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.error("a command is required, run or compare")
+    return args.function(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Times baking the sprites of a level on asset pools of several sizes.
+
+Each pool bakes one job per block, as levels used to be prepared, and
+batches of blocks per job, as prepare_level does. The main thread baking
+them all itself is the baseline.
+"""
+import os
+from timeit import default_timer
+
+import pygame
+
+from src import game as gamemodule
+from src.assets import AssetPipeline
+
+from .levels import dense_level
+
+RUNS = 3
+
+
+def best(bake):
+    """Returns the best seconds bake takes from an empty cache."""
+    times = []
+    for _ in range(RUNS):
+        gamemodule.silhouettes.clear()
+        start = default_timer()
+        bake()
+        times.append(default_timer() - start)
+    return min(times)
+
+
+def bake_serial(level):
+    for block in level.packedBlocks:
+        gamemodule.bake_sprites(block)
+
+
+def bake_each(assets, level):
+    for block in level.packedBlocks:
+        assets.submit(gamemodule.bake_sprites, block)
+    assets.wait()
+
+
+def bake_batched(assets, level):
+    assets.submit_batches(gamemodule.bake_sprites, level.packedBlocks)
+    assets.wait()
+
+
+def main():
+    pygame.init()
+    builtin = gamemodule.Level()
+    builtin.load()
+    levels = ("built-in", builtin), ("dense 2000", dense_level(2000))
+    for name, level in levels:
+        serial = best(lambda: bake_serial(level))
+        print("%-10s  main thread     %8.2f ms" % (name, serial * 1000.0))
+        for workers in sorted(set([1, 2, 4, os.cpu_count()])):
+            assets = AssetPipeline(workers)
+            for kind, bake in ("each", bake_each), ("batched", bake_batched):
+                seconds = best(lambda: bake(assets, level))
+                print(
+                    "%-10s  %2i workers %-7s %8.2f ms  x%.2f"
+                    % (name, workers, kind, seconds * 1000.0, serial / seconds)
+                )
+            assets.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Times ball against ball collisions as the number of balls grows.
+
+Balls are spread at a constant density, so a linear broad phase keeps the
+time per ball flat. The all pairs test is shown for comparison.
+"""
+from timeit import default_timer
+
+import numpy as np
+
+from src.game import BallBatch
+
+STEPS = 20
+AREA_PER_BALL = 40.0 * 40.0
+
+
+def make_balls(count, seed=0):
+    rng = np.random.RandomState(seed)
+    side = (count * AREA_PER_BALL) ** 0.5
+    balls = BallBatch(count)
+    for x, y, r, vx, vy in zip(
+        rng.uniform(0.0, side, count).tolist(),
+        rng.uniform(0.0, side, count).tolist(),
+        rng.uniform(4.0, 12.0, count).tolist(),
+        rng.uniform(-1.0, 1.0, count).tolist(),
+        rng.uniform(-1.0, 1.0, count).tolist(),
+    ):
+        balls.add(x, y, r, vx, vy)
+    return balls
+
+
+def all_pairs(balls):
+    """Returns the number of touching pairs, testing every pair."""
+    n = balls.count
+    x, y, r = balls.x[:n], balls.y[:n], balls.r[:n]
+    a, b = np.triu_indices(n, 1)
+    dx = x[a] - x[b]
+    dy = y[a] - y[b]
+    reach = r[a] + r[b]
+    return int(np.count_nonzero(dx * dx + dy * dy < reach * reach))
+
+
+def main():
+    for count in 250, 500, 1000, 2000, 4000, 8000, 16000:
+        balls = make_balls(count)
+        pairs = 0
+        start = default_timer()
+        for _ in range(STEPS):
+            balls.update()
+            pairs += balls.collide()
+        tSweep = (default_timer() - start) / STEPS
+
+        tAll = None
+        if count <= 4000:
+            balls = make_balls(count)
+            start = default_timer()
+            for _ in range(STEPS):
+                balls.update()
+                all_pairs(balls)
+            tAll = (default_timer() - start) / STEPS
+
+        print(
+            "%5i balls  %5i pairs/step  sort and sweep %8.3f ms %6.2f us/ball"
+            "  all pairs %s"
+            % (
+                count,
+                pairs // STEPS,
+                tSweep * 1000.0,
+                tSweep / count * 1e6,
+                "%8.3f ms" % (tAll * 1000.0) if tAll is not None else "-",
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
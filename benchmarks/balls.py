@@ -0,0 +1,43 @@
+"""Times Game.updateDynamics with many balls in play."""
+import random
+from timeit import default_timer
+
+import pygame
+
+from src.event import EventHandler
+from src.game import Game
+
+TICKS = 60
+
+
+def make_game():
+    main = EventHandler()
+    main.register("quit", "input")
+    game = Game(main)
+    game.start()
+    return game
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    random.seed(0)
+    for count in 10, 100, 1000, 5000:
+        game = make_game()
+        for _ in range(count):
+            game.balls.add(
+                random.uniform(20.0, 940.0),
+                random.uniform(20.0, 200.0),
+                12,
+                random.uniform(-2.0, 2.0),
+                random.uniform(-2.0, 2.0),
+            )
+        start = default_timer()
+        for _ in range(TICKS):
+            game.updateDynamics()
+        elapsed = (default_timer() - start) / TICKS
+        print("%5i balls  %8.3f ms/tick" % (count, elapsed * 1000.0))
+
+
+if __name__ == "__main__":
+    main()
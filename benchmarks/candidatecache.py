@@ -0,0 +1,74 @@
+"""Broad phase time with and without the per ball candidate cache.
+
+Balls bounce around a dense level, once timed, once profiled to count the
+index nodes visited and the ones the cache saved.
+"""
+import random
+from timeit import default_timer
+
+from src.game import Game
+from src.profiler import profiler
+
+from .levels import dense_level
+
+BALLS = 100
+TICKS = 200
+
+
+def playing_game(spatialIndex, cache):
+    random.seed(0)
+    game = Game()
+    game.start(dense_level(2000))
+    game.level.spatialIndex = spatialIndex
+    game.level.makeIndexes()
+    game.level.blockIndex.insert_many(game.level.blocks)
+    game.candidateCache = cache
+    game.ballCollisions = False
+    for _ in range(BALLS):
+        game.balls.add(
+            random.uniform(20.0, 940.0),
+            random.uniform(20.0, 200.0),
+            12,
+            random.uniform(-2.0, 2.0),
+            random.uniform(-2.0, 2.0),
+        )
+    return game
+
+
+def run(game):
+    start = default_timer()
+    for _ in range(TICKS):
+        game.updateDynamics()
+    return (default_timer() - start) / TICKS
+
+
+def main():
+    for spatialIndex in "quadtree", "grid", "bvh":
+        for cache in False, True:
+            seconds = run(playing_game(spatialIndex, cache))
+
+            game = playing_game(spatialIndex, cache)
+            profiler.enabled = True
+            profiler.clear()
+            run(game)
+            counters = profiler.counters
+            profiler.enabled = False
+
+            candidates = game.balls.candidates
+            print(
+                "%-8s  cache %-5s  %7.3f ms/tick  nodes %8i  saved %8i  "
+                "narrow tests %7i  hit rate %5.1f%%"
+                % (
+                    spatialIndex,
+                    cache,
+                    seconds * 1000.0,
+                    counters.get("nodes", 0),
+                    candidates.nodesSaved,
+                    counters.get("narrow tests", 0),
+                    candidates.hitRate * 100.0,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Times hit and hit_circle of each primitive against its compiled shape."""
+import random
+from timeit import default_timer
+
+from src.physics.compiled import compile_shape
+
+from .narrowphase import shapes
+
+QUERIES = 20000
+
+
+def best(function, queries):
+    times = []
+    for _ in range(5):
+        start = default_timer()
+        for args in queries:
+            function(*args)
+        times.append(default_timer() - start)
+    return min(times) / len(queries)
+
+
+def main():
+    random.seed(0)
+    queries = [
+        (
+            random.uniform(0.0, 200.0),
+            random.uniform(0.0, 200.0),
+            random.uniform(4.0, 16.0),
+        )
+        for _ in range(QUERIES)
+    ]
+    points = [(x, y) for x, y, r in queries]
+    for shape in shapes():
+        compiled = compile_shape(shape)
+        for name, args in ("hit", points), ("hit_circle", queries):
+            tShape = best(getattr(shape, name), args)
+            tCompiled = best(getattr(compiled, name), args)
+            print(
+                "%-10s %-10s  primitive %6.3f us  compiled %6.3f us  x%.2f"
+                % (
+                    type(shape).__name__,
+                    name,
+                    tShape * 1e6,
+                    tCompiled * 1e6,
+                    tShape / tCompiled,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Frame time and pixels presented, full redraws against dirty rects."""
+import random
+from timeit import default_timer
+
+import pygame
+
+from src.game import Game
+from src.render import render_level
+from src.settings import COLOR0
+
+from .levels import dense_level
+
+FRAMES = 300
+BLOCKS = 2000
+
+
+def full_draw(game, display):
+    """Game.draw as it was before the compositor: everything, every frame."""
+    display.fill(COLOR0)
+    render_level(display, game.level)
+    game.emitter.draw(display)
+    game.catcher.draw(display)
+    game.balls.draw(display)
+    game.particleSystem.draw(display)
+    game.GUI.draw(display)
+    pygame.display.flip()
+    return display.get_width() * display.get_height()
+
+
+def dirty_draw(game, display):
+    rects = game.draw(display)
+    if rects is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(rects)
+    return game.compositor.pixels
+
+
+def run(draw, display):
+    random.seed(0)
+    game = Game()
+    game.start()
+    game.level = dense_level(BLOCKS)
+    game.compositor.bake(game.level)
+    drawTime = 0.0
+    pixels = 0
+    for frame in range(FRAMES):
+        if frame % 60 == 0:
+            game.avaibleBalls += 1
+            game.launchBall(random.uniform(0.3, 2.8))
+        game.update()
+        start = default_timer()
+        pixels += draw(game, display)
+        drawTime += default_timer() - start
+    return drawTime / FRAMES, pixels / FRAMES
+
+
+def main():
+    pygame.init()
+    display = pygame.display.set_mode((960, 540))
+    for name, draw in ("full", full_draw), ("dirty", dirty_draw):
+        frameTime, pixels = run(draw, display)
+        print(
+            "%-5s  %6.3f ms/frame  %8.0f pixels/frame"
+            % (name, frameTime * 1000.0, pixels)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""The distance field collision mode against the discrete one.
+
+Accuracy: balls are dropped at random on dense levels, and the field's
+verdict, distance and normal compared with the exact distance to the
+block index's candidates, and its gradient by central differences.
+Throughput: balls bounce around the same levels in both modes. Baking the
+whole field is timed against recomputing the tiles of a turn's worth of
+removed blocks.
+"""
+import random
+from math import acos, degrees
+from timeit import default_timer
+
+import numpy as np
+import pygame
+
+from src.game import Game, Level
+
+from .levels import dense_level
+
+COUNTS = 0, 500, 2000, 8000  # Blocks of the dense levels, 0 for the built-in one
+POINTS = 5000
+RADIUS = 12.0
+BALLS = 100
+TICKS = 200
+REMOVED = 10
+
+
+def exact_distance(blocks, x, y, reach):
+    return min([reach] + [block.geom.distance_array(x, y).item() for block in blocks])
+
+
+def accuracy(level):
+    """Returns the fraction of collision verdicts the field got wrong, and
+    over the points a ball collides at, the mean error of its distances and
+    the mean error of its normals, in degrees."""
+    rng = random.Random(1)
+    field = level.distanceField
+    reach = field.reach
+    x = np.array([rng.uniform(0.0, level.w) for _ in range(POINTS)])
+    y = np.array([rng.uniform(40.0, level.h - 40.0) for _ in range(POINTS)])
+    d, gx, gy, ids = field.sample(x, y)
+
+    wrong = 0
+    errors = []
+    angles = []
+    h = 0.01
+    for k in range(POINTS):
+        px = x[k].item()
+        py = y[k].item()
+        size = int(reach * 2.0) + 3
+        area = pygame.Rect(int(px - reach) - 1, int(py - reach) - 1, size, size)
+        blocks = level.blockIndex.hit(area)
+        exact = exact_distance(blocks, px, py, reach)
+        if (exact < RADIUS) != (d[k] < RADIUS):
+            wrong += 1
+        if not 0.0 < exact < RADIUS:
+            continue
+
+        errors.append(abs(d[k] - exact))
+        ex = exact_distance(blocks, px + h, py, reach)
+        ex -= exact_distance(blocks, px - h, py, reach)
+        ey = exact_distance(blocks, px, py + h, reach)
+        ey -= exact_distance(blocks, px, py - h, reach)
+        length = np.hypot(gx[k], gy[k]) * np.hypot(ex, ey)
+        if length:
+            cos = (gx[k] * ex + gy[k] * ey) / length
+            angles.append(degrees(acos(min(max(cos, -1.0), 1.0))))
+
+    return (
+        wrong / float(POINTS),
+        sum(errors) / max(len(errors), 1),
+        sum(angles) / max(len(angles), 1),
+    )
+
+
+def playing_game(level, mode):
+    random.seed(0)
+    game = Game()
+    game.start(level)
+    game.collisionMode = mode
+    game.ballCollisions = False
+    for _ in range(BALLS):
+        game.balls.add(
+            random.uniform(20.0, 940.0),
+            random.uniform(20.0, 200.0),
+            RADIUS,
+            random.uniform(-2.0, 2.0),
+            random.uniform(-2.0, 2.0),
+        )
+    return game
+
+
+def throughput(level, mode):
+    game = playing_game(level, mode)
+    start = default_timer()
+    for _ in range(TICKS):
+        game.updateDynamics()
+    return (default_timer() - start) / TICKS
+
+
+def main():
+    for count in COUNTS:
+        if count:
+            level = dense_level(count)
+        else:
+            level = Level()
+            level.load()
+        start = default_timer()
+        level.distanceField
+        tBake = default_timer() - start
+
+        wrong, distanceError, normalError = accuracy(level)
+        tDiscrete = throughput(level, "discrete")
+        tField = throughput(level, "field")
+
+        gone = set(random.Random(2).sample(level.packedBlocks, REMOVED))
+        start = default_timer()
+        level.removeBlocks(gone)
+        tRemove = default_timer() - start
+        print(
+            "%5i blocks  discrete %7.3f ms/tick  field %7.3f ms/tick  "
+            "wrong %5.2f%%  distance error %5.3f px  normal error %5.2f deg  "
+            "bake %7.2f ms  remove %i %6.2f ms"
+            % (
+                len(level.packedBlocks),
+                tDiscrete * 1000.0,
+                tField * 1000.0,
+                wrong * 100.0,
+                distanceError,
+                normalError,
+                tBake * 1000.0,
+                REMOVED,
+                tRemove * 1000.0,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Times a frame of high rate mouse input, per event against coalesced."""
+from timeit import default_timer
+
+import pygame
+
+from src.event import EventHandler
+from src.game import Game
+from src.inputs import InputStage
+
+FRAMES = 100
+
+
+def motion_events(count):
+    return [
+        pygame.event.Event(
+            pygame.MOUSEMOTION, pos=(i % 960, 100), rel=(1, 0), buttons=(0, 0, 0)
+        )
+        for i in range(count)
+    ]
+
+
+def per_event(main, events):
+    """Input as it was before the input stage: one emit per pygame event."""
+    for e in events:
+        main.emit("mouseMotion", e.pos, e.rel, e.buttons)
+
+
+def coalesced(main, events, stage=InputStage()):
+    records = stage.poll(events)
+    main.emit("input", records)
+    for event, args in records:
+        main.emit(event, *args)
+
+
+def main():
+    pygame.init()
+    handler = EventHandler()
+    handler.register("quit", "mouseMotion", "mouseButtonDown", "input")
+    game = Game(handler)
+    handler.context = game
+    # The handlers of the game before it took input in batches
+    handler.bind("mouseMotion", game.onMouseMotion)
+    for count in 1, 10, 100, 1000:
+        events = motion_events(count)
+        for name, dispatch in ("per event", per_event), ("coalesced", coalesced):
+            start = default_timer()
+            for _ in range(FRAMES):
+                dispatch(handler, events)
+            elapsed = (default_timer() - start) / FRAMES
+            print(
+                "%4i events/frame  %-9s  %8.3f ms/frame"
+                % (count, name, elapsed * 1000.0)
+            )
+
+
+if __name__ == "__main__":
+    main()
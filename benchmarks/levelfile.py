@@ -0,0 +1,80 @@
+"""Times loading a 10k block level, from Python objects or a level file."""
+import os
+import tempfile
+from timeit import default_timer
+
+import pygame
+
+from src.game import Block, Level
+from src.levelfile import read_level
+
+from .levels import dense_level
+
+BLOCKS = 10000
+RUNS = 5
+QUERY = pygame.Rect(0, 0, 1, 1)
+
+
+def from_objects(spatialIndex, params):
+    """Loads as the built-in level does, making one object at a time."""
+    level = Level(spatialIndex=spatialIndex)
+    level.blocks |= set(Block(kind(*args)) for kind, args in params)
+    level.blockIndex.insert_many(level.blocks)
+    level.pack()
+    return level
+
+
+def load_file(spatialIndex, source):
+    level = Level(spatialIndex=spatialIndex)
+    level.load(source)
+    return level
+
+
+def read_sections(source):
+    read_level(source)
+
+
+def best(load):
+    """Returns the best seconds to load and answer a first query, as the
+    bounding volume hierarchy builds on its first query."""
+    times = []
+    for _ in range(RUNS):
+        start = default_timer()
+        level = load()
+        if level is not None:
+            level.blockIndex.hit(QUERY)
+        times.append(default_timer() - start)
+    return min(times)
+
+
+def main():
+    source = dense_level(BLOCKS)
+    params = [(type(block.geom), block.geom.params()) for block in source.blocks]
+    directory = tempfile.mkdtemp()
+    for spatialIndex in "quadtree", "grid", "bvh":
+        level = from_objects(spatialIndex, params)
+        plain = os.path.join(directory, spatialIndex + ".mqlv")
+        indexed = os.path.join(directory, spatialIndex + "-index.mqlv")
+        level.save(plain)
+        level.save(indexed, index=True)
+        with open(plain, "rb") as f:
+            data = f.read()
+
+        cases = [
+            ("header", lambda: read_sections(plain)),
+            ("objects", lambda: from_objects(spatialIndex, params)),
+            ("file", lambda: load_file(spatialIndex, plain)),
+            ("bytes", lambda: load_file(spatialIndex, data)),
+        ]
+        if level.blockIndex.dump() is not None:
+            cases.append(("file+index", lambda: load_file(spatialIndex, indexed)))
+        for name, load in cases:
+            print("%-8s  %-10s  %8.2f ms" % (spatialIndex, name, best(load) * 1000.0))
+        print(
+            "%-8s  %8i bytes, %i with the index"
+            % (spatialIndex, os.path.getsize(plain), os.path.getsize(indexed))
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Generated levels for the benchmarks."""
+import random
+
+from src.game import Block, Level, render_silhouette
+from src.physics.primitives import Capsule, Circle, Rectangle
+from src.settings import COLOR1, COLOR2
+
+
+def load_with_sprites():
+    """Loads the built-in level and renders the sprites of its blocks,
+    untouched and touched, as prepare_level does before a game.
+
+    Blocks render their sprites when first drawn, so loading alone renders
+    nothing.
+    """
+    level = Level()
+    level.load()
+    for block in level.packedBlocks:
+        for color in COLOR1, COLOR2:
+            render_silhouette(block.geom, color)
+    return level
+
+
+def dense_level(count, seed=0):
+    """A level packed with count small blocks of mixed primitive types."""
+    rng = random.Random(seed)
+    level = Level()
+    level.startingBalls = 12
+    for i in range(count):
+        x = rng.uniform(16.0, level.w - 32.0)
+        y = rng.uniform(80.0, level.h - 120.0)
+        kind = i % 3
+        if kind == 0:
+            geom = Circle(x, y, rng.uniform(3.0, 8.0))
+        elif kind == 1:
+            geom = Capsule(x, y, x + rng.uniform(-12.0, 12.0), y + 6.0, 3.0)
+        else:
+            geom = Rectangle(x, y, rng.uniform(4.0, 14.0), rng.uniform(4.0, 10.0))
+        level.blocks.add(Block(geom))
+    level.blockIndex.insert_many(level.blocks)
+    level.pack()
+    return level
@@ -0,0 +1,50 @@
+"""Times hit_circle one pair at a time against the batched kernels."""
+import random
+from timeit import default_timer
+
+import numpy as np
+
+from src.physics.primitives import Arc, Capsule, Circle, Polygon, Rectangle
+
+BALLS = 10000
+
+
+def shapes():
+    return [
+        Circle(100.0, 100.0, 16.0),
+        Capsule(80.0, 90.0, 130.0, 120.0, 8.0),
+        Rectangle(90.0, 90.0, 24.0, 16.0),
+        Polygon((80.0, 80.0), (140.0, 90.0), (120.0, 130.0)),
+        Arc(100.0, 100.0, 48.0, 64.0, 0.3, 1.2),
+    ]
+
+
+def main():
+    random.seed(0)
+    x = np.array([random.uniform(0.0, 200.0) for _ in range(BALLS)])
+    y = np.array([random.uniform(0.0, 200.0) for _ in range(BALLS)])
+    r = np.array([random.uniform(4.0, 16.0) for _ in range(BALLS)])
+    xs, ys, rs = x.tolist(), y.tolist(), r.tolist()
+    for shape in shapes():
+        start = default_timer()
+        hits = sum(shape.hit_circle(*args)[0] is not None for args in zip(xs, ys, rs))
+        tScalar = default_timer() - start
+
+        start = default_timer()
+        batchHits = shape.hit_circles(x, y, r)[2].sum()
+        tBatch = default_timer() - start
+
+        assert hits == batchHits
+        print(
+            "%-10s per pair %7.2f ms  batched %6.2f ms  x%.0f"
+            % (
+                type(shape).__name__,
+                tScalar * 1000.0,
+                tBatch * 1000.0,
+                tScalar / tBatch,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
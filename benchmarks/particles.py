@@ -0,0 +1,44 @@
+"""Times the particle pool under bursts of explosions."""
+import random
+from timeit import default_timer
+
+import pygame
+
+from src.particle import ParticleSystem
+
+FRAMES = 120
+
+
+def main():
+    pygame.init()
+    display = pygame.display.set_mode((960, 540))
+    random.seed(0)
+    for burst in 10, 100, 1000:
+        particles = ParticleSystem()
+        updateTime = drawTime = 0.0
+        for _ in range(FRAMES):
+            for _ in range(burst):
+                particles.explode(
+                    random.uniform(0.0, 960.0), random.uniform(0.0, 540.0)
+                )
+            start = default_timer()
+            particles.update()
+            updateTime += default_timer() - start
+            start = default_timer()
+            particles.draw(display)
+            drawTime += default_timer() - start
+        print(
+            "%4i spawns/frame  %5i alive  %6i dropped  "
+            "update %7.3f ms  draw %7.3f ms"
+            % (
+                burst,
+                len(particles),
+                particles.dropped,
+                updateTime / FRAMES * 1000.0,
+                drawTime / FRAMES * 1000.0,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Times turn changes on a 10k block level: full rebuild or remove_many."""
+import random
+from timeit import default_timer
+
+import pygame
+
+from src.physics.quadtree import QuadTree
+
+BLOCKS = 10000
+BOUNDS = 0, 0, 960, 540
+
+
+class Item:
+    def __init__(self, x, y, w, h):
+        self.rect = pygame.Rect(x, y, w, h)
+
+
+def make_items(count):
+    return [
+        Item(random.uniform(0, 950), random.uniform(0, 530), 10, 10)
+        for _ in range(count)
+    ]
+
+
+def main():
+    random.seed(0)
+    items = make_items(BLOCKS)
+    for cleared in 1, 10, 100:
+        removed = random.sample(items, cleared)
+        surviving = set(items) - set(removed)
+
+        start = default_timer()
+        QuadTree(items=surviving)
+        tRebuild = default_timer() - start
+
+        tree = QuadTree(boundingRect=BOUNDS)
+        tree.insert_many(items)
+        start = default_timer()
+        tree.remove_many(removed)
+        tRemove = default_timer() - start
+
+        print(
+            "%3i cleared  rebuild %8.2f ms  remove_many %6.3f ms"
+            % (cleared, tRebuild * 1000.0, tRemove * 1000.0)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compares the per-pixel silhouette renderers with rasterize_silhouette.
+
+Also checks that both paths produce the very same pixels.
+"""
+from math import pi
+from timeit import default_timer
+
+import pygame
+
+from src.physics.primitives import Arc, Capsule, Circle, Rectangle
+from src.render import (
+    rasterize_silhouette,
+    render_silhouette,
+    render_silhouette_multisampled,
+)
+from src.settings import COLOR1
+
+
+def level_shapes():
+    """The shapes built by Level.load."""
+    shapes = [
+        Circle(480 - 192 + 384 / 16 * i, 250 + i % 2 * 24, 16.0) for i in range(16)
+    ]
+    n = 9
+    for x, y in (300.0, 128.0), (480.0, 80.0), (660.0, 128.0):
+        shapes += [
+            Arc(x, y, 48.0, 64.0, i * pi / n, pi / n * (i + 0.9)) for i in range(n)
+        ]
+    shapes += [
+        Capsule(32.0 + 48.0 * i, 360.0, 48.0 + 48.0 * i, 360.0, 8.0) for i in range(12)
+    ]
+    shapes += [Rectangle(32.0 + 48.0 * i, 400.0, 24.0, 16.0) for i in range(13)]
+    return shapes
+
+
+def pixels(surface):
+    return (
+        pygame.surfarray.array3d(surface).tobytes(),
+        pygame.surfarray.array_alpha(surface).tobytes(),
+    )
+
+
+def timed(render, shapes):
+    start = default_timer()
+    surfaces = [render(shape, COLOR1) for shape in shapes]
+    return default_timer() - start, surfaces
+
+
+def main():
+    pygame.init()
+    shapes = level_shapes()
+    for name, reference, samples in (
+        ("aliased", render_silhouette, 1),
+        ("multisampled", render_silhouette_multisampled, 2),
+    ):
+        tReference, expected = timed(reference, shapes)
+        tRaster, actual = timed(
+            lambda shape, color: rasterize_silhouette(shape, color, samples), shapes
+        )
+        mismatches = sum(pixels(a) != pixels(b) for a, b in zip(expected, actual))
+        print(
+            "%-12s per-pixel %8.1f ms  numpy %6.1f ms  x%.0f  mismatches: %i/%i"
+            % (
+                name,
+                tReference * 1000.0,
+                tRaster * 1000.0,
+                tReference / tRaster,
+                mismatches,
+                len(shapes),
+            )
+        )
+        assert mismatches == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Times loading the built-in level and rendering its sprites, with a cold,
+a warm and a disk backed silhouette cache."""
+import tempfile
+from timeit import default_timer
+
+import pygame
+
+from src import game
+from src.silhouettes import SilhouetteCache
+
+from .levels import load_with_sprites
+
+
+def timed_load():
+    start = default_timer()
+    load_with_sprites()
+    return default_timer() - start
+
+
+def main():
+    pygame.init()
+    with tempfile.TemporaryDirectory() as directory:
+        game.silhouettes = SilhouetteCache(directory=directory)
+        tCold = timed_load()
+        rasterized = game.silhouettes.rasterizations
+        tWarm = timed_load()
+        rasterizedWarm = game.silhouettes.rasterizations - rasterized
+
+        game.silhouettes = SilhouetteCache(directory=directory)  # A restart
+        tDisk = timed_load()
+
+        print("cold  %7.2f ms  %i masks rasterized" % (tCold * 1000.0, rasterized))
+        print("warm  %7.2f ms  %i masks rasterized" % (tWarm * 1000.0, rasterizedWarm))
+        print(
+            "disk  %7.2f ms  %i masks loaded" % (tDisk * 1000.0, game.silhouettes.loads)
+        )
+
+
+if __name__ == "__main__":
+    main()
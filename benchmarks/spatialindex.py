@@ -0,0 +1,40 @@
+"""Build time and query throughput of every spatial index backend."""
+import random
+from timeit import default_timer
+
+import pygame
+
+from src.game import SPATIAL_INDEXES
+
+from .quadtree import BOUNDS, make_items
+
+QUERIES = 5000
+
+
+def main():
+    random.seed(0)
+    queries = [
+        pygame.Rect(random.randint(0, 936), random.randint(0, 516), 24, 24)
+        for _ in range(QUERIES)
+    ]
+    for count in 100, 1000, 10000:
+        items = make_items(count)
+        for name, backend in sorted(SPATIAL_INDEXES.items()):
+            start = default_timer()
+            index = backend(items=items, boundingRect=BOUNDS)
+            index.hit(queries[0])  # Lazy backends build on the first query
+            tBuild = default_timer() - start
+
+            start = default_timer()
+            for rect in queries:
+                index.hit(rect)
+            tQuery = default_timer() - start
+
+            print(
+                "%5i blocks  %-8s build %8.2f ms  %8.0f queries/s"
+                % (count, name, tBuild * 1000.0, QUERIES / tQuery)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""The benchmark cases run by python -m benchmarks.
+
+A case is a function decorated with @case(name) which sets things up and
+returns the function to time. Cases may time several units of work per
+call, say ticks, and give per=units so results are per unit.
+"""
+import random
+
+import numpy as np
+import pygame
+
+from src import game as gamemodule
+from src.game import Game
+from src.physics.quadtree import QuadTree
+from src.render import (
+    rasterize_silhouette,
+    render_silhouette,
+    render_silhouette_multisampled,
+)
+from src.settings import COLOR1
+
+from .levels import dense_level, load_with_sprites
+from .narrowphase import shapes
+from .quadtree import BOUNDS, make_items
+
+QUERIES = 1000
+TICKS = 10
+
+CASES = []  # (name, setup, per)
+
+
+def case(name, per=1):
+    def register(setup):
+        CASES.append((name, setup, per))
+        return setup
+
+    return register
+
+
+def display():
+    surface = pygame.display.get_surface()
+    if surface is None:
+        pygame.init()
+        surface = pygame.display.set_mode((960, 540))
+    return surface
+
+
+# Spatial index
+
+
+def quadtree_queries(count):
+    random.seed(0)
+    tree = QuadTree(items=make_items(count), boundingRect=BOUNDS)
+    rects = [
+        pygame.Rect(random.uniform(0, 940), random.uniform(0, 520), 24, 24)
+        for _ in range(QUERIES)
+    ]
+    points = [(random.uniform(0, 960), random.uniform(0, 540)) for _ in range(QUERIES)]
+    return tree, rects, points
+
+
+for count in 1000, 10000:
+
+    @case("quadtree.build.%i" % count)
+    def quadtree_build(count=count):
+        random.seed(0)
+        items = make_items(count)
+        return lambda: QuadTree(items=items, boundingRect=BOUNDS)
+
+    @case("quadtree.hit.%i" % count, per=QUERIES)
+    def quadtree_hit(count=count):
+        tree, rects, points = quadtree_queries(count)
+        return lambda: [tree.hit(rect) for rect in rects]
+
+    @case("quadtree.hitPoint.%i" % count, per=QUERIES)
+    def quadtree_hitpoint(count=count):
+        tree, rects, points = quadtree_queries(count)
+        return lambda: [tree.hitPoint(x, y) for x, y in points]
+
+
+# Primitives
+
+
+def primitive_queries():
+    rng = random.Random(0)
+    return [
+        (rng.uniform(0.0, 200.0), rng.uniform(0.0, 200.0), rng.uniform(4.0, 16.0))
+        for _ in range(QUERIES)
+    ]
+
+
+for shape in shapes():
+    kind = type(shape).__name__
+
+    @case("primitive.%s.hit" % kind, per=QUERIES)
+    def primitive_hit(shape=shape):
+        queries = primitive_queries()
+        return lambda: [shape.hit(x, y) for x, y, r in queries]
+
+    @case("primitive.%s.hit_circle" % kind, per=QUERIES)
+    def primitive_hit_circle(shape=shape):
+        queries = primitive_queries()
+        return lambda: [shape.hit_circle(x, y, r) for x, y, r in queries]
+
+    @case("primitive.%s.hit_circles" % kind, per=QUERIES)
+    def primitive_hit_circles(shape=shape):
+        x, y, r = (np.array(a) for a in zip(*primitive_queries()))
+        return lambda: shape.hit_circles(x, y, r)
+
+
+# Rendering
+
+
+for shape in shapes():
+    kind = type(shape).__name__
+
+    @case("silhouette.%s.pixels" % kind)
+    def silhouette_pixels(shape=shape):
+        return lambda: render_silhouette(shape, COLOR1)
+
+    @case("silhouette.%s.pixels.multisampled" % kind)
+    def silhouette_pixels_multisampled(shape=shape):
+        return lambda: render_silhouette_multisampled(shape, COLOR1)
+
+    @case("silhouette.%s.raster" % kind)
+    def silhouette_raster(shape=shape):
+        return lambda: rasterize_silhouette(shape, COLOR1, 1)
+
+    @case("silhouette.%s.raster.multisampled" % kind)
+    def silhouette_raster_multisampled(shape=shape):
+        return lambda: rasterize_silhouette(shape, COLOR1, 2)
+
+
+# Levels
+
+
+@case("level.load.cold")
+def level_load_cold():
+    def load():
+        gamemodule.silhouettes.clear()
+        load_with_sprites()
+
+    return load
+
+
+@case("level.load.warm")
+def level_load_warm():
+    load_with_sprites()
+    return load_with_sprites
+
+
+# Game
+
+
+def playing_game(level=None, balls=0):
+    random.seed(0)
+    game = Game()
+    game.start()
+    game.win = game.lose = lambda: None
+    if level is not None:
+        game.level = level
+        game.compositor.bake(level)
+    for _ in range(balls):
+        game.balls.add(
+            random.uniform(20.0, 940.0),
+            random.uniform(20.0, 200.0),
+            12,
+            random.uniform(-2.0, 2.0),
+            random.uniform(-2.0, 2.0),
+        )
+    return game
+
+
+def snapshot(balls):
+    """Returns a function putting balls back as they are now, unbumped.
+
+    Balls are added again, so what the batch keeps per ball, like its
+    candidate cache, follows them.
+    """
+    n = balls.count
+    x = balls.x[:n].copy()
+    y = balls.y[:n].copy()
+    r = balls.r[:n].copy()
+    vx = x - balls.xp[:n]
+    vy = y - balls.yp[:n]
+
+    def restore():
+        balls.clear()
+        balls.add_many(x, y, r, vx, vy)
+
+    return restore
+
+
+for count in 10, 100, 1000:
+
+    @case("game.updateDynamics.%i" % count, per=TICKS)
+    def update_dynamics(count=count):
+        game = playing_game(balls=count)
+        restore = snapshot(game.balls)
+
+        def run():
+            restore()
+            for _ in range(TICKS):
+                game.updateDynamics()
+
+        return run
+
+
+for blocks in 500, 2000:
+
+    @case("game.frame.dense.%i" % blocks, per=TICKS)
+    def frame(blocks=blocks):
+        surface = display()
+        game = playing_game(dense_level(blocks), balls=50)
+        restore = snapshot(game.balls)
+
+        def run():
+            restore()
+            for _ in range(TICKS):
+                game.update()
+                game.draw(surface)
+
+        return run
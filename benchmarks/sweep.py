@@ -0,0 +1,82 @@
+"""Swept collision queries against discrete tests at increasing substeps.
+
+Fast balls are moved across the default level. The swept test finds every
+contact; substepping needs more and more samples to find as many.
+"""
+import random
+from timeit import default_timer
+
+import pygame
+
+from .silhouette import level_shapes
+
+MOTIONS = 2000
+RADIUS = 12.0
+SPEED = 48.0  # Pixels per step, twice a ball's diameter
+
+
+def motions():
+    for _ in range(MOTIONS):
+        x0 = random.uniform(0.0, 960.0)
+        y0 = random.uniform(40.0, 440.0)
+        yield (
+            x0,
+            y0,
+            x0 + random.uniform(-SPEED, SPEED),
+            y0 + random.uniform(-SPEED, SPEED),
+        )
+
+
+def candidates(shapes, x0, y0, x1, y1):
+    sweep = pygame.Rect(
+        int(min(x0, x1) - RADIUS) - 1,
+        int(min(y0, y1) - RADIUS) - 1,
+        int(abs(x1 - x0) + RADIUS * 2.0) + 3,
+        int(abs(y1 - y0) + RADIUS * 2.0) + 3,
+    )
+    return [shape for shape, rect in shapes if sweep.colliderect(rect)]
+
+
+def swept(shapes, x0, y0, x1, y1):
+    return any(
+        shape.sweep_circle(x0, y0, x1, y1, RADIUS)
+        for shape in candidates(shapes, x0, y0, x1, y1)
+    )
+
+
+def substepped(shapes, x0, y0, x1, y1, substeps):
+    near = candidates(shapes, x0, y0, x1, y1)
+    for k in range(1, substeps + 1):
+        x = x0 + (x1 - x0) * k / substeps
+        y = y0 + (y1 - y0) * k / substeps
+        for shape in near:
+            if shape.hit_circle(x, y, RADIUS)[0] is not None:
+                return True
+    return False
+
+
+def main():
+    random.seed(0)
+    shapes = [(shape, pygame.Rect(shape.aabb)) for shape in level_shapes()]
+    # Only motions starting clear of every block
+    tests = [m for m in motions() if not substepped(shapes, m[0], m[1], m[0], m[1], 1)]
+
+    start = default_timer()
+    expected = [swept(shapes, *m) for m in tests]
+    tSwept = default_timer() - start
+    contacts = sum(expected)
+    print("swept        %7.2f ms  %4i contacts" % (tSwept * 1000.0, contacts))
+
+    for substeps in 1, 2, 4, 8, 16:
+        start = default_timer()
+        found = [substepped(shapes, *m, substeps) for m in tests]
+        elapsed = default_timer() - start
+        missed = sum(e and not f for e, f in zip(expected, found))
+        print(
+            "%2i substeps  %7.2f ms  %4i missed (%.1f%%)"
+            % (substeps, elapsed * 1000.0, missed, 100.0 * missed / contacts)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Times drawing a changing score, rasterized against glyph atlas labels."""
+from timeit import default_timer
+
+import pygame
+
+from src.fonts import get_label
+from src.settings import COLOR1
+
+FRAMES = 2000
+
+
+def rasterized(display, score):
+    """The score label as it was drawn before the glyph atlas."""
+    image = pygame.font.Font(None, 28).render("Score: %i" % score, True, COLOR1)
+    return display.blit(image, (0, 0))
+
+
+def atlas(display, score):
+    return get_label("Score: %i", 28, COLOR1).draw(display, score, (0, 0))
+
+
+def main():
+    pygame.init()
+    display = pygame.display.set_mode((960, 540))
+    for name, draw in ("rasterized", rasterized), ("atlas", atlas):
+        start = default_timer()
+        for frame in range(FRAMES):
+            draw(display, frame * 100)
+        elapsed = (default_timer() - start) / FRAMES
+        print("%-10s  %7.3f ms/label" % (name, elapsed * 1000.0))
+
+
+if __name__ == "__main__":
+    main()
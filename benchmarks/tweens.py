@@ -0,0 +1,48 @@
+"""Times many concurrent tweens, generators against the scheduler."""
+from math import pi, sin
+from timeit import default_timer
+
+from src.tween import Tweens
+
+TICKS = 60
+
+
+def sin_interpolation(start, end, steps=30):
+    """Menu tweens as they were before the scheduler."""
+    d = end - start
+    for i in range(steps):
+        yield start + d * sin((float(i) / float(steps - 1)) * pi * 0.5)
+
+
+def generators(count):
+    tweens = [sin_interpolation(0.0, 1.0, TICKS) for _ in range(count)]
+    values = [0.0] * count
+    for _ in range(TICKS):
+        for i, tween in enumerate(tweens):
+            try:
+                values[i] = tween.__next__()
+            except StopIteration:
+                pass
+
+
+def scheduler(count):
+    tweens = Tweens()
+    done = []
+    for _ in range(count):
+        tweens.add(0.0, 1.0, TICKS, on_done=lambda: done.append(1))
+    for _ in range(TICKS):
+        tweens.tick()
+    assert len(done) == count
+
+
+def main():
+    for count in 10, 100, 1000, 10000:
+        for name, run in ("generators", generators), ("scheduler", scheduler):
+            start = default_timer()
+            run(count)
+            elapsed = (default_timer() - start) / TICKS
+            print("%5i tweens  %-10s  %8.3f ms/tick" % (count, name, elapsed * 1000.0))
+
+
+if __name__ == "__main__":
+    main()
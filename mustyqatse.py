@@ -2,113 +2,202 @@ import sys
 from math import pi
 from random import choice
 
-import pygame
+from src.startup import startup
+
+with startup.stage("import pygame"):
+    import pygame
+
+# The game and the editor are imported when first visited
+with startup.stage("import src"):
+    from src import text
+    from src.settings import FPS_LIMIT, MAX_TICKS_PER_FRAME, TIMESTEP
+    from src.profiler import profiler
+    from src import profilerview
+    from src.timestep import FixedTimestep
+    from src.tween import Tweens
+    from src.menu import LoadingScreen, RotatingMenu
+    from src.event import EventHandler
+    from src.inputs import InputStage
+    from src.assets import AssetPipeline
 
-from src import text
-from src.menu import RotatingMenu
-from src.event import EventHandler
-from src.game import Game
-from src.editor import Editor
 
 class Main(EventHandler):
     def __init__(self):
-        pygame.init()
-        
-        self.display = pygame.display.set_mode((960, 540))
+        with startup.stage("pygame.init"):
+            pygame.init()
+
+        with startup.stage("display"):
+            self.display = pygame.display.set_mode((960, 540))
         self.clock = pygame.time.Clock()
-        
-        #Then the custom event handling
-        self.events = [      #Arguments:
-            'keyDown',         #unicode, key, mod
-            'keyUp',           #key, mod
-            'mouseMotion',     #pos, rel, buttons
-            'mouseButtonDown', #pos, button
-            'mouseButtonUp',   #pos, button
-            'quit',            #no variables
-            ]
-        
+        self.timestep = FixedTimestep(TIMESTEP, MAX_TICKS_PER_FRAME)
+        self.tweens = Tweens()  # Every animation, whatever the context
+
+        # Then the custom event handling
+        self.events = [  # Arguments:
+            "keyDown",  # unicode, key, mod
+            "keyUp",  # key, mod
+            "mouseMotion",  # pos, rel, buttons
+            "mouseButtonDown",  # pos, button
+            "mouseButtonUp",  # pos, button
+            "quit",  # no variables
+            "input",  # records of every event above, once per frame
+        ]
+
         self.register(*self.events)
-        
-        #Then the main menu
+        self.bind("keyDown", self.onKeyDown)
+        self.input = InputStage()
+
+        # Then the main menu
         noAction = lambda: None
         menuItems = {
             "Exit": self.on_menu_exit,
-            "Options": {
-                "Resolution": noAction,
-                "FPS Limit": noAction,
-            },
+            "Options": {"Resolution": noAction, "FPS Limit": noAction},
             "Start": self.on_menu_game,
             "Levels": noAction,
-            "Editor": {
-                "New Level": noAction,
-                "Load Level": noAction,
-            },
+            "Editor": {"New Level": noAction, "Load Level": noAction},
         }
-        
-        self.menu = RotatingMenu(self, x=480, y=270, w=700, h=400, arc=pi, defaultAngle=pi/2., wrap=False, headerText="Mustyqatse", items=menuItems, on_selection=self.menu_select, backText="Back")
-        
+
+        with startup.stage("menu"):
+            self.menu = RotatingMenu(
+                self,
+                x=480,
+                y=270,
+                w=700,
+                h=400,
+                arc=pi,
+                defaultAngle=pi / 2.0,
+                wrap=False,
+                headerText="Mustyqatse",
+                items=menuItems,
+                on_selection=self.menu_select,
+                backText="Back",
+            )
+
         self.context = self.menu
-    
+
+        # Bake the first level while the menu shows
+        self.assets = AssetPipeline()
+        self.prepareGame()
+
     def update(self):
-        for e in pygame.event.get():
-            if e.type == pygame.KEYDOWN:
-                self.emit('keyDown', e.key, e.mod)
-            elif e.type == pygame.KEYUP:
-                self.emit('keyUp', e.key, e.mod)
-            elif e.type == pygame.MOUSEMOTION:
-                self.emit('mouseMotion', e.pos, e.rel, e.buttons)
-            elif e.type == pygame.MOUSEBUTTONDOWN:
-                self.emit('mouseButtonDown', e.pos, e.button)
-            elif e.type == pygame.MOUSEBUTTONUP:
-                self.emit('mouseButtonUp', e.pos, e.button)
-            elif e.type == pygame.QUIT:
-                self.emit('quit')
-            
-        self.context.update()
-        self.context.draw(self.display)
-        
-        pygame.display.flip()
-        self.clock.tick(60) #Limit FPS
-    
-    #Menu
+        profiler.frame()
+        with profiler.phase("events"):
+            self.pumpEvents()
+
+        # Simulate in fixed ticks, however long the last frame took
+        with profiler.phase("update"):
+            for tick in range(self.timestep.advance(self.clock.get_time() / 1000.0)):
+                self.tweens.tick()
+                self.context.update()
+        with profiler.phase("draw"):
+            rects = self.context.draw(self.display)
+            if profiler.hud:
+                hud = profilerview.draw(profiler, self.display)
+                if rects is not None:
+                    rects.append(hud)
+
+        # Contexts drawing only parts of the display return those
+        with profiler.phase("present"):
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+        with profiler.phase("wait"):
+            self.clock.tick(FPS_LIMIT)  # Limit FPS
+
+    def pumpEvents(self):
+        records = self.input.poll()
+        if profiler.enabled:
+            profiler.count("events", self.input.events)
+        if not records:
+            return
+        # Batch handlers get the whole frame at once, the others one by one
+        self.emit("input", records)
+        for event, args in records:
+            self.emit(event, *args)
+
+    def onKeyDown(self, key, mod):
+        if key == pygame.K_F3:
+            profiler.toggle()
+            # The graph leaves a hole a partial redraw wouldn't fill
+            compositor = getattr(self.context, "compositor", None)
+            if compositor:
+                compositor.full = True
+        elif key == pygame.K_F4:
+            profilerview.export(profiler, "profile.json")
+            profilerview.export(profiler, "trace.json", chrome=True)
+
+    # Menu
     def menu_select(self, menu):
         self.context = menu
-    
+
+    def prepareGame(self):
+        self.nextLevel = self.assets.submit(self.loadLevel)
+
+    def loadLevel(self):  # On an asset thread
+        from src.game import prepare_level
+
+        return prepare_level(self.assets)
+
     def on_menu_game(self):
-        game = Game(self)
-        game.win = self.win
-        game.lose = self.lose
-        self.context = game
-        game.start()
-    
+        if self.assets.done():
+            self.startGame()
+        else:
+            self.context = LoadingScreen(self.assets, self.startGame, 480, 270)
+
+    def startGame(self):
+        with startup.stage("game"):
+            with startup.stage("import game"):
+                from src.game import Game
+            game = Game(self)
+            game.win = self.win
+            game.lose = self.lose
+            self.context = game
+            with startup.stage("game.start"):
+                game.start(self.nextLevel.result())
+
     def menuLevels(self):
         pass
-    
+
     def menuEditor(self):
+        with startup.stage("import editor"):
+            from src.editor import Editor
         editor = Editor(self)
         editor.back = self.menuBack
         self.context = editor
-    
+
     def on_menu_exit(self):
+        self.assets.shutdown()
         return sys.exit()
-    
-    #Options Menu
+
+    # Options Menu
     def optionsResolution(self):
         pass
-    
+
     def optionsFPSLimit(self):
         pass
-    
-    #Game
+
+    # Game
     def win(self):
+        self.release(self.context)
         self.context = self.menu
         self.menu.header.text = choice(text.on_win)
-    
+        self.prepareGame()
+
     def lose(self):
+        self.release(self.context)
         self.context = self.menu
         self.menu.header.text = choice(text.on_lose)
+        self.prepareGame()
+
 
 if __name__ == "__main__":
-    main = Main()
+    # Prints the time taken by imports, building contexts and first frames
+    startup.enabled = "--startup-profile" in sys.argv[1:]
+    with startup.stage("Main"):
+        main = Main()
+    with startup.stage("first frame"):
+        main.update()
     while True:
-        main.update()
\ No newline at end of file
+        startup.report()  # Whatever the last frame built, startup or a first visit
+        main.update()
@@ -0,0 +1,90 @@
+"""Bakes assets on a thread pool while something else is on screen.
+
+The pool is there so the main thread keeps drawing the menu while a level
+is prepared, not to bake faster: the sprites of a block are small arrays,
+so most of the work holds the GIL and the pool takes about as long as the
+main thread would. Small jobs are submitted in batches, so the pool's own
+overhead stays small too. Baked assets land in their caches, so using them
+later finds them there.
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .settings import ASSET_BATCH, ASSET_WORKERS
+
+
+class AssetPipeline:
+    def __init__(self, workers=ASSET_WORKERS):
+        """
+        @param workers:
+            The number of threads, by default one per core.
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or None, thread_name_prefix="assets"
+        )
+        self.futures = []
+
+    def submit(self, function, *args, **kwargs):
+        """Runs function on the pool, returns its future.
+
+        Jobs may submit more jobs, as long as they don't wait on them.
+        """
+        future = self.executor.submit(function, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def submit_batches(self, function, items, size=ASSET_BATCH):
+        """Calls function on each of items, size items per job.
+
+        Returns the futures of the jobs.
+        """
+        items = list(items)
+        return [
+            self.submit(_call_each, function, items[i : i + size])
+            for i in range(0, len(items), size)
+        ]
+
+    @property
+    def progress(self):
+        """The fraction of the jobs submitted so far which are done."""
+        futures = list(self.futures)
+        if not futures:
+            return 1.0
+        return sum(future.done() for future in futures) / float(len(futures))
+
+    def done(self):
+        """Whether every job is done, then forgets them."""
+        futures = list(self.futures)
+        return all(future.done() for future in futures) and self._settle(futures)
+
+    def wait(self, timeout=None):
+        """Waits until every job is done, including the jobs they submit.
+
+        Returns False if timeout seconds went by first.
+        """
+        while True:
+            futures = list(self.futures)
+            if wait(futures, timeout).not_done:
+                return False
+            if self._settle(futures):
+                return True
+
+    def _settle(self, futures):
+        # Jobs submit theirs before they are done, so once futures are all
+        # done, nothing was submitted since if the list didn't grow.
+        if len(self.futures) != len(futures):
+            return False
+        self.futures = []
+        return True
+
+    def shutdown(self):
+        """Drops the jobs not started yet, lets the running ones finish
+        without waiting for them."""
+        for future in self.futures:
+            future.cancel()
+        self.executor.shutdown(wait=False)
+        self.futures = []
+
+
+def _call_each(function, items):
+    for item in items:
+        function(item)
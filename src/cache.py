@@ -0,0 +1,44 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """A dictionary dropping its least recently used entries past maxBytes.
+
+    size(value) gives the number of bytes accounted for each value.
+    """
+
+    def __init__(self, maxBytes, size):
+        self.maxBytes = maxBytes
+        self.size = size
+        self.bytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        entries = self._entries
+        if key not in entries:
+            return default
+        entries.move_to_end(key)
+        return entries[key]
+
+    def put(self, key, value):
+        entries = self._entries
+        if key in entries:
+            self.bytes -= self.size(entries.pop(key))
+        entries[key] = value
+        self.bytes += self.size(value)
+        while self.bytes > self.maxBytes and len(entries) > 1:
+            self.bytes -= self.size(entries.popitem(last=False)[1])
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+
+def surface_bytes(surface):
+    return surface.get_bytesize() * surface.get_width() * surface.get_height()
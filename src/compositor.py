@@ -0,0 +1,66 @@
+import pygame
+
+from .render import render_level
+from .settings import COLOR0
+
+
+class Compositor:
+    """Presents frames as a baked static layer plus dirty sprite rects.
+
+    The level is baked once into background. Between frames only two kinds
+    of areas change on screen: background areas that were invalidated, like
+    a touched or removed block, and the areas sprites covered last frame or
+    cover this frame. Only those are redrawn and presented.
+
+    A frame goes: begin, draw the sprites collecting their rects, end.
+    """
+
+    def __init__(self, size, color=COLOR0):
+        self.background = pygame.Surface(size)
+        self.color = color
+
+        self.full = True  # Whether the next frame redraws the whole display
+        self.damaged = []  # Background areas to render again
+        self.spriteRects = []  # Areas covered by sprites last frame
+
+        self.pixels = 0  # Pixels presented by the last frame
+
+    def bake(self, level):
+        self.background.fill(self.color)
+        render_level(self.background, level)
+        self.damaged = []
+        self.full = True
+
+    def invalidate(self, rect):
+        """Marks an area of the level to render again, say a touched block."""
+        self.damaged.append(pygame.Rect(rect))
+
+    def begin(self, display, level):
+        """Restores the static layer wherever it changed or was drawn over."""
+        background = self.background
+        for rect in self.damaged:
+            background.fill(self.color, rect)
+            background.set_clip(rect)
+            for block in level.blockIndex.hit(rect):
+                background.blit(block.image, block.rect)
+            background.set_clip(None)
+
+        if self.full:
+            display.blit(background, (0, 0))
+            self.dirty = None
+        else:
+            self.dirty = self.damaged + self.spriteRects
+            for rect in self.dirty:
+                display.blit(background, rect, rect)
+        self.damaged = []
+
+    def end(self, display, spriteRects):
+        """Returns the rects to present, or None when the whole display is."""
+        self.spriteRects = spriteRects
+        if self.dirty is None:
+            self.full = False
+            self.pixels = display.get_width() * display.get_height()
+            return None
+        dirty = self.dirty + spriteRects
+        self.pixels = sum(rect.w * rect.h for rect in dirty)
+        return dirty
@@ -115,7 +115,7 @@ class Editor:
     def getHoveredPlan(self):
         hits = list(
             block
-            for block in self.level.quadTree.hit(
+            for block in self.level.blockIndex.hit(
                 pygame.Rect(pos[0] - 2, pos[1] - 2, 4, 4)
             )
             if (type(block) in self.selectSet)
@@ -210,7 +210,7 @@ class Editor:
     def deleteSelection(self):
         if self.selection:
             self.level.blocks.remove(self.selection)
-            self.level.quadTree.remove(self.selection)
+            self.level.blockIndex.remove(self.selection)
 
 
 class EditorView:
@@ -272,7 +272,7 @@ class EditorView:
             self.preview.draw(display)
             # subdivisions label
             image = render_string(str(self.preview.subdivisions), COLOR3)
-            w, h = self.font.size(str(self.preview.subdivisions))
+            w, h = image.get_size()
             display.blit(image, (self.mx - w, self.my - h))
 
         for block in self.level.blocks:
@@ -1,34 +1,93 @@
 """Examples at the end of the module"""
+import weakref
 
 
 class EventHandler:
-    """Calls the set of functions that handle a given event.
-    
-    You don't need to register events. You can EventHandler.handle('whatever')
+    """Calls the functions that handle a given event.
+
+    Events must be registered before functions are bound to them.
+
+    A function bound with a context is only called while that context is
+    the active one, self.context. Such bindings don't keep their context
+    alive: methods of the context are held through weak references, and
+    the bindings go away with the context, or with release(context).
+
+    Each event dispatches from a tuple compiled whenever bindings or the
+    active context change, so emit costs the same however many contexts
+    came and went.
     """
 
     # A tuple so that unbind and emit won't crash
     # bind will make it a dictionary, making it useful
     _eventBindings = ()
+    _scopedBindings = ()  # context: {event: [function or WeakMethod]}
+    _dispatch = {}  # event: tuple of functions
+    _context = None
 
     def register(self, *events):
         if type(self._eventBindings) is tuple:
             self._eventBindings = {}
+            self._scopedBindings = weakref.WeakKeyDictionary()
         for event in events:
             self._eventBindings[event] = set()
+        self._compile()
+
+    @property
+    def context(self):
+        return self._context
+
+    @context.setter
+    def context(self, context):
+        self._context = context
+        self._compile()
 
-    def bind(self, event, function):
+    def bind(self, event, function, context=None):
         assert event in self._eventBindings
-        self._eventBindings[event].add(function)
+        if context is None:
+            self._eventBindings[event].add(function)
+        else:
+            if getattr(function, "__self__", None) is context:
+                function = weakref.WeakMethod(function)
+            functions = self._scopedBindings.setdefault(context, {})
+            functions.setdefault(event, []).append(function)
+        self._compile()
 
-    def unbind(self, event, function):
+    def unbind(self, event, function, context=None):
         assert event in self._eventBindings
-        if function in self._eventBindings[event]:
-            self._eventBindings[event].remove(function)
+        if context is None:
+            self._eventBindings[event].discard(function)
+        else:
+            functions = self._scopedBindings.get(context, {}).get(event, [])
+            if function in functions:
+                functions.remove(function)
+            elif weakref.WeakMethod(function) in functions:
+                functions.remove(weakref.WeakMethod(function))
+        self._compile()
+
+    def release(self, context):
+        """Drops every binding of context, say when it is left for good."""
+        if context in self._scopedBindings:
+            del self._scopedBindings[context]
+            self._compile()
+
+    def _compile(self):
+        if type(self._eventBindings) is tuple:  # Nothing registered yet
+            return
+        dispatch = {}
+        scoped = {}
+        if self._context is not None:
+            scoped = self._scopedBindings.get(self._context, {})
+        for event, functions in self._eventBindings.items():
+            functions = list(functions)
+            for function in scoped.get(event, ()):
+                if isinstance(function, weakref.WeakMethod):
+                    function = function()
+                functions.append(function)
+            dispatch[event] = tuple(functions)
+        self._dispatch = dispatch
 
     def emit(self, event, *args):
-        assert event in self._eventBindings
-        for function in self._eventBindings[event]:
+        for function in self._dispatch[event]:
             function(*args)
 
     def __repr__(self):
@@ -58,3 +117,18 @@ if __name__ == "__main__":
     eventHandler.emit("goat", "peeper")  # Would crash if goat were to handle the event.
     print(eventHandler)
 
+    # Context bindings only hear events while their context is active
+    class Screen:
+        def __init__(self, name):
+            self.name = name
+
+        def onGoat(self, *args):
+            print(self.name, args)
+
+    title, level = Screen("title"), Screen("level")
+    eventHandler.bind("goat", title.onGoat, title)
+    eventHandler.bind("goat", level.onGoat, level)
+    eventHandler.context = title
+    eventHandler.emit("goat", 1, 2, 3)  # Only title hears it
+    eventHandler.context = level
+    eventHandler.emit("goat", 4, 5, 6)  # Only level hears it
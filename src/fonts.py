@@ -0,0 +1,113 @@
+import pygame
+
+from .cache import LRUCache, surface_bytes
+from .settings import TEXT_CACHE_BYTES
+
+DIGITS = "0123456789-"
+
+_fonts = {}  # (face, size): Font
+_atlases = {}  # (face, size, color): GlyphAtlas
+_labels = {}  # (template, face, size, color): NumberLabel
+_texts = LRUCache(TEXT_CACHE_BYTES, surface_bytes)
+
+
+def get_font(size, face=None):
+    """Returns the shared Font of face at size, face None being the default."""
+    key = face, size
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(face, size)
+    return font
+
+
+def render_text(text, size, color, face=None):
+    """Renders text, or returns the surface rendered by an identical call.
+
+    The surface is shared, so it must not be drawn on.
+    """
+    key = text, face, size, tuple(color)
+    image = _texts.get(key)
+    if image is None:
+        image = get_font(size, face).render(text, True, color)
+        _texts.put(key, image)
+    return image
+
+
+class GlyphAtlas:
+    """A set of glyphs rendered once, side by side on a single surface.
+
+    Strings made of those glyphs are drawn by blitting areas of the atlas,
+    so no text is rasterized after the atlas is built.
+    """
+
+    def __init__(self, font, color, glyphs=DIGITS):
+        images = [font.render(glyph, True, color) for glyph in glyphs]
+        w = sum(image.get_width() for image in images)
+        h = max(image.get_height() for image in images)
+        self.surface = pygame.Surface((w, h), pygame.SRCALPHA, 32)
+        self.height = h
+        self.areas = {}  # glyph: area of surface
+        x = 0
+        for glyph, image in zip(glyphs, images):
+            # A max blend onto the transparent atlas copies the glyph as is
+            self.surface.blit(image, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.areas[glyph] = pygame.Rect(x, 0, image.get_width(), h)
+            x += image.get_width()
+
+    def width(self, s):
+        areas = self.areas
+        return sum(areas[glyph].w for glyph in s)
+
+    def draw(self, display, s, pos):
+        """Draws s with its top left corner at pos, returns the covered rect."""
+        x, y = int(pos[0]), int(pos[1])
+        left = x
+        surface = self.surface
+        areas = self.areas
+        for glyph in s:
+            area = areas[glyph]
+            display.blit(surface, (x, y), area)
+            x += area.w
+        return pygame.Rect(left, y, x - left, self.height)
+
+
+def get_atlas(size, color, face=None):
+    key = face, size, tuple(color)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(get_font(size, face), color)
+    return atlas
+
+
+class NumberLabel:
+    """Text with an integer in it, like "Score: %i".
+
+    The text around the number is rendered once, the number is drawn from
+    a glyph atlas, so changing the number costs a few blits.
+    """
+
+    def __init__(self, template, size, color, face=None):
+        prefix, suffix = template.split("%i")
+        self.prefix = render_text(prefix, size, color, face) if prefix else None
+        self.suffix = render_text(suffix, size, color, face) if suffix else None
+        self.atlas = get_atlas(size, color, face)
+
+    def draw(self, display, value, pos):
+        """Draws the label at pos, returns the covered rect."""
+        x, y = int(pos[0]), int(pos[1])
+        rect = pygame.Rect(x, y, 0, 0)
+        if self.prefix:
+            rect = display.blit(self.prefix, (x, y))
+            x = rect.right
+        rect = rect.union(self.atlas.draw(display, str(int(value)), (x, y)))
+        if self.suffix:
+            rect = rect.union(display.blit(self.suffix, (rect.right, y)))
+        return rect
+
+
+def get_label(template, size, color, face=None):
+    key = template, face, size, tuple(color)
+    label = _labels.get(key)
+    if label is None:
+        label = _labels[key] = NumberLabel(template, size, color, face)
+    return label
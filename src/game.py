@@ -1,25 +1,99 @@
-from math import sqrt, hypot, sin, cos, pi, atan2
+from itertools import chain, count
+from math import hypot, sin, cos, pi, atan2
+from operator import attrgetter
 
+import numpy as np
 import pygame
 
 from .physics.geometry import point_on_line
 from .physics.primitives import Circle, Capsule, Rectangle, Arc
+from .physics.bvh import BVH
+from .physics.candidatecache import CandidateCache
+from .physics.compiled import compile_shape
+from .physics.contacts import ContactBuffer
+from .physics.distancefield import NONE as FIELD_NONE, DistanceField
+from .physics.sortandsweep import SortAndSweep
+from .physics.grid import UniformGrid
 from .physics.quadtree import QuadTree
-from .render import (
-    render_level,
-    render_silhouette,
-    render_silhouette_multisampled,
-    render_string,
-)
-from .settings import COLOR0, COLOR1, COLOR2, COLOR3, COLOR4
-from .particle import Explosion, ParticleSystem, Text
+from .compositor import Compositor
+from .fonts import get_label
+from .silhouettes import SilhouetteCache
+from .settings import COLOR0, COLOR1, COLOR2, COLOR3
+from .levelfile import read_index, read_level, read_shapes, save_level
+from .particle import ParticleSystem
+from .profiler import profiler
 from .event import EventHandler
-from .menu import sinInterpolation
 from . import settings
-from .settings import MAX_BALL_BUMPS, FRICTION, GRAVITY
+from .settings import MAX_BALL_BUMPS, FRICTION, GRAVITY, SPATIAL_INDEX, SUBSTEPS
+from .settings import BALL_COLLISIONS, COLLISION_MODE, MAX_SWEEP_BOUNCES
+from .settings import CANDIDATE_CACHE, CANDIDATE_LOOKAHEAD, CANDIDATE_MARGIN
+from .settings import BATCHED_QUERY_BALLS, SCALAR_BALLS
+from .settings import FIELD_CELL, FIELD_REACH, FIELD_TILE
+
+SPATIAL_INDEXES = {"quadtree": QuadTree, "grid": UniformGrid, "bvh": BVH}
+EMITTER = 320, 24  # x, y
+CATCHER = 320, 540, 84, 100  # x, y, r0, r1
+CATCHER_ID = -1  # The catcher in contacts, blocks are numbered from 0
+BLOCK_ID = attrgetter("id")
+BLOCK_SERIAL = attrgetter("serial")
+
+silhouettes = SilhouetteCache(
+    settings.SILHOUETTE_CACHE_BYTES, settings.SILHOUETTE_CACHE_DIR
+)
+SAMPLES = settings.SUPERSAMPLING if settings.ANTIALIASING else 1
+
+
+def render_silhouette(shape, color):
+    return silhouettes.get(shape, color, SAMPLES)
+
+
+def sweep_rect(x0, y0, x1, y1, r):
+    """The rect covering a circle moving from (x0, y0) to (x1, y1)."""
+    return pygame.Rect(
+        int(min(x0, x1) - r) - 1,
+        int(min(y0, y1) - r) - 1,
+        int(abs(x1 - x0) + r * 2.0) + 3,
+        int(abs(y1 - y0) + r * 2.0) + 3,
+    )
+
+
+def distance_normal(shape, x, y, h=1e-4):
+    """Returns the signed distance from (x, y) to shape and the unit normal
+    pointing out of it, the gradient of the distance by central
+    differences. The normal is None, None where the gradient vanishes."""
+    d = float(shape.distance_array(x, y))
+    gx = float(shape.distance_array(x + h, y)) - float(shape.distance_array(x - h, y))
+    gy = float(shape.distance_array(x, y + h)) - float(shape.distance_array(x, y - h))
+    length = hypot(gx, gy)
+    if not length:
+        return d, None, None
+    return d, gx / length, gy / length
 
-if settings.ANTIALIASING:
-    render_silhouette = render_silhouette_multisampled
+
+def bake_sprites(block):
+    """Renders the sprites of block, untouched and touched."""
+    for color in COLOR1, COLOR2:
+        render_silhouette(block.geom, color)
+
+
+def prepare_level(assets, path=None):
+    """Loads a level and bakes the sprites of a game on it.
+
+    Sprites are baked on the assets pool, into the silhouette cache, so
+    starting a game on the level renders nothing. This may itself run on
+    the pool.
+
+    @param path:
+        A level file, by default the built-in level is loaded.
+    """
+    level = Level()
+    level.load(path)
+    assets.submit_batches(bake_sprites, level.packedBlocks)
+    if COLLISION_MODE == "field":
+        level.distanceField  # Baked here rather than on the first tick
+    assets.submit(Emitter, *EMITTER)
+    assets.submit(Catcher, *CATCHER)
+    return level
 
 
 class GUI(object):
@@ -30,62 +104,103 @@ class GUI(object):
         self.score = 0
         self.balls = 0
 
-    @property
-    def score(self):
-        return self._score
-
-    @score.setter
-    def score(self, x):
-        self._score = x
-        self.score_image = render_string("Score: %i" % self.score, COLOR1)
-
-    @property
-    def balls(self):
-        return self._balls
-
-    @balls.setter
-    def balls(self, x):
-        self._balls = x
-        self.balls_image = render_string("Balls: %i" % self.balls, COLOR1)
-
     def draw(self, display):
-        display.blit(self.score_image, (self.x, self.y))
-        display.blit(self.balls_image, (self.x, self.y + 30))
+        # Numbers are drawn from a glyph atlas, so scoring renders no text
+        score = get_label("Score: %i", 28, COLOR1)
+        balls = get_label("Balls: %i", 28, COLOR1)
+        return [
+            score.draw(display, self.score, (self.x, self.y)),
+            balls.draw(display, self.balls, (self.x, self.y + 30)),
+        ]
 
 
 class Block:
+    serials = count()
+
     def __init__(self, geom):
         self.touched = False
         self.geom = geom
+        # Creation order, which sets of blocks don't keep, for runs to be
+        # reproducible
+        self.serial = next(Block.serials)
+        self.slot = None  # Index among the packed shapes of its type
+        self.id = None  # Index in the level's packedBlocks
+        self._compiled = None
         self.rect = pygame.Rect(geom.aabb)
-        self._image = render_silhouette(geom, COLOR1)
-        self._hitImage = render_silhouette(geom, COLOR2)
+        # Rendered when first drawn, so loading a level or playing it
+        # headless renders nothing.
+        self._image = None
+        self._hitImage = None
 
     @property
     def image(self):
-        return self._hitImage if self.touched else self._image
+        if self.touched:
+            if self._hitImage is None:
+                self._hitImage = render_silhouette(self.geom, COLOR2)
+            return self._hitImage
+        if self._image is None:
+            self._image = render_silhouette(self.geom, COLOR1)
+        return self._image
+
+    @property
+    def compiled(self):
+        """geom compiled for the narrow phase, when first needed, as most
+        blocks of a large level never are."""
+        if self._compiled is None:
+            self._compiled = compile_shape(self.geom)
+        return self._compiled
 
     def touch(self):
         self.touched = True
 
 
 class Level:
-    def __init__(self, x=0, y=0, w=960, h=540):
+    def __init__(self, x=0, y=0, w=960, h=540, spatialIndex=SPATIAL_INDEX):
+        """
+        @param spatialIndex:
+            The name of the block broad-phase backend, a key of
+            SPATIAL_INDEXES.
+        """
         self.x = x
         self.y = y
         self.w = w
         self.h = h
+        self.startingBalls = 12
 
         self.plans = set()
         self.blocks = set()
+        self.version = 0  # Bumped whenever blocks are removed from play
+        self._distanceField = None  # Baked when first used
 
+        self.spatialIndex = spatialIndex
+        self.makeIndexes()
+
+    def makeIndexes(self):
+        x, y, w, h = self.x, self.y, self.w, self.h
         self.planTree = QuadTree(boundingRect=(x, y, x + w, y + h))
-        self.quadTree = QuadTree(boundingRect=(x, y, x + w, y + h))
+        self.blockIndex = SPATIAL_INDEXES[self.spatialIndex](
+            boundingRect=(x, y, x + w, y + h)
+        )
 
-    def save(self):
-        pass
+    def save(self, path, index=False):
+        """Writes the blocks to a level file, see levelfile.
+
+        @param index:
+            Whether to embed the block index, so loading it into a level
+            using the same kind of index doesn't build it again. Only
+            indexes made of arrays, like grid and bvh, can be embedded.
+        """
+        save_level(self, path, index)
+
+    def load(self, path=None):
+        """Adds the blocks of a level file, or of the built-in level.
+
+        path is a file path, which is memory mapped, or the bytes of a file.
+        """
+        if path is not None:
+            self.loadFile(path)
+            return
 
-    def load(self):
         self.startingBalls = 12
         self.blocks |= set(
             Block(Circle(480 - 192 + 384 / 16 * i, 250 + i % 2 * 24, 16.0))
@@ -116,47 +231,317 @@ class Level:
             Block(Rectangle(32.0 + 48.0 * i, 400.0, 24.0, 16.0)) for i in range(13)
         )
 
-        for block in self.blocks:
-            self.quadTree.insert(block)
-
+        self.blockIndex.insert_many(self.blocks)
+
+        self.pack()
+
+    def loadFile(self, path):
+        header, sections = read_level(path)
+        area = header["x"], header["y"], header["w"], header["h"]
+        if area != (self.x, self.y, self.w, self.h):
+            self.x, self.y, self.w, self.h = area
+            self.makeIndexes()
+            self.planTree.insert_many(self.plans)
+            self.blockIndex.insert_many(self.blocks)
+        self.startingBalls = header["startingBalls"]
+
+        blocks = [Block(shape) for shape in read_shapes(sections)]
+        self.blocks |= set(blocks)
+
+        index = read_index(sections)
+        if index is not None and header["index"] == self.spatialIndex:
+            numbers, arrays = index
+            self.blockIndex.restore([blocks[i] for i in numbers], arrays)
+        else:
+            self.blockIndex.insert_many(blocks)
+        self.pack()
+
+    def removeBlocks(self, blocks):
+        self.blocks -= blocks
+        self.blockIndex.remove_many(blocks)
+        if self._distanceField is not None:
+            self._distanceField.remove(blocks, self.blockIndex)
+        self.version += 1
 
-class Ball(object):
-    def __init__(self, x, y, r):
-        self.bumps = 0
-
-        self.geom = geom = Circle(x, y, r)
-        geom.xp = x
-        geom.yp = y
-
-        self.rect = pygame.Rect(geom.aabb)
-        self.image = render_silhouette(geom, COLOR3)
+    @property
+    def distanceField(self):
+        """The DistanceField of the blocks, baked when first used."""
+        if self._distanceField is None:
+            x, y, w, h = self.x, self.y, self.w, self.h
+            field = DistanceField(
+                (x, y, x + w, y + h), FIELD_CELL, FIELD_REACH, FIELD_TILE
+            )
+            field.bake(self.blocks)
+            self._distanceField = field
+        return self._distanceField
+
+    def pack(self):
+        """Packs block shapes by primitive type for the batched narrow phase.
+
+        Removed blocks may linger in the packed arrays, they are simply
+        never returned by the block index anymore. Ids follow the order
+        blocks were made in.
+        """
+        groups = {}
+        self.packedBlocks = sorted(self.blocks, key=BLOCK_SERIAL)  # Block of each id
+        for i, block in enumerate(self.packedBlocks):
+            block.id = i
+            group = groups.setdefault(type(block.geom), [])
+            block.slot = len(group)
+            group.append(block.geom)
+        self.packed = {kind: kind.pack(geoms) for kind, geoms in groups.items()}
+        # The packed type and slot of each id, for batches of block ids
+        self.packedKinds = list(groups)
+        codes = {kind: k for k, kind in enumerate(self.packedKinds)}
+        self.blockKinds = np.array(
+            [codes[type(block.geom)] for block in self.packedBlocks], dtype=int
+        )
+        self.blockSlots = np.array(
+            [block.slot for block in self.packedBlocks], dtype=int
+        )
+        self._distanceField = None  # Ids changed, bake it again
+
+
+class BallBatch:
+    """Struct-of-arrays storage for every ball in play.
+
+    Ball i lives at index i of x, xp, y, yp, r, bumps and rects. Integration,
+    wall bounces, culling and rect updates run over all balls at once.
+    Culling compacts the arrays, so an index is only meaningful until then.
+    """
+
+    def __init__(self, capacity=64):
+        self.count = 0
+
+        self.x = np.zeros(capacity)
+        self.xp = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.yp = np.zeros(capacity)
+        self.r = np.zeros(capacity)
+        self.bumps = np.zeros(capacity, dtype=int)
+        self.rects = np.zeros((capacity, 4), dtype=int)  # left, top, w, h
+
+        self.images = {}  # radius: image
+        self.broadPhase = SortAndSweep()  # For collide
+        self.candidates = CandidateCache(CANDIDATE_MARGIN, CANDIDATE_LOOKAHEAD)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        for name in "x", "xp", "y", "yp", "r", "bumps", "rects":
+            old = getattr(self, name)
+            new = np.zeros((len(old) * 2,) + old.shape[1:], dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def add(self, x, y, r, vx=0.0, vy=0.0):
+        """Adds a ball moving at (vx, vy) per step, returns its index."""
+        if self.count == len(self.x):
+            self._grow()
+        i = self.count
+        self.count += 1
+
+        self.x[i] = x
+        self.xp[i] = x - vx
+        self.y[i] = y
+        self.yp[i] = y - vy
+        self.r[i] = r
+        self.bumps[i] = 0
+        self.rects[i, 2:] = int(r * 2.0)
+        self.updateRects()
+        self.candidates.add(i)
+
+        if r not in self.images:
+            self.images[r] = render_silhouette(Circle(x, y, r), COLOR3)
+        return i
+
+    def add_many(self, x, y, r, vx=0.0, vy=0.0):
+        """Adds balls from arrays, like add, returns their indices."""
+        n = len(x)
+        while self.count + n > len(self.x):
+            self._grow()
+        i = np.arange(self.count, self.count + n)
+        self.count += n
+
+        r = np.broadcast_to(r, (n,))
+        self.x[i] = x
+        self.xp[i] = x - np.asarray(vx)
+        self.y[i] = y
+        self.yp[i] = y - np.asarray(vy)
+        self.r[i] = r
+        self.bumps[i] = 0
+        self.rects[i, 2:] = (r * 2.0).astype(int)[:, np.newaxis]
+        self.updateRects()
+        for k in i.tolist():
+            self.candidates.add(k)
+
+            radius = self.r[k].item()
+            if radius not in self.images:
+                circle = Circle(self.x[k].item(), self.y[k].item(), radius)
+                self.images[radius] = render_silhouette(circle, COLOR3)
+        return i
+
+    def clear(self):
+        self.count = 0
+        self.candidates.clear()
+
+    def get(self, i):
+        """Returns x, y, xp, yp and r of ball i as floats."""
+        return (
+            self.x[i].item(),
+            self.y[i].item(),
+            self.xp[i].item(),
+            self.yp[i].item(),
+            self.r[i].item(),
+        )
 
-    def accelerate(self, multiplier):
-        geom = self.geom
-        geom.xp = geom.xp - (geom.x - geom.xp) * multiplier
-        geom.yp = geom.yp - (geom.y - geom.yp) * multiplier
+    def set(self, i, x, y, xp, yp):
+        self.x[i] = x
+        self.y[i] = y
+        self.xp[i] = xp
+        self.yp[i] = yp
+
+    def rect(self, i):
+        return pygame.Rect(self.rects[i].tolist())
+
+    def colliderect(self, rect):
+        """Returns the mask of balls whose rect overlaps rect."""
+        rects = self.rects[: self.count]
+        return (
+            (rects[:, 0] < rect.right)
+            & (rect.left < rects[:, 0] + rects[:, 2])
+            & (rects[:, 1] < rect.bottom)
+            & (rect.top < rects[:, 1] + rects[:, 3])
+        )
 
-    def accelerateInDirection(self, direction, acceleration):
-        self.geom.xp -= cos(direction) * acceleration
-        self.geom.yp -= sin(direction) * acceleration
+    def scaleVelocities(self, factor):
+        n = self.count
+        self.xp[:n] = self.x[:n] - (self.x[:n] - self.xp[:n]) * factor
+        self.yp[:n] = self.y[:n] - (self.y[:n] - self.yp[:n]) * factor
 
-    def accelerateTowardsPoint(self, x, y, acceleration):
-        dx = x - self.geom.x
-        dy = y - self.geom.y
-        dist = sqrt(dx ** 2 + dy ** 2)
-        self.geom.xp -= (dx / dist) * acceleration
-        self.geom.yp -= (dy / dist) * acceleration
+    def update(self, substeps=1):
+        """Integrates one step, or 1/substeps of one.
 
-    def update(self):
-        geom = self.geom
+        When substepping, velocities must have been scaled by 1/substeps.
+        """
+        n = self.count
+        x, xp = self.x[:n], self.xp[:n]
+        y, yp = self.y[:n], self.yp[:n]
+        damping = (1.0 - FRICTION) ** (1.0 / substeps)
 
         # Verlet integration
-        geom.x, geom.xp = geom.x * (2.0 - FRICTION) - geom.xp * (1.0 - FRICTION), geom.x
-        geom.y, geom.yp = geom.y * (2.0 - FRICTION) - geom.yp * (1.0 - FRICTION), geom.y
+        x_new = x + (x - xp) * damping
+        y_new = y + (y - yp) * damping
+        xp[:] = x
+        yp[:] = y
+        x[:] = x_new
+        y[:] = y_new
+
+        yp -= GRAVITY / substeps ** 2
+
+        self.updateRects()
+
+    def updateRects(self):
+        n = self.count
+        rects = self.rects[:n]
+        rects[:, 0] = np.round(self.x[:n]) - rects[:, 2] // 2
+        rects[:, 1] = np.round(self.y[:n]) - rects[:, 3] // 2
+
+    def bounceWalls(self, left, right):
+        """Inverts the horizontal motion of balls touching the walls."""
+        n = self.count
+        x, xp, r = self.x[:n], self.xp[:n], self.r[:n]
+        hit = (x < left + r) | (x + r > right)
+        x[hit], xp[hit] = xp[hit], x[hit]
+
+    def collide(self):
+        """Bounces overlapping balls off each other, elastically.
+
+        Balls weigh r squared. Overlapping balls are pushed apart along the
+        line between their centres, the lighter one further. Pushing moves
+        xp along with x, keeping the velocity x - xp, then balls closing in
+        exchange the part of their velocity along that line, which only
+        moves xp. Pairs are all solved from the same positions, a ball in
+        several pairs sums their corrections.
+
+        Returns the number of touching pairs.
+        """
+        n = self.count
+        x, xp, r = self.x[:n], self.xp[:n], self.r[:n]
+        y, yp = self.y[:n], self.yp[:n]
+        a, b = self.broadPhase.pairs(x, y, r)
+        dx = x[b] - x[a]
+        dy = y[b] - y[a]
+        d2 = dx * dx + dy * dy
+        reach = r[a] + r[b]
+        touching = d2 < reach * reach
+        if not touching.any():
+            return 0
+        a, b, dx, dy, d2, reach = (
+            array[touching] for array in (a, b, dx, dy, d2, reach)
+        )
 
-        geom.yp -= GRAVITY
+        # Balls sharing a centre are pushed apart horizontally
+        d = np.sqrt(d2)
+        same = d == 0.0
+        d[same] = 1.0
+        nx = dx / d
+        ny = dy / d
+        nx[same] = 1.0
+
+        ma = r[a] * r[a]
+        mb = r[b] * r[b]
+        wa = mb / (ma + mb)  # The share of the correction a takes
+        wb = 1.0 - wa
+        overlap = reach - np.where(same, 0.0, d)
+
+        # Velocity along the normal, negative when closing in
+        vn = (x[b] - xp[b] - x[a] + xp[a]) * nx + (y[b] - yp[b] - y[a] + yp[a]) * ny
+        vn = np.minimum(vn, 0.0) * 2.0
+
+        for u, up, normal in (x, xp, nx), (y, yp, ny):
+            push = np.bincount(b, overlap * normal * wb, n) - np.bincount(
+                a, overlap * normal * wa, n
+            )
+            bounce = np.bincount(a, vn * normal * wa, n) - np.bincount(
+                b, vn * normal * wb, n
+            )
+            u += push
+            up += push - bounce
+
+        self.updateRects()
+        return len(a)
+
+    def cull(self, bottom, maxBumps):
+        """Removes balls below bottom or bumped too often.
+
+        Returns the x and y arrays of the removed balls.
+        """
+        n = self.count
+        dead = (self.y[:n] > bottom + self.r[:n]) | (self.bumps[:n] > maxBumps)
+        deadX = self.x[:n][dead]
+        deadY = self.y[:n][dead]
+        if len(deadX):
+            alive = ~dead
+            self.count = int(alive.sum())
+            for name in "x", "xp", "y", "yp", "r", "bumps", "rects":
+                array = getattr(self, name)
+                array[: self.count] = array[:n][alive]
+            self.candidates.compact(alive.tolist())
+        return deadX, deadY
 
-        self.rect.center = geom.x, geom.y
+    def draw(self, display):
+        n = self.count
+        images = self.images
+        return display.blits(
+            [
+                (images[r], (left, top))
+                for r, (left, top) in zip(
+                    self.r[:n].tolist(), self.rects[:n, :2].tolist()
+                )
+            ]
+        )
 
 
 class Emitter:
@@ -165,14 +550,20 @@ class Emitter:
         self.rect = pygame.Rect(self.geom.aabb)
         self.image = render_silhouette(self.geom, COLOR3)
 
+        self.direction = pi / 2.0  # Straight down
+
+    def aimAt(self, x, y):
+        self.direction = atan2(y - self.geom.y, x - self.geom.x)
+
     def draw(self, display):
-        display.blit(self.image, self.rect)
         geom = self.geom
-        mx, my = pygame.mouse.get_pos()
-        direction = atan2(my - geom.y, mx - geom.x)
+        direction = self.direction
         x = int(geom.x + cos(direction) * (geom.r + 1.0))
         y = int(geom.y + sin(direction) * (geom.r + 1.0))
-        pygame.draw.line(display, COLOR0, (geom.x, geom.y), (x, y), 5)
+        return [
+            display.blit(self.image, self.rect),
+            pygame.draw.line(display, COLOR0, (geom.x, geom.y), (x, y), 5),
+        ]
 
 
 class Catcher:
@@ -182,21 +573,27 @@ class Catcher:
         geom.yp = y
 
         self.fix = 0.1
+        self.targetX = x
 
         self.rect = pygame.Rect(geom.aabb)
         self.image = render_silhouette(geom, COLOR3)
 
     def update(self):
         geom = self.geom
-        geom.x = geom.x * (1.0 - self.fix) + pygame.mouse.get_pos()[0] * self.fix
+        geom.x = geom.x * (1.0 - self.fix) + self.targetX * self.fix
         self.rect.centerx = geom.x
 
     def draw(self, display):
-        display.blit(self.image, self.rect)
+        return [display.blit(self.image, self.rect)]
 
 
 class Game(EventHandler):
-    def __init__(self, main):
+    def __init__(self, main=None):
+        """
+        @param main:
+            The EventHandler feeding mouse and quit events. Without one, the
+            game is driven by calling launchBall and update directly.
+        """
         self.score = 0
         self.multiplier = 1.0
         self.avaibleBalls = 10
@@ -205,25 +602,51 @@ class Game(EventHandler):
 
         self.particleSystem = ParticleSystem()
 
-        self.level = Level()
+        self.level = None  # Made by start
 
-        self.emitter = Emitter(320, 24)
-        self.catcher = Catcher(320, 540, 84, 100)
+        self.emitter = Emitter(*EMITTER)
+        self.catcher = Catcher(*CATCHER)
 
         # Containers
-        self.balls = set()
-
-        # Event responses
-        main.bind("quit", self.lose)
-        main.bind("mouseButtonDown", self.onMousePress)
+        self.balls = BallBatch()
+        self.contacts = ContactBuffer()  # Of the last tick
+        self.touchedBlocks = set()  # Removed at the next turn
+
+        self.substeps = SUBSTEPS
+        self.collisionMode = COLLISION_MODE
+        self.ballCollisions = BALL_COLLISIONS
+        self.candidateCache = CANDIDATE_CACHE
+
+        self.compositor = None  # Made by start, once the level size is known
+
+        # Event responses, while this game is main's context
+        if main is not None:
+            main.bind("quit", self.lose, self)
+            main.bind("input", self.onInput, self)
+
+    def onInput(self, records):
+        """Handles the input records of a frame."""
+        for event, args in records:
+            if event == "mouseMotion":
+                self.onMouseMotion(*args)
+            elif event == "mouseButtonDown":
+                self.onMousePress(*args)
+
+    def onMouseMotion(self, pos, rel, buttons):
+        self.emitter.aimAt(*pos)
+        self.catcher.targetX = pos[0]
 
     def onMousePress(self, pos, button):
         if button == 1:
+            self.emitter.aimAt(*pos)
             self.launchBall()
 
-    def start(self):
-        self.level = Level()
-        self.level.load()
+    def start(self, level=None):
+        """Starts a game on level, by default a new built-in level."""
+        if level is None:
+            level = Level()
+            level.load()
+        self.level = level
 
         self.score = 0
         self.multiplier = 1.0
@@ -233,15 +656,23 @@ class Game(EventHandler):
         self.GUI.balls = self.avaibleBalls
 
         self.balls.clear()
+        self.contacts.clear()
+        self.touchedBlocks = set(b for b in self.level.blocks if b.touched)
         self.particleSystem.clear()
 
-    def launchBall(self):
+        size = self.level.w, self.level.h
+        if self.compositor is None or self.compositor.background.get_size() != size:
+            self.compositor = Compositor(size)
+        self.compositor.bake(self.level)
+
+    def launchBall(self, direction=None):
+        """Launches a ball in direction, by default where the emitter aims."""
+        if direction is None:
+            direction = self.emitter.direction
         if self.avaibleBalls > 0:
             self.avaibleBalls -= 1
-            x, y = pygame.mouse.get_pos()
-            b = Ball(self.emitter.geom.x, self.emitter.geom.y, 12)
-            b.accelerateTowardsPoint(x, y, 2.8)
-            self.balls.add(b)
+            x, y = self.emitter.geom.x, self.emitter.geom.y
+            self.balls.add(x, y, 12, cos(direction) * 2.8, sin(direction) * 2.8)
         self.newTurn()
 
     def win(self):  # Will be overridden with main module methods
@@ -259,8 +690,9 @@ class Game(EventHandler):
     def newTurn(self):
         self.multiplier = 1.0
 
-        blocksToRemove = set(b for b in self.level.blocks if b.touched)
-        self.level.blocks -= blocksToRemove
+        blocksToRemove = self.touchedBlocks
+        self.touchedBlocks = set()
+        self.level.removeBlocks(blocksToRemove)
 
         if self.winCondition():
             self.win()
@@ -268,103 +700,522 @@ class Game(EventHandler):
             self.lose()
 
         for block in blocksToRemove:
-            self.particleSystem.add(
-                Explosion(block.rect.centerx, block.rect.centery, 18)
-            )
-        if self.level.blocks and blocksToRemove:
-            self.level.quadTree = QuadTree(items=self.level.blocks)
+            self.particleSystem.explode(block.rect.centerx, block.rect.centery, 18)
+            self.compositor.invalidate(block.rect)
 
         self.GUI.balls = self.avaibleBalls
 
-    def addScore(self):
-        self.score += 100.0 * self.multiplier
-        self.multiplier += 0.5
+    def addScore(self, touches=1):
+        """Scores touches new blocks, each worth half a multiplier more."""
+        multiplier = self.multiplier
+        self.score += 100.0 * (touches * multiplier + 0.25 * touches * (touches - 1))
+        self.multiplier = multiplier + 0.5 * touches
         self.GUI.score = int(self.score)
 
     def updateDynamics(self):
-        for ball in self.balls:
-            ball.update()
-            bg = ball.geom
-
-            # Level walls
-            if bg.x < bg.r or bg.x + bg.r > self.level.w:
-                bg.x, bg.xp = bg.xp, bg.x
-
-            # Block collisions
-            for block in self.level.quadTree.hit(ball.rect):
-                dx, dy = block.geom.hit_circle(bg.x, bg.y, bg.r)
+        """Advances the physics by one tick, in self.substeps substeps.
+
+        The contacts of the tick are left in self.contacts, for
+        processContacts.
+        """
+        self.contacts.clear()
+        substeps = self.substeps
+        if (
+            len(self.balls) < SCALAR_BALLS
+            and self.collisionMode == "discrete"
+            and not self.ballCollisions
+        ):
+            self.stepScalar(substeps)
+            return
+
+        if substeps > 1:
+            self.balls.scaleVelocities(1.0 / substeps)
+        for substep in range(substeps):
+            self.stepDynamics(substeps)
+        if substeps > 1:
+            self.balls.scaleVelocities(substeps)
+
+    def stepDynamics(self, substeps=1):
+        balls = self.balls
+        balls.update(substeps)
+        balls.bounceWalls(self.level.x, self.level.x + self.level.w)
+        if self.ballCollisions:
+            balls.collide()
+
+        if self.collisionMode == "swept":
+            self.sweepBlocks()
+        elif self.collisionMode == "field":
+            self.fieldBlocks()
+        else:
+            self.collideBlocks()
+
+        # Catcher
+        catcher = self.catcher
+        near = np.flatnonzero(balls.colliderect(catcher.rect))
+        if len(near):
+            hit = catcher.geom.hit_circles(balls.x[near], balls.y[near], balls.r[near])
+            for i in near[hit[2]].tolist():
+                x, y, xp, yp, r = balls.get(i)
+                px, py = point_on_line(xp, yp, x, y, catcher.geom.x, catcher.geom.y)
+                xp = px * 2.0 - xp
+                yp = py * 2.0 - yp
+
+                xp, x = x, xp  # Invert motion
+                yp, y = y, yp
+                balls.set(i, x, y, xp, yp)
+
+                impulse = 2.0 * hypot(px - xp, py - yp)
+                self.contacts.add(i, CATCHER_ID, x, y, impulse)
+
+    def stepScalar(self, substeps=1):
+        """The discrete substeps of a tick, ball by ball on floats.
+
+        With a handful of balls, the NumPy calls of stepDynamics cost more
+        than the work they do. This takes the same steps, with the same
+        results, for games without ball collisions: balls touching one block
+        bounce off it, the others go through their blocks in id order, and
+        contacts come in the order collideBlocks and the catcher add them.
+        """
+        balls = self.balls
+        n = balls.count
+        if not n:
+            return
+        xs = balls.x[:n].tolist()
+        ys = balls.y[:n].tolist()
+        xps = balls.xp[:n].tolist()
+        yps = balls.yp[:n].tolist()
+        rs = balls.r[:n].tolist()
+        rects = balls.rects[:n].tolist()
+
+        left = self.level.x
+        right = left + self.level.w
+        scale = 1.0 / substeps
+        damping = (1.0 - FRICTION) ** scale
+        gravity = GRAVITY / substeps ** 2
+        blockIndex = self.level.blockIndex
+        cache = balls.candidates if self.candidateCache else None
+        version = blockIndex, self.level.version
+        catcher = self.catcher
+        contacts = self.contacts
+        candidates = 0
+
+        if substeps > 1:
+            for i in range(n):
+                xps[i] = xs[i] - (xs[i] - xps[i]) * scale
+                yps[i] = ys[i] - (ys[i] - yps[i]) * scale
+        for substep in range(substeps):
+            single = []  # Contacts of balls touching one block
+            several = []  # Contacts of the others
+            caught = []
+            for i in range(n):
+                # Verlet integration, then walls, as BallBatch does
+                x = xs[i]
+                y = ys[i]
+                x, xp = x + (x - xps[i]) * damping, x
+                y, yp = y + (y - yps[i]) * damping, y
+                yp -= gravity
+                rect = rects[i]
+                rect[0] = round(x) - rect[2] // 2
+                rect[1] = round(y) - rect[3] // 2
+                r = rs[i]
+                if x < left + r or x + r > right:
+                    x, xp = xp, x
+
+                # Blocks
+                rect = pygame.Rect(rect)
+                if cache is None:
+                    blocks = blockIndex.hit(rect)
+                else:
+                    blocks = cache.hit(blockIndex, version, i, rect, x - xp, y - yp)
+                if blocks:
+                    candidates += len(blocks)
+                    blocks = sorted(blocks, key=BLOCK_ID)
+                    hits = []
+                    for block in blocks:
+                        dx, dy = block.compiled.hit_circle(x, y, r)
+                        if dx is not None:
+                            hits.append((block, dx, dy))
+                    if len(hits) == 1:
+                        block, dx, dy = hits[0]
+                        px, py = point_on_line(xp, yp, x, y, x - dx, y - dy)
+                        impulse = 2.0 * hypot(px - x, py - y)
+                        x, xp = px * 2.0 - xp, x
+                        y, yp = py * 2.0 - yp, y
+                        single.append((i, block.id, px, py, impulse))
+                    elif hits:
+                        for block in blocks:
+                            dx, dy = block.compiled.hit_circle(x, y, r)
+                            if dx is not None:
+                                px, py = point_on_line(xp, yp, x, y, x - dx, y - dy)
+                                impulse = 2.0 * hypot(px - x, py - y)
+                                x, xp = px * 2.0 - xp, x
+                                y, yp = py * 2.0 - yp, y
+                                several.append((i, block.id, px, py, impulse))
+
+                # Catcher
+                if rect.colliderect(catcher.rect):
+                    geom = catcher.geom
+                    if geom.hit_circle(x, y, r)[0] is not None:
+                        px, py = point_on_line(xp, yp, x, y, geom.x, geom.y)
+                        x, xp = px * 2.0 - xp, x  # Invert motion
+                        y, yp = py * 2.0 - yp, y
+                        impulse = 2.0 * hypot(px - xp, py - yp)
+                        caught.append((i, CATCHER_ID, x, y, impulse))
+
+                xs[i] = x
+                ys[i] = y
+                xps[i] = xp
+                yps[i] = yp
+            for contact in single + several + caught:
+                contacts.add(*contact)
+        if substeps > 1:
+            for i in range(n):
+                xps[i] = xs[i] - (xs[i] - xps[i]) * substeps
+                yps[i] = ys[i] - (ys[i] - yps[i]) * substeps
+
+        balls.set(slice(0, n), xs, ys, xps, yps)
+        balls.rects[:n] = rects
+        if profiler.enabled:
+            profiler.count("candidates", candidates)
+            profiler.count("narrow tests", candidates)
+
+    def collideBlocks(self):
+        """Bounces balls overlapping blocks at the end of the step.
+
+        Every ball is queried and tested at once. Balls touching a single
+        block bounce off it together. Balls touching several are resolved
+        one block at a time, in block id order, since every bounce moves
+        the ball.
+        """
+        balls = self.balls
+        level = self.level
+
+        # Broad phase
+        with profiler.phase("broadphase"):
+            ball, block = self.blockPairs()
+        if profiler.enabled:
+            profiler.count("candidates", len(ball))
+        if not len(ball):
+            return
+
+        # Narrow phase, one kernel call per primitive type
+        with profiler.phase("narrowphase"):
+            dx = np.zeros(len(ball))
+            dy = np.zeros(len(ball))
+            hit = np.zeros(len(ball), dtype=bool)
+            kinds = level.blockKinds[block]
+            present = np.bincount(kinds, minlength=len(level.packedKinds))
+            for k in np.flatnonzero(present).tolist():
+                kind = level.packedKinds[k]
+                pairs = np.flatnonzero(kinds == k)
+                slots = level.blockSlots[block[pairs]]
+                params = tuple(p[slots] for p in level.packed[kind])
+                i = ball[pairs]
+                dx[pairs], dy[pairs], hit[pairs] = kind.hit_circle_packed(
+                    params, balls.x[i], balls.y[i], balls.r[i]
+                )
+            if profiler.enabled:
+                profiler.count("narrow tests", len(ball))
+        touching = np.flatnonzero(hit)
+        if not len(touching):
+            return
+
+        # Balls touching one block, bounced together
+        contacts = self.contacts
+        hits = np.bincount(ball[touching], minlength=balls.count)
+        once = touching[hits[ball[touching]] == 1]
+        if len(once):
+            i = ball[once]
+            x = balls.x[i]
+            y = balls.y[i]
+            xp = balls.xp[i]
+            yp = balls.yp[i]
+            px, py = point_on_line(xp, yp, x, y, x - dx[once], y - dy[once])
+            balls.set(i, px * 2.0 - xp, py * 2.0 - yp, x, y)
+            impulse = 2.0 * np.hypot(px - x, py - y)
+            contacts.add_many(i, block[once], px, py, impulse)
+
+        # The others, in order, as a bounce may take the ball off a block
+        packedBlocks = level.packedBlocks
+        several = np.flatnonzero(hits > 1)
+        starts = np.searchsorted(ball, several).tolist()
+        ends = np.searchsorted(ball, several, side="right").tolist()
+        for i, start, end in zip(several.tolist(), starts, ends):
+            x, y, xp, yp, r = balls.get(i)
+            if profiler.enabled:
+                profiler.count("narrow tests", end - start)
+            for blockId in block[start:end].tolist():
+                dx, dy = packedBlocks[blockId].compiled.hit_circle(x, y, r)
                 if dx is not None:
-                    # Depenetrate
-                    # bg.x -= dx
-                    # bg.y -= dy
-                    # bg.xp -= dx
-                    # bg.yp -= dy
-
                     # Bounce
-                    px, py = point_on_line(
-                        bg.xp, bg.yp, bg.x, bg.y, bg.x - dx, bg.y - dy
-                    )
-                    bg.xp = px * 2.0 - bg.xp
-                    bg.yp = py * 2.0 - bg.yp
-                    bg.xp, bg.x = bg.x, bg.xp
-                    bg.yp, bg.y = bg.y, bg.yp
-
-                    # Gameplay
-                    ball.bumps += 1
-                    if not block.touched:
-                        block.touch()
-                        self.addScore()
-                        self.particleSystem.add(Text(px, py, "x%i" %int(self.multiplier)))
-                    self.particleSystem.add(Explosion(px, py))
-
-            if self.catcher.rect.colliderect(ball.rect):
-                if self.catcher.geom.hit_circle(bg.x, bg.y, bg.r)[0] is not None:
-                    px, py = point_on_line(
-                        bg.xp,
-                        bg.yp,
-                        bg.x,
-                        bg.y,
-                        self.catcher.geom.x,
-                        self.catcher.geom.y,
-                    )
-                    bg.xp = px * 2.0 - bg.xp
-                    bg.yp = py * 2.0 - bg.yp
-
-                    bg.xp, bg.x = bg.x, bg.xp  # Invert motion
-                    bg.yp, bg.y = bg.y, bg.yp
-
-                    self.particleSystem.add(Explosion(ball.geom.x, ball.geom.y, 7))
+                    px, py = point_on_line(xp, yp, x, y, x - dx, y - dy)
+                    xp = px * 2.0 - xp
+                    yp = py * 2.0 - yp
+                    xp, x = x, xp
+                    yp, y = y, yp
+
+                    impulse = 2.0 * hypot(px - xp, py - yp)
+                    contacts.add(i, blockId, px, py, impulse)
+            balls.set(i, x, y, xp, yp)
+
+    def blockPairs(self):
+        """Returns the arrays (ball, block) of the ball indices and the ids
+        of the blocks they may touch, sorted by ball then block id.
+
+        Batched block indexes answer for every ball at once, once there are
+        BATCHED_QUERY_BALLS of them. Fewer balls, or other indexes, are asked
+        ball by ball through blockQuery, which is cheaper for a handful.
+        """
+        balls = self.balls
+        n = balls.count
+        blockIndex = self.level.blockIndex
+        if blockIndex.batched and n >= BATCHED_QUERY_BALLS:
+            ball, blocks = blockIndex.hit_many(balls.rects[:n])
+            block = np.fromiter(map(BLOCK_ID, blocks), int, len(blocks))
+        else:
+            query = self.blockQuery()
+            candidates = [query(i, balls.rect(i)) for i in range(n)]
+            counts = list(map(len, candidates))
+            ball = np.repeat(np.arange(n), counts)
+            blocks = chain.from_iterable(candidates)
+            block = np.fromiter(map(BLOCK_ID, blocks), int, sum(counts))
+        order = np.lexsort((block, ball))
+        return ball[order], block[order]
+
+    def blockQuery(self):
+        """Returns query(i, rect), the blocks ball i may touch within rect.
+
+        With the candidate cache on, they are a superset, served from the
+        region ball i queried last while rect stays within it.
+        """
+        blockIndex = self.level.blockIndex
+        if not self.candidateCache:
+            return lambda i, rect: blockIndex.hit(rect)
+
+        balls = self.balls
+        n = balls.count
+        vx = (balls.x[:n] - balls.xp[:n]).tolist()
+        vy = (balls.y[:n] - balls.yp[:n]).tolist()
+        cache = balls.candidates
+        version = blockIndex, self.level.version
+        return lambda i, rect: cache.hit(blockIndex, version, i, rect, vx[i], vy[i])
+
+    def sweepBlocks(self):
+        """Bounces balls off the first block their motion runs into.
+
+        The whole step is swept, so fast balls can't tunnel through thin
+        blocks. After a bounce the rest of the motion is swept again, up to
+        MAX_SWEEP_BOUNCES times. A ball starting the step inside a block is
+        pushed out of it first, see pushOut.
+        """
+        balls = self.balls
+        blockIndex = self.level.blockIndex
+        query = self.blockQuery()
+        contacts = self.contacts
+        for i in range(len(balls)):
+            x, y, xp, yp, r = balls.get(i)
+            vx = x - xp
+            vy = y - yp
+            x0, y0 = xp, yp  # Where the motion left to sweep starts
+            rest = 1.0  # The fraction of the step left to sweep
+            bounced = False
+            for bounce in range(MAX_SWEEP_BOUNCES):
+                x1 = x0 + vx * rest
+                y1 = y0 + vy * rest
+                sweep = sweep_rect(x0, y0, x1, y1, r)
+                first = None
+                if bounce:
+                    blocks = blockIndex.hit(sweep)
+                else:
+                    blocks = query(i, sweep)
+                    # Sweeps can't see the blocks the ball starts in
+                    pushed = self.pushOut(i, blocks, x0, y0, vx, vy, r)
+                    if pushed is not None:
+                        x0, y0, vx, vy = pushed
+                        bounced = True
+                        x1 = x0 + vx * rest
+                        y1 = y0 + vy * rest
+                        blocks = blockIndex.hit(sweep_rect(x0, y0, x1, y1, r))
+                if profiler.enabled:
+                    profiler.count("candidates", len(blocks))
+                    profiler.count("narrow tests", len(blocks))
+                for block in blocks:
+                    hit = block.geom.sweep_circle(x0, y0, x1, y1, r)
+                    if hit and (
+                        first is None
+                        or hit[0] < first[0][0]
+                        # Ties go to the lowest id, whatever the set order
+                        or (hit[0] == first[0][0] and block.id < first[1].id)
+                    ):
+                        first = hit, block
+                if first is None:
+                    break
+
+                (t, nx, ny), block = first
+                x0 += (x1 - x0) * t
+                y0 += (y1 - y0) * t
+                rest *= 1.0 - t
+
+                # Reflect the velocity about the contact normal
+                dot = vx * nx + vy * ny
+                vx -= 2.0 * dot * nx
+                vy -= 2.0 * dot * ny
+                bounced = True
+
+                contacts.add(i, block.id, x0 - nx * r, y0 - ny * r, 2.0 * abs(dot))
+            else:
+                rest = 0.0  # Out of bounces, stay at the last contact
+
+            if bounced:
+                x = x0 + vx * rest
+                y = y0 + vy * rest
+                balls.set(i, x, y, x - vx, y - vy)
+
+    def pushOut(self, i, blocks, x, y, vx, vy, r):
+        """Pushes ball i, at (x, y) and moving by (vx, vy), out of blocks.
+
+        Each block it overlaps pushes it out along the normal of its
+        distance, reflecting its motion if it moves into the block.
+        Returns the new x, y, vx and vy, or None if no block overlaps it.
+        """
+        pushed = False
+        for block in sorted(blocks, key=BLOCK_ID):
+            if block.compiled.hit_circle(x, y, r)[0] is None:
+                continue
+            d, nx, ny = distance_normal(block.geom, x, y)
+            if nx is None or d >= r:
+                continue
+            x += nx * (r - d)
+            y += ny * (r - d)
+            pushed = True
+
+            dot = vx * nx + vy * ny
+            if dot < 0.0:
+                vx -= 2.0 * dot * nx
+                vy -= 2.0 * dot * ny
+                self.contacts.add(i, block.id, x - nx * r, y - ny * r, -2.0 * dot)
+        return (x, y, vx, vy) if pushed else None
+
+    def fieldBlocks(self):
+        """Bounces balls off blocks through the level's distance field.
+
+        Every ball looks the field up at its center, in one batch. Those
+        closer to a block than their radius and moving towards it reflect
+        their motion about the gradient. Each ball only contacts the block
+        closest to it, touching two at once counts one.
+        """
+        balls = self.balls
+        n = balls.count
+        if not n:
+            return
+
+        with profiler.phase("narrowphase"):
+            x = balls.x[:n]
+            y = balls.y[:n]
+            d, gx, gy, ids = self.level.distanceField.sample(x, y)
+            length = np.hypot(gx, gy)
+            # Balls as large as the reach of the field may have no block
+            i = np.flatnonzero((d < balls.r[:n]) & (length > 0.0) & (ids != FIELD_NONE))
+            if profiler.enabled:
+                profiler.count("narrow tests", n)
+            if not len(i):
+                return
+
+            nx = gx[i] / length[i]
+            ny = gy[i] / length[i]
+            vx = x[i] - balls.xp[i]
+            vy = y[i] - balls.yp[i]
+            dot = vx * nx + vy * ny
+            towards = dot < 0.0
+            i = i[towards]
+            nx = nx[towards]
+            ny = ny[towards]
+            dot = dot[towards]
+
+            # Reflect the velocity about the contact normal, as a bounce
+            # from where the ball is
+            vx = vx[towards] - 2.0 * dot * nx
+            vy = vy[towards] - 2.0 * dot * ny
+            bx = x[i]
+            by = y[i]
+            balls.xp[i] = bx
+            balls.yp[i] = by
+            balls.x[i] = bx + vx
+            balls.y[i] = by + vy
+
+        d = d[i]
+        self.contacts.add_many(i, ids[i], bx - nx * d, by - ny * d, 2.0 * np.abs(dot))
+
+    def processContacts(self):
+        """Gameplay response to the contacts of the last tick, in bulk.
+
+        Balls count a bump per block contact. The first contact with each
+        untouched block touches it and scores, every contact explodes.
+        """
+        contacts = self.contacts
+        n = len(contacts)
+        if not n:
+            return
+        ball = contacts.ball[:n]
+        block = contacts.block[:n]
+        x = contacts.x[:n]
+        y = contacts.y[:n]
+        onBlock = block != CATCHER_ID
+
+        np.add.at(self.balls.bumps, ball[onBlock], 1)
+
+        ids, first = np.unique(block, return_index=True)
+        packedBlocks = self.level.packedBlocks
+        touched = []  # Contacts touching a block, in order
+        for k in np.sort(first[ids != CATCHER_ID]).tolist():
+            b = packedBlocks[block[k]]
+            if not b.touched:
+                b.touch()
+                self.touchedBlocks.add(b)
+                self.compositor.invalidate(b.rect)
+                touched.append(k)
+        if touched:
+            multiplier = self.multiplier
+            self.addScore(len(touched))
+            for j, k in enumerate(touched):
+                self.particleSystem.text(
+                    x[k].item(), y[k].item(), "x%i", int(multiplier + 0.5 * (j + 1))
+                )
+
+        self.particleSystem.explode_many(x, y, np.where(onBlock, 30, 7))
 
     def update(self):
-        self.updateDynamics()
+        with profiler.phase("dynamics"):
+            self.updateDynamics()
+        with profiler.phase("contacts"):
+            self.processContacts()
 
         # Update game logic
         self.catcher.update()
-        self.particleSystem.update()
-
-        deadBalls = set()
-        for ball in self.balls:
-            if ball.geom.y > self.level.h + ball.geom.r:
-                deadBalls.add(ball)
-            elif ball.bumps > MAX_BALL_BUMPS:
-                deadBalls.add(ball)
-        for ball in deadBalls:
-            self.particleSystem.add(Explosion(ball.geom.x, ball.geom.y, 18))
-        self.balls -= deadBalls
-        if deadBalls and len(self.balls) == 0:
+        with profiler.phase("particles"):
+            self.particleSystem.update()
+
+        deadX, deadY = self.balls.cull(self.level.h, MAX_BALL_BUMPS)
+        for x, y in zip(deadX.tolist(), deadY.tolist()):
+            self.particleSystem.explode(x, y, 18)
+        if len(deadX) and len(self.balls) == 0:
             self.newTurn()
 
     def draw(self, display):
-        display.fill(COLOR0)
+        """Draws the frame, returns the rects to present.
+
+        Returns None when the whole display must be presented.
+        """
+        compositor = self.compositor
+        compositor.begin(display, self.level)
 
-        render_level(display, self.level)
+        rects = self.emitter.draw(display)
+        rects += self.catcher.draw(display)
 
-        self.emitter.draw(display)
-        self.catcher.draw(display)
+        rects += self.balls.draw(display)
 
-        for ball in self.balls:
-            display.blit(ball.image, ball.rect)
+        rects += self.particleSystem.draw(display)
 
-        self.particleSystem.draw(display)
+        rects += self.GUI.draw(display)
 
-        self.GUI.draw(display)
+        return compositor.end(display, rects)
@@ -0,0 +1,127 @@
+"""Plays levels without a window, as fast as the CPU allows.
+
+Usage: python -m src.headless [--games N] [--processes N] [--seed N]
+                              [--profile FILE]
+
+Every game launches its balls at scripted angles and steps the physics
+until the level is won or lost. The pool mode spreads games over all cores.
+"""
+import argparse
+import random
+from math import pi
+from multiprocessing import Pool
+from timeit import default_timer
+
+from .game import Game
+from .profiler import profiler
+from .profilerview import export
+
+MAX_TICKS_PER_SHOT = 60 * 60  # A minute of game time
+
+
+def play(angles):
+    """Plays a game, launching a ball at each of angles in turn.
+
+    Returns a dictionary with the score, blocks cleared, shots taken, physics
+    ticks simulated and seconds spent.
+    """
+    start = default_timer()
+    game = Game()
+    game.start()
+    blocks = len(game.level.blocks)
+
+    over = []
+    game.win = lambda: over.append("win")
+    game.lose = lambda: over.append("lose")
+
+    shots = ticks = 0
+    for angle in angles:
+        if over or game.avaibleBalls == 0:
+            break
+        game.launchBall(angle)
+        shots += 1
+        shotTicks = 0
+        while len(game.balls) and shotTicks < MAX_TICKS_PER_SHOT:
+            profiler.frame()
+            game.update()
+            shotTicks += 1
+        ticks += shotTicks
+        if len(game.balls):  # Stuck balls end the turn
+            game.balls.clear()
+            game.newTurn()
+
+    return {
+        "score": int(game.score),
+        "blocksCleared": blocks - len(game.level.blocks),
+        "shots": shots,
+        "ticks": ticks,
+        "seconds": default_timer() - start,
+        "result": over[0] if over else None,
+    }
+
+
+def random_angles(rng, count):
+    # Downwards, away from the ceiling
+    return [rng.uniform(pi * 0.1, pi * 0.9) for _ in range(count)]
+
+
+def play_many(scripts, processes=None):
+    """Plays a game per angle script, over processes worker processes.
+
+    processes=None uses every core, processes=1 plays in this process.
+    """
+    if processes == 1:
+        return [play(angles) for angles in scripts]
+    with Pool(processes) as pool:
+        return pool.map(play, scripts, chunksize=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plays levels headless.")
+    parser.add_argument("--games", type=int, default=8)
+    parser.add_argument("--shots", type=int, default=12, help="per game")
+    parser.add_argument(
+        "--processes", type=int, default=None, help="defaults to every core"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="plays in this process and writes a Chrome trace of the last "
+        "ticks to FILE",
+    )
+    args = parser.parse_args(argv)
+    if args.profile:
+        args.processes = 1
+        profiler.enabled = True
+
+    rng = random.Random(args.seed)
+    scripts = [random_angles(rng, args.shots) for _ in range(args.games)]
+
+    start = default_timer()
+    results = play_many(scripts, args.processes)
+    elapsed = default_timer() - start
+    if args.profile:
+        export(profiler, args.profile, chrome=True)
+
+    ticks = sum(r["ticks"] for r in results)
+    for i, r in enumerate(results):
+        print(
+            "game %3i  score %7i  blocks cleared %3i  shots %2i  %s"
+            % (i, r["score"], r["blocksCleared"], r["shots"], r["result"])
+        )
+    print(
+        "%i games, %i shots, %i ticks in %.2f s: %.0f ticks/s, mean score %.0f"
+        % (
+            len(results),
+            sum(r["shots"] for r in results),
+            ticks,
+            elapsed,
+            ticks / elapsed,
+            sum(r["score"] for r in results) / float(len(results)),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import pygame
+
+
+class InputStage:
+    """Turns a frame's worth of pygame events into event records.
+
+    The pygame queue is drained once per frame. Records are (event, args)
+    tuples, with the events and arguments EventHandler emits. Key and
+    button records keep their order. However many motion events came in,
+    the frame gets a single mouseMotion record at the place of the last
+    one, with the latest position and buttons and the summed motion.
+    """
+
+    def __init__(self):
+        self.events = 0  # pygame events drained by the last poll
+
+    def poll(self, events=None):
+        """Returns the records of events, pygame's queue by default."""
+        if events is None:
+            events = pygame.event.get()
+        self.events = len(events)
+
+        records = []
+        last = None  # The last motion event
+        dx = dy = 0
+        for e in events:
+            t = e.type
+            if t == pygame.MOUSEMOTION:
+                rel = e.rel
+                dx += rel[0]
+                dy += rel[1]
+                last = e
+                at = len(records)  # Where the motion record goes
+            elif t == pygame.KEYDOWN:
+                records.append(("keyDown", (e.key, e.mod)))
+            elif t == pygame.KEYUP:
+                records.append(("keyUp", (e.key, e.mod)))
+            elif t == pygame.MOUSEBUTTONDOWN:
+                records.append(("mouseButtonDown", (e.pos, e.button)))
+            elif t == pygame.MOUSEBUTTONUP:
+                records.append(("mouseButtonUp", (e.pos, e.button)))
+            elif t == pygame.QUIT:
+                records.append(("quit", ()))
+        if last is not None:
+            records.insert(at, ("mouseMotion", (last.pos, (dx, dy), last.buttons)))
+        return records
@@ -0,0 +1,189 @@
+"""Binary level files.
+
+A level file is a header, a table of sections and the sections' data:
+
+    header      magic "MQLV", format version, flags, level x, y, w and h,
+                starting balls, number of sections, spatial index name
+    table       per section: name, NumPy dtype, rows, columns, byte offset
+    data        each section a C ordered little-endian array, 16 byte
+                aligned
+
+Block shapes are stored in one float64 section per primitive type, named
+"shape.<type>", with a row of constructor arguments per block. Polygon rows
+start with the vertex count, then the vertices, padded with NaN.
+
+The spatial index can be embedded too, when it can be stored as arrays:
+"index.items" gives the blocks it refers to, numbered in section order,
+the other "index.<name>" sections are its arrays. It is only restored into
+a level using the same kind of index.
+
+Loading maps the file and views the sections in place, nothing is parsed
+field by field. A block is still made per row, so a file without its index
+loads in about the time making the same blocks from Python objects takes.
+The embedded index is what spares work.
+"""
+import struct
+
+import numpy as np
+
+from .physics.primitives import Arc, Capsule, Circle, Polygon, Rectangle
+
+MAGIC = b"MQLV"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHH4iiI16s")
+SECTION = struct.Struct("<24s8sQQQ")
+ALIGNMENT = 16
+
+SHAPES = {kind.__name__: kind for kind in (Arc, Capsule, Circle, Polygon, Rectangle)}
+
+
+def _shape_rows(kind, shapes):
+    if kind is Polygon:
+        points = [shape.params() for shape in shapes]
+        n = max(len(p) for p in points)
+        rows = np.full((len(shapes), 1 + 2 * n), np.nan)
+        for i, p in enumerate(points):
+            rows[i, 0] = len(p)
+            rows[i, 1 : 1 + 2 * len(p)] = np.ravel(p)
+        return rows
+    return np.array([shape.params() for shape in shapes], dtype="<f8")
+
+
+def _shapes(kind, rows):
+    if kind is Polygon:
+        shapes = []
+        for row in rows.tolist():
+            n = int(row[0])
+            xs = row[1 : 1 + 2 * n : 2]
+            ys = row[2 : 2 + 2 * n : 2]
+            shapes.append(Polygon(*zip(xs, ys)))
+        return shapes
+    return [kind(*row) for row in rows.tolist()]
+
+
+def save_level(level, path, index=False):
+    """Writes level to path. With index, embeds its block index if it can be."""
+    groups = {}
+    for block in sorted(level.blocks, key=lambda block: block.serial):
+        groups.setdefault(type(block.geom).__name__, []).append(block)
+
+    sections = []
+    numbers = {}  # block: number in section order
+    for name in sorted(groups):
+        blocks = groups[name]
+        for block in blocks:
+            numbers[block] = len(numbers)
+        rows = _shape_rows(SHAPES[name], [block.geom for block in blocks])
+        sections.append(("shape." + name, rows))
+
+    indexName = ""
+    dump = level.blockIndex.dump() if index else None
+    if dump is not None:
+        items, arrays = dump
+        indexName = level.spatialIndex
+        sections.append(
+            ("index.items", np.array([numbers[item] for item in items], dtype="<i8"))
+        )
+        for name in sorted(arrays):
+            sections.append(("index." + name, np.asarray(arrays[name])))
+
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    for name, array in sections:
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        offset += -offset % ALIGNMENT
+        rows = array.shape[0]
+        cols = array.shape[1] if array.ndim == 2 else 0
+        table.append((name, array, rows, cols, offset))
+        offset += array.nbytes
+
+    with open(path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                0,
+                level.x,
+                level.y,
+                level.w,
+                level.h,
+                level.startingBalls,
+                len(table),
+                indexName.encode(),
+            )
+        )
+        for name, array, rows, cols, offset in table:
+            f.write(
+                SECTION.pack(
+                    name.encode(), array.dtype.str.encode(), rows, cols, offset
+                )
+            )
+        for name, array, rows, cols, offset in table:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(array.tobytes())
+
+
+def read_level(source):
+    """Returns the header fields and the sections of a level file.
+
+    source is a path, which is memory mapped, or a bytes-like object.
+    Sections are arrays viewing the file, keyed by name.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = np.frombuffer(source, dtype=np.uint8)
+    else:
+        data = np.memmap(source, dtype=np.uint8, mode="r")
+
+    magic, version, flags, x, y, w, h, balls, count, indexName = HEADER.unpack_from(
+        data
+    )
+    if magic != MAGIC:
+        raise ValueError("Not a level file")
+    if version > VERSION:
+        raise ValueError("Level file version %i is too recent" % version)
+
+    sections = {}
+    for i in range(count):
+        name, dtype, rows, cols, offset = SECTION.unpack_from(
+            data, HEADER.size + SECTION.size * i
+        )
+        dtype = np.dtype(dtype.rstrip(b"\0").decode())
+        shape = (rows, cols) if cols else (rows,)
+        nbytes = dtype.itemsize * rows * max(cols, 1)
+        sections[name.rstrip(b"\0").decode()] = (
+            data[offset : offset + nbytes].view(dtype).reshape(shape)
+        )
+    header = {
+        "x": x,
+        "y": y,
+        "w": w,
+        "h": h,
+        "startingBalls": balls,
+        "index": indexName.rstrip(b"\0").decode(),
+    }
+    return header, sections
+
+
+def read_shapes(sections):
+    """Returns the shapes of the sections of read_level, in section order."""
+    shapes = []
+    for name, rows in sections.items():
+        if name.startswith("shape."):
+            kind = SHAPES.get(name[len("shape.") :])
+            if kind is None:
+                raise ValueError("Unknown shape type in level file: %s" % name)
+            shapes += _shapes(kind, rows)
+    return shapes
+
+
+def read_index(sections):
+    """Returns the block numbers and arrays of the embedded index, or None."""
+    if "index.items" not in sections:
+        return None
+    arrays = {
+        name[len("index.") :]: rows
+        for name, rows in sections.items()
+        if name.startswith("index.") and name != "index.items"
+    }
+    return sections["index.items"].tolist(), arrays
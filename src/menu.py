@@ -3,13 +3,9 @@ from math import sin, cos, pi
 
 import pygame
 
+from .fonts import render_text
 from .settings import COLOR0, COLOR1, COLOR2, COLOR3
-
-
-def sinInterpolation(start, end, steps=30):
-    d = end - start
-    for i in range(steps):
-        yield start + d * sin((float(i) / float(steps - 1)) * pi * 0.5)
+from .startup import startup
 
 
 class Header(object):
@@ -18,7 +14,7 @@ class Header(object):
         self.y = y
         self._text = text
         self._color = color
-        self.font = pygame.font.Font(None, 54)
+        self.size = 54
         self.render()
 
     @property
@@ -40,7 +36,7 @@ class Header(object):
         self.render()
 
     def render(self):
-        self.image = self.font.render(self._text, True, self._color)
+        self.image = render_text(self._text, self.size, self._color)
         self.rect = self.image.get_rect()
         self.rect.centerx = self.x
         self.rect.centery = self.y
@@ -92,7 +88,8 @@ class RotatingMenu(object):
 
         self.rotation = 0
         self.rotationTarget = 0
-        self.rotationSteps = []  # Used for interpolation
+        self.tweens = main.tweens
+        self.rotationTween = None  # Handle of the running rotation
 
         self.header = Header(x, y - w / 4.0, headerText)
 
@@ -100,31 +97,50 @@ class RotatingMenu(object):
         self.selectedItem = None
         self.selectedItemNumber = 0
 
+        # Submenus are made on their first visit, see submenu
+        self.main = main
+        self.backText = backText
+        self.on_selection = on_selection
+        self.subItems = {}  # Name: items of a submenu not visited yet
+        self.submenus = {}  # Name: submenu
+
         for k, v in items.items():
             if type(v) == dict:
-                # We make a sub-menu, a way to come back and a way to reach it
-                sub = RotatingMenu(
-                    main,
-                    x,
-                    y,
-                    w,
-                    h,
-                    arc,
-                    defaultAngle,
-                    wrap=wrap,
-                    headerText=k,
-                    backText=backText,
-                    items=v,
-                    on_selection=on_selection,
-                )
-                sub.add_item(MenuItem(backText, lambda: on_selection(self)))
-                self.add_item(MenuItem(k, lambda: on_selection(sub)))
+                self.subItems[k] = v
+                self.add_item(MenuItem(k, self.selectSubmenu, [k]))
             else:
                 self.add_item(MenuItem(k, v))
 
         # Respond to events
         main.bind("quit", sys.exit)
-        main.bind("keyDown", self.onKeyPress)
+        main.bind("keyDown", self.onKeyPress, self)
+
+    def submenu(self, name):
+        """Returns the submenu name, making it if it wasn't yet."""
+        sub = self.submenus.get(name)
+        if sub is None:
+            with startup.stage("menu " + name):
+                # A way to reach it from here and a way to come back
+                sub = RotatingMenu(
+                    self.main,
+                    self.x,
+                    self.y,
+                    self.w,
+                    self.h,
+                    self.arc,
+                    self.defaultAngle,
+                    wrap=self.wrap,
+                    headerText=name,
+                    backText=self.backText,
+                    items=self.subItems.pop(name),
+                    on_selection=self.on_selection,
+                )
+                sub.add_item(MenuItem(self.backText, self.on_selection, [self]))
+            self.submenus[name] = sub
+        return sub
+
+    def selectSubmenu(self, name):
+        self.on_selection(self.submenu(name))
 
     def onKeyPress(self, key, mod):
         if key == pygame.K_UP or key == pygame.K_RETURN:
@@ -162,7 +178,16 @@ class RotatingMenu(object):
 
         self.rotationTarget = -self.arc * (itemNumber / float(len(self.items)))
 
-        self.rotationSteps = sinInterpolation(self.rotation, self.rotationTarget, 60)
+        if self.rotationTween is not None:
+            self.tweens.cancel(self.rotationTween)
+        self.rotationTween = self.tweens.add(
+            self.rotation, self.rotationTarget, 60, on_done=self.onRotationDone
+        )
+
+    def onRotationDone(self):
+        self.rotationTween = None
+        self.rotation = self.rotationTarget
+        self.rotate(self.rotation)
 
     def selectItemImmediately(self, itemNumber):
         self.selectedItem.deselect()
@@ -185,12 +210,9 @@ class RotatingMenu(object):
             item.y = self.y + sin(rot) * self.h / 2.0
 
     def update(self):
-        if self.rotationSteps:
-            try:
-                self.rotation = self.rotationSteps.__next__()
-                self.rotate(self.rotation)
-            except StopIteration:
-                pass
+        if self.rotationTween is not None:
+            self.rotation = self.tweens.value(self.rotationTween)
+            self.rotate(self.rotation)
 
     def draw(self, display):
         display.fill((255, 255, 255))
@@ -214,7 +236,7 @@ class MenuItem(object):
         self.x = 0.0  # RotatingMenu instances will edit these
         self.y = 0.0
 
-        self.font = pygame.font.Font(None, 28)
+        self.size = 28
 
         self.render()
 
@@ -243,5 +265,28 @@ class MenuItem(object):
         self.render()
 
     def render(self):
-        self.image = self.font.render(self._text, True, self._color)
+        self.image = render_text(self._text, self.size, self._color)
         self.rect = self.image.get_rect()
+
+
+class LoadingScreen(object):
+    """Shows the progress of assets until they are done, then calls on_done."""
+
+    def __init__(self, assets, on_done, x, y, w=300, h=8, text="Loading"):
+        self.assets = assets
+        self.on_done = on_done
+        self.header = Header(x, y - 40, text)
+        self.rect = pygame.Rect(0, 0, w, h)
+        self.rect.center = x, y
+
+    def update(self):
+        if self.assets.done():
+            self.on_done()
+
+    def draw(self, display):
+        display.fill((255, 255, 255))
+        self.header.draw(display)
+        bar = self.rect.copy()
+        bar.w = int(bar.w * self.assets.progress)
+        display.fill(COLOR1, bar)
+        pygame.draw.rect(display, COLOR3, self.rect, 1)
@@ -1,76 +1,172 @@
+import numpy as np
 import pygame
 
-from .menu import sinInterpolation
-from .settings import COLOR0, COLOR1, COLOR2, COLOR3
+from .fonts import get_label, render_text
+from .settings import COLOR0, COLOR2, COLOR3
+from .settings import MAX_PARTICLES, PARTICLE_OVERFLOW
+from .tween import EASINGS, ease
 
+EXPLOSION = 0
+TEXT = 1
 
-class ParticleSystem:
-    def __init__(self):
-        self.particles = set()
-
-    def add(self, particle):
-        self.particles.add(particle)
-
-    def clear(self):
-        self.particles = set()
-
-    def update(self):
-        deadParticles = set()
-        for particle in self.particles:
-            if particle.life > 0:
-                particle.update()
-                particle.life -= 1
-            else:
-                deadParticles.add(particle)
-        self.particles -= deadParticles
-
-    def draw(self, display):
-        for particle in self.particles:
-            particle.draw(display)
 
-
-class Explosion:
-    def __init__(
+class ParticleSystem:
+    """A fixed capacity pool of particles, stored as parallel arrays.
+
+    Slot i holds a particle while alive[i] is set. Freed slots go on a free
+    list and are handed out again by the next spawn, so the arrays never
+    grow. When every slot is taken the overflow policy decides: "recycle"
+    gives the slot of the particle closest to its end to the new one, "drop"
+    discards the new one.
+
+    Particles live for life updates. Explosions grow from startRadius to
+    twice that while fading from startColor to endColor, along the shared
+    sin easing curve. Texts drift upwards.
+    """
+
+    def __init__(self, capacity=MAX_PARTICLES, overflow=PARTICLE_OVERFLOW):
+        if overflow not in ("recycle", "drop"):
+            raise ValueError("Unknown overflow policy %r" % overflow)
+        self.capacity = capacity
+        self.overflow = overflow
+
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.age = np.zeros(capacity, dtype=int)  # Updates so far
+        self.life = np.zeros(capacity, dtype=int)  # Updates in total
+        self.radius = np.zeros(capacity)
+        self.startRadius = np.zeros(capacity)
+        self.color = np.zeros((capacity, 3))
+        self.startColor = np.zeros((capacity, 3))
+        self.endColor = np.zeros((capacity, 3))
+        self.texts = [None] * capacity  # (text, value, color) of texts
+
+        self.free = list(range(capacity - 1, -1, -1))
+        self.dropped = 0  # Particles lost to overflow
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def _spawn(self, kind, x, y, life):
+        # Returns a slot for a new particle, or None when it is dropped.
+        if self.free:
+            i = self.free.pop()
+        elif self.overflow == "recycle":
+            i = int(np.argmax(self.age - self.life))
+            self.dropped += 1
+        else:
+            self.dropped += 1
+            return None
+        self.alive[i] = True
+        self.kind[i] = kind
+        self.x[i] = x
+        self.y[i] = y
+        self.age[i] = 0
+        self.life[i] = life
+        return i
+
+    def _spawn_many(self, kind, x, y, life):
+        # Returns the slots of new particles at x and y, as _spawn would one
+        # by one, fewer of them when some are dropped.
+        n = len(x)
+        free = self.free
+        taken = min(n, len(free))
+        slots = free[len(free) - taken :][::-1]
+        del free[len(free) - taken :]
+        if taken < n:
+            self.dropped += n - taken
+            if self.overflow == "recycle":
+                # Nothing else is free, give the rest the slots of the
+                # particles closest to their end
+                ending = np.argsort(self.life - self.age, kind="stable")
+                ending = ending[~np.isin(ending, slots)]
+                slots += ending[: n - taken].tolist()
+        slots = np.array(slots, dtype=int)
+        n = len(slots)
+        self.alive[slots] = True
+        self.kind[slots] = kind
+        self.x[slots] = x[:n]
+        self.y[slots] = y[:n]
+        self.age[slots] = 0
+        self.life[slots] = np.broadcast_to(life, len(x))[:n]
+        return slots
+
+    def explode(
         self, x, y, life=30, startRadius=16, startColor=COLOR2, endColor=COLOR0
     ):
-        self.x = x
-        self.y = y
-        self.radius = startRadius
-        self.color = list(startColor)
-
-        self.startRadius = startRadius
-        self.startColor = startColor
-        self.endColor = endColor
-
-        self.life = life
-        self.alphaSteps = sinInterpolation(0, 1, life)
-
-    def update(self):
-        try:
-            a = self.alphaSteps.__next__()
-            self.radius = self.startRadius + self.startRadius * a
-            for i in 0, 1, 2:
-                self.color[i] = self.startColor[i] * (1 - a) + self.endColor[i] * a
-        except StopIteration:
-            pass
-
-    def draw(self, display):
-        pygame.draw.circle(
-            display, self.color, (int(self.x), int(self.y)), int(self.radius), 1
-        )
-
-
-class Text:
-    def __init__(self, x, y, text, life=30, color=COLOR3):
-        self.x = x
-        self.y = y
-
-        self.life = life
+        i = self._spawn(EXPLOSION, x, y, life)
+        if i is not None:
+            self.radius[i] = self.startRadius[i] = startRadius
+            self.color[i] = self.startColor[i] = startColor
+            self.endColor[i] = endColor
+            self.texts[i] = None
+
+    def explode_many(
+        self, x, y, life=30, startRadius=16, startColor=COLOR2, endColor=COLOR0
+    ):
+        """Spawns an explosion at each x and y, life may be an array too."""
+        slots = self._spawn_many(EXPLOSION, x, y, life)
+        self.radius[slots] = self.startRadius[slots] = startRadius
+        self.color[slots] = self.startColor[slots] = startColor
+        self.endColor[slots] = endColor
+        for i in slots.tolist():
+            self.texts[i] = None
+
+    def text(self, x, y, text, value=None, life=30, color=COLOR3):
+        """Spawns a text. With a value, text is a template like "x%i"."""
+        i = self._spawn(TEXT, x, y, life)
+        if i is not None:
+            self.texts[i] = (text, value, color)
 
-        self.image = pygame.font.Font(None, 12).render(text, True, color)
+    def clear(self):
+        self.alive[:] = False
+        self.texts = [None] * self.capacity
+        self.free = list(range(self.capacity - 1, -1, -1))
 
     def update(self):
-        self.y -= 0.5
+        alive = self.alive
+        done = alive & (self.age >= self.life)
+        if done.any():
+            alive &= ~done
+            for i in np.flatnonzero(done).tolist():
+                self.texts[i] = None
+                self.free.append(i)
+
+        explosions = np.flatnonzero(alive & (self.kind == EXPLOSION))
+        if len(explosions):
+            age = self.age[explosions]
+            progress = age / np.maximum(self.life[explosions] - 1, 1)
+            a = ease(EASINGS["sin"], progress)
+            self.radius[explosions] = self.startRadius[explosions] * (1.0 + a)
+            a = a[:, None]
+            self.color[explosions] = (
+                self.startColor[explosions] * (1.0 - a) + self.endColor[explosions] * a
+            )
+
+        self.y[alive & (self.kind == TEXT)] -= 0.5
+        self.age[alive] += 1
 
     def draw(self, display):
-        display.blit(self.image, (self.x, self.y))
+        rects = []
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return rects
+        kinds = self.kind[live].tolist()
+        xs = self.x[live].astype(int).tolist()
+        ys = self.y[live].astype(int).tolist()
+        radii = self.radius[live].astype(int).tolist()
+        colors = self.color[live].astype(int).tolist()
+        texts = self.texts
+        for i, kind, x, y, r, color in zip(live.tolist(), kinds, xs, ys, radii, colors):
+            if kind == EXPLOSION:
+                rects.append(pygame.draw.circle(display, color, (x, y), r, 1))
+            else:
+                text, value, textColor = texts[i]
+                if value is None:
+                    rects.append(display.blit(render_text(text, 12, textColor), (x, y)))
+                else:
+                    label = get_label(text, 12, textColor)
+                    rects.append(label.draw(display, value, (x, y)))
+        return rects
@@ -0,0 +1,201 @@
+import numpy as np
+
+from ..profiler import profiler
+from .spatialindex import SpatialIndex
+
+
+class BVH(SpatialIndex):
+    """A static bounding volume hierarchy packed into flat arrays.
+
+    The tree is built top-down with NumPy, splitting items at the median of
+    the longest axis of their centres. Node i covers nodeBounds[i]; internal
+    nodes point to their two children through nodeLeft and nodeRight, leaves
+    own the range nodeStart[i]:nodeStart[i] + nodeCount[i] of itemOrder.
+    Nodes are laid out depth first, so the left child of node i is i + 1.
+
+    Insertions trigger a rebuild on the next query, removals only clear the
+    item's alive flag.
+    """
+
+    def __init__(self, items=[], boundingRect=None, leafSize=4):
+        """Creates a bounding volume hierarchy.
+
+        @param items:
+            A sequence of items to store in the hierarchy.
+
+        @param boundingRect:
+            Unused, the hierarchy fits its items. Accepted for compatibility
+            with the other spatial indexes.
+
+        @param leafSize:
+            The maximum number of items per leaf.
+        """
+        self.leafSize = leafSize
+
+        self.items = []
+        self.indices = {}  # item: index in items
+        self.alive = []
+
+        self._pending = []
+        self._dirty = True
+        self.insert_many(items)
+
+    def insert(self, item):
+        self._pending.append(item)
+        self._dirty = True
+
+    def insert_many(self, items):
+        self._pending.extend(items)
+        self._dirty = True
+
+    def remove(self, item):
+        if item in self.indices:
+            self.alive[self.indices.pop(item)] = False
+        else:
+            self._pending.remove(item)
+
+    def _build(self):
+        # Compact the live items, then build the tree over them.
+        items = [item for item, alive in zip(self.items, self.alive) if alive]
+        items += self._pending
+        self._pending = []
+        self.items = items
+        self.indices = {item: i for i, item in enumerate(items)}
+        self.alive = [True] * len(items)
+        bounds = np.array(
+            [
+                (item.rect.left, item.rect.top, item.rect.right, item.rect.bottom)
+                for item in items
+            ],
+            dtype=float,
+        ).reshape(-1, 4)
+        centres = (bounds[:, :2] + bounds[:, 2:]) * 0.5
+
+        order = np.arange(len(items))
+        nodeBounds = []
+        nodeRight = []
+        nodeStart = []
+        nodeCount = []
+
+        # Depth first, so every left child directly follows its parent.
+        stack = [(0, len(items), None)]
+        while stack:
+            start, end, parent = stack.pop()
+            node = len(nodeBounds)
+            if parent is not None:
+                nodeRight[parent] = node
+            ids = order[start:end]
+            b = bounds[ids]
+            if len(ids):
+                nodeBounds.append(
+                    b[:, :2].min(axis=0).tolist() + b[:, 2:].max(axis=0).tolist()
+                )
+            else:
+                nodeBounds.append([0.0, 0.0, 0.0, 0.0])
+            nodeRight.append(-1)
+            if end - start <= self.leafSize:
+                nodeStart.append(start)
+                nodeCount.append(end - start)
+                continue
+
+            nodeStart.append(start)
+            nodeCount.append(0)
+            c = centres[ids]
+            axis = int(np.argmax(c.max(axis=0) - c.min(axis=0)))
+            half = (end - start) // 2
+            order[start:end] = ids[np.argpartition(c[:, axis], half)]
+            # The right child is pushed first and filled in by its parent.
+            stack.append((start + half, end, node))
+            stack.append((start, start + half, None))
+
+        self.itemOrder = order
+        self.itemBounds = bounds
+        self.nodeBounds = np.array(nodeBounds, dtype=float).reshape(-1, 4)
+        self.nodeRight = np.array(nodeRight, dtype=int)
+        self.nodeStart = np.array(nodeStart, dtype=int)
+        self.nodeCount = np.array(nodeCount, dtype=int)
+        self._mirror()
+
+    def _mirror(self):
+        # Traversal walks plain lists mirroring the packed arrays, which
+        # is much cheaper than indexing NumPy scalars one node at a time.
+        self._nodes = list(
+            zip(
+                self.nodeBounds.tolist(),
+                self.nodeRight.tolist(),
+                self.nodeStart.tolist(),
+                self.nodeCount.tolist(),
+            )
+        )
+        self._order = self.itemOrder.tolist()
+        self._itemBounds = self.itemBounds.tolist()
+        self._dirty = False
+
+    def dump(self):
+        if self._dirty or not all(self.alive):
+            self._build()
+        return (
+            self.items,
+            {
+                "itemOrder": self.itemOrder,
+                "itemBounds": self.itemBounds,
+                "nodeBounds": self.nodeBounds,
+                "nodeRight": self.nodeRight,
+                "nodeStart": self.nodeStart,
+                "nodeCount": self.nodeCount,
+            },
+        )
+
+    def restore(self, items, arrays):
+        self.items = list(items)
+        self.indices = {item: i for i, item in enumerate(self.items)}
+        self.alive = [True] * len(self.items)
+        self._pending = []
+        self.itemOrder = np.array(arrays["itemOrder"], dtype=int)
+        self.itemBounds = np.array(arrays["itemBounds"], dtype=float).reshape(-1, 4)
+        self.nodeBounds = np.array(arrays["nodeBounds"], dtype=float).reshape(-1, 4)
+        self.nodeRight = np.array(arrays["nodeRight"], dtype=int)
+        self.nodeStart = np.array(arrays["nodeStart"], dtype=int)
+        self.nodeCount = np.array(arrays["nodeCount"], dtype=int)
+        self._mirror()
+
+    def _query(self, left, top, right, bottom, inclusive):
+        # Collects the live items overlapping the area. Leaf items are tested
+        # with the same rules as pygame's colliderect or collidepoint.
+        if self._dirty:
+            self._build()
+        nodes = self._nodes
+        order = self._order
+        itemBounds = self._itemBounds
+        items = self.items
+        alive = self.alive
+        hits = set()
+        stack = [0] if nodes else []
+        visited = 0
+        while stack:
+            node = stack.pop()
+            visited += 1
+            (l, t, r, b), right_child, start, count = nodes[node]
+            if l > right or r < left or t > bottom or b < top:
+                continue
+            if right_child < 0:
+                for i in order[start : start + count]:
+                    l, t, r, b = itemBounds[i]
+                    if inclusive:
+                        inside = l <= left < r and t <= top < b
+                    else:
+                        inside = l < right and left < r and t < bottom and top < b
+                    if inside and alive[i]:
+                        hits.add(items[i])
+            else:
+                stack.append(right_child)
+                stack.append(node + 1)
+        if profiler.enabled:
+            profiler.count("nodes", visited)
+        return hits
+
+    def hitPoint(self, x, y):
+        return self._query(x, y, x, y, True)
+
+    def hit(self, rect):
+        return self._query(rect.left, rect.top, rect.right, rect.bottom, False)
@@ -0,0 +1,103 @@
+from math import ceil
+
+import pygame
+
+from ..profiler import profiler
+
+
+class CandidateCache:
+    """Keeps the broad phase candidates of each ball across steps.
+
+    A ball queries the index over its rect grown by a region: margin pixels
+    all around, plus lookahead steps of its motion ahead of it. Every block
+    overlapping a rect inside that region overlaps the region, so until the
+    ball leaves it the cached blocks are a superset of its candidates, and
+    the narrow phase sorts them out. Changing the blocks of the index makes
+    every entry stale, see version.
+
+    Entries are kept per ball index, the owner tells the cache when balls
+    are added and when they are compacted.
+    """
+
+    def __init__(self, margin=4, lookahead=4):
+        self.margin = margin
+        self.lookahead = lookahead
+        self.entries = []  # (left, top, right, bottom, blocks, nodes) or None
+        self.version = None  # Of the blocks the entries were queried from
+
+        self.hits = 0
+        self.misses = 0
+        self.nodesSaved = 0  # Index nodes hits didn't visit, while profiling
+
+    def add(self, i):
+        """Makes room for ball i, with no entry yet."""
+        entries = self.entries
+        if i < len(entries):
+            entries[i] = None
+        else:
+            entries.extend([None] * (i + 1 - len(entries)))
+
+    def compact(self, alive):
+        """Drops the entries of removed balls, alive is a sequence of flags."""
+        entries = self.entries
+        self.entries = [entry for entry, keep in zip(entries, alive) if keep]
+
+    def clear(self):
+        self.entries = []
+
+    def hit(self, index, version, i, rect, vx, vy):
+        """Returns a superset of the blocks of index overlapping rect.
+
+        @param version:
+            Identifies the index and the blocks in it. Entries queried from
+            another version are stale.
+
+        @param rect:
+            The area ball i may collide in this step.
+
+        @param vx, vy:
+            The motion of ball i per step, to grow its region ahead of it.
+        """
+        if version != self.version:
+            self.version = version
+            self.entries = [None] * len(self.entries)
+
+        entry = self.entries[i]
+        if (
+            entry is not None
+            and entry[0] <= rect.left
+            and entry[1] <= rect.top
+            and rect.right <= entry[2]
+            and rect.bottom <= entry[3]
+        ):
+            self.hits += 1
+            self.nodesSaved += entry[5]
+            if profiler.enabled:
+                profiler.count("cache hits")
+                profiler.count("nodes saved", entry[5])
+            return entry[4]
+
+        self.misses += 1
+        margin = self.margin
+        ahead = self.lookahead
+        left = rect.left - margin - int(ceil(max(-vx, 0.0) * ahead))
+        top = rect.top - margin - int(ceil(max(-vy, 0.0) * ahead))
+        right = rect.right + margin + int(ceil(max(vx, 0.0) * ahead))
+        bottom = rect.bottom + margin + int(ceil(max(vy, 0.0) * ahead))
+        region = pygame.Rect(left, top, right - left, bottom - top)
+
+        if profiler.enabled:
+            profiler.count("cache misses")
+            nodes = profiler.counters.get("nodes", 0)
+            blocks = index.hit(region)
+            nodes = profiler.counters.get("nodes", 0) - nodes
+        else:
+            blocks = index.hit(region)
+            nodes = 0
+        self.entries[i] = left, top, right, bottom, blocks, nodes
+        return blocks
+
+    @property
+    def hitRate(self):
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups else 0.0
@@ -0,0 +1,284 @@
+"""Primitives compiled for the scalar narrow phase.
+
+A compiled shape answers hit and hit_circle like the primitive it was
+compiled from, with everything that only depends on the shape worked out
+once: squared radii, edge vectors and their inverse squared lengths, edge
+slopes, and for arcs the unit vectors bounding their sweep, which replace
+atan2 with two cross products. They have no __dict__, and must be compiled
+again if their primitive changes.
+
+compile_shape(shape) compiles any primitive. Arcs of a single narrow sweep,
+the usual ones, compile to a leaner CompiledNarrowArc.
+"""
+from math import cos, pi, sin, sqrt
+
+from .primitives import Arc, Capsule, Circle, Polygon
+
+
+class CompiledCircle:
+    __slots__ = "shape", "x", "y", "r", "r2"
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.x = shape.x
+        self.y = shape.y
+        self.r = shape.r
+        self.r2 = shape.r ** 2
+
+    def hit(self, x, y):
+        return (x - self.x) ** 2 + (y - self.y) ** 2 < self.r2
+
+    def hit_circle(self, x, y, r):
+        cx = self.x
+        cy = self.y
+        square_distance = (x - cx) ** 2 + (y - cy) ** 2
+        reach = self.r + r
+        if square_distance < reach * reach:
+            distance = sqrt(square_distance)
+            penetration = reach - distance
+            return (
+                (cx - x) / distance * penetration,
+                (cy - y) / distance * penetration,
+            )
+        return None, None
+
+
+class CompiledCapsule:
+    __slots__ = "shape", "x0", "y0", "dx", "dy", "inverse", "r", "r2"
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.x0 = shape.x0
+        self.y0 = shape.y0
+        self.dx = shape.x1 - shape.x0
+        self.dy = shape.y1 - shape.y0
+        square_length = self.dx ** 2 + self.dy ** 2
+        # A capsule of zero length is a circle around its first point
+        self.inverse = 1.0 / square_length if square_length else 0.0
+        self.r = shape.r
+        self.r2 = shape.r ** 2
+
+    def closest(self, x, y):
+        """The point of the segment closest to (x, y)."""
+        x0 = self.x0
+        y0 = self.y0
+        dx = self.dx
+        dy = self.dy
+        d = ((x - x0) * dx + (y - y0) * dy) * self.inverse
+        if d < 0.0:
+            d = 0.0
+        elif d > 1.0:
+            d = 1.0
+        return x0 + dx * d, y0 + dy * d
+
+    def hit(self, x, y):
+        Px, Py = self.closest(x, y)
+        return (x - Px) ** 2 + (y - Py) ** 2 < self.r2
+
+    def hit_circle(self, x, y, r):
+        Px, Py = self.closest(x, y)
+        square_distance = (x - Px) ** 2 + (y - Py) ** 2
+        reach = self.r + r
+        if square_distance < reach * reach:
+            distance = sqrt(square_distance)
+            penetration = reach - distance
+            return (
+                (Px - x) / distance * penetration,
+                (Py - y) / distance * penetration,
+            )
+        return None, None
+
+
+class CompiledPolygon:
+    """Edges are (Ax, Ay, dx, dy, inverse squared length), the crossings
+    tested by hit are (Ay, slope of x over y, Ax, low x, high x), skipping
+    horizontal edges."""
+
+    __slots__ = "shape", "edges", "crossings", "left", "top", "right", "bottom"
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.left, self.top, w, h = shape.aabb
+        self.right = self.left + w
+        self.bottom = self.top + h
+        self.edges = []
+        self.crossings = []
+        for Ax, Ay, Bx, By in shape.edges:
+            dx = Bx - Ax
+            dy = By - Ay
+            square_length = dx ** 2 + dy ** 2
+            inverse = 1.0 / square_length if square_length else 0.0
+            self.edges.append((Ax, Ay, dx, dy, inverse))
+            if Ay != By:
+                self.crossings.append((Ay, dx / dy, Ax, min(Ax, Bx), max(Ax, Bx)))
+
+    def hit(self, x, y):
+        """Ray casting, as Polygon.hit."""
+        collision = False
+        for Ay, slope, Ax, low, high in self.crossings:
+            Cx = (y - Ay) * slope + Ax
+            if Cx > x and low <= Cx <= high:
+                collision = not collision
+        return collision
+
+    def hit_circle(self, x, y, r):
+        # No edge comes closer than the bounding box
+        if self.left - r < x < self.right + r and self.top - r < y < self.bottom + r:
+            r2 = r * r
+            for Ax, Ay, dx, dy, inverse in self.edges:
+                ex = x - Ax
+                ey = y - Ay
+                d = (ex * dx + ey * dy) * inverse
+                if d < 0.0:
+                    d = 0.0
+                elif d > 1.0:
+                    d = 1.0
+                ex -= dx * d  # From the closest point of the edge
+                ey -= dy * d
+                square_distance = ex * ex + ey * ey
+                if square_distance < r2:
+                    distance = sqrt(square_distance)
+                    penetration = r - distance
+                    return (-ex / distance * penetration, -ey / distance * penetration)
+
+        if self.hit(x, y):
+            return x, y
+
+        return None, None
+
+
+class CompiledArc:
+    """The sweep is a union of angular intervals, each bounded by the unit
+    vectors of its ends. A direction lies within an interval narrower than
+    half a turn when it is counterclockwise of the low end and clockwise of
+    the high end, within a wider one when either holds."""
+
+    __slots__ = "shape", "x", "y", "r0", "r1", "r02", "r12", "middle", "intervals"
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.x = shape.x
+        self.y = shape.y
+        self.r0 = shape.r0
+        self.r1 = shape.r1
+        self.r02 = shape.r0 ** 2
+        self.r12 = shape.r1 ** 2
+        self.middle = (shape.r0 + shape.r1) / 2.0
+
+        # The angles angular_condition accepts, on atan2's [-pi, pi]
+        if shape._special:
+            intervals = [(-pi, shape.angle0), (shape.angle1, pi)]
+        else:
+            intervals = [(shape.angle0, shape.angle1)]
+        self.intervals = []
+        for low, high in intervals:
+            low = max(low, -pi)
+            high = min(high, pi)
+            if low < high:
+                self.intervals.append(
+                    (cos(low), sin(low), cos(high), sin(high), high - low > pi)
+                )
+
+    def angular_condition(self, x, y):
+        dx = x - self.x
+        dy = y - self.y
+        for lx, ly, hx, hy, wide in self.intervals:
+            ccw = lx * dy - ly * dx > 0.0
+            cw = hx * dy - hy * dx < 0.0
+            if (ccw or cw) if wide else (ccw and cw):
+                return True
+        return False
+
+    def hit(self, x, y):
+        square_distance = (x - self.x) ** 2 + (y - self.y) ** 2
+        if self.r02 < square_distance < self.r12:
+            return self.angular_condition(x, y)
+        return False
+
+    def hit_circle(self, x, y, r):
+        cx = self.x
+        cy = self.y
+        dx = x - cx
+        dy = y - cy
+        square_distance = dx * dx + dy * dy
+        r0 = self.r0
+        r1 = self.r1
+        # The radial test is cheaper, so it goes first
+        if not (r0 - r) ** 2 < square_distance < (r1 + r) ** 2:
+            return None, None
+
+        # angular_condition, inlined
+        for lx, ly, hx, hy, wide in self.intervals:
+            ccw = lx * dy - ly * dx > 0.0
+            cw = hx * dy - hy * dx < 0.0
+            if (ccw or cw) if wide else (ccw and cw):
+                distance = sqrt(square_distance)
+                if distance > self.middle:  # Outer border
+                    penetration = r1 + r - distance
+                else:  # Inner border
+                    penetration = r0 - r - distance
+                return (-dx / distance * penetration, -dy / distance * penetration)
+        return None, None
+
+
+class CompiledNarrowArc(CompiledArc):
+    """An arc sweeping a single interval narrower than half a turn, the
+    usual case. Its angular test comes first: it rejects most queries, and
+    takes two cross products with nothing to loop over."""
+
+    __slots__ = "lx", "ly", "hx", "hy"
+
+    def __init__(self, shape):
+        CompiledArc.__init__(self, shape)
+        ((self.lx, self.ly, self.hx, self.hy, wide),) = self.intervals
+
+    def angular_condition(self, x, y):
+        dx = x - self.x
+        dy = y - self.y
+        return self.lx * dy - self.ly * dx > 0.0 and self.hx * dy - self.hy * dx < 0.0
+
+    def hit(self, x, y):
+        dx = x - self.x
+        dy = y - self.y
+        if self.lx * dy - self.ly * dx > 0.0 and self.hx * dy - self.hy * dx < 0.0:
+            return self.r02 < dx * dx + dy * dy < self.r12
+        return False
+
+    def hit_circle(self, x, y, r):
+        dx = x - self.x
+        dy = y - self.y
+        if self.lx * dy - self.ly * dx > 0.0 and self.hx * dy - self.hy * dx < 0.0:
+            square_distance = dx * dx + dy * dy
+            r0 = self.r0
+            r1 = self.r1
+            if (r0 - r) ** 2 < square_distance < (r1 + r) ** 2:
+                distance = sqrt(square_distance)
+                if distance > self.middle:  # Outer border
+                    penetration = r1 + r - distance
+                else:  # Inner border
+                    penetration = r0 - r - distance
+                return (-dx / distance * penetration, -dy / distance * penetration)
+        return None, None
+
+
+def compile_arc(shape):
+    compiled = CompiledArc(shape)
+    if len(compiled.intervals) == 1 and not compiled.intervals[0][4]:
+        return CompiledNarrowArc(shape)
+    return compiled
+
+
+COMPILED = {
+    Arc: compile_arc,
+    Capsule: CompiledCapsule,
+    Circle: CompiledCircle,
+    Polygon: CompiledPolygon,
+}
+
+
+def compile_shape(shape):
+    """Returns the compiled version of a primitive."""
+    for kind in type(shape).__mro__:
+        if kind in COMPILED:
+            return COMPILED[kind](shape)
+    raise TypeError("No compiled version of %s" % type(shape).__name__)
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+class ContactBuffer:
+    """Contacts found by the physics, kept as parallel arrays.
+
+    Contact k is ball[k] touching body block[k] at (x[k], y[k]), its
+    velocity changed by an impulse of magnitude impulse[k]. Bodies are
+    numbered by whoever records the contacts, the game numbers blocks
+    from 0 and gives other bodies negative numbers. Contacts stay in the
+    order they were added. The arrays double when full.
+    """
+
+    def __init__(self, capacity=256):
+        self.count = 0
+
+        self.ball = np.zeros(capacity, dtype=int)
+        self.block = np.zeros(capacity, dtype=int)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.impulse = np.zeros(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        for name in "ball", "block", "x", "y", "impulse":
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2, dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def add(self, ball, block, x, y, impulse):
+        if self.count == len(self.ball):
+            self._grow()
+        k = self.count
+        self.count += 1
+
+        self.ball[k] = ball
+        self.block[k] = block
+        self.x[k] = x
+        self.y[k] = y
+        self.impulse[k] = impulse
+
+    def add_many(self, ball, block, x, y, impulse):
+        """Adds contacts from arrays, in their order."""
+        n = len(ball)
+        while self.count + n > len(self.ball):
+            self._grow()
+        k = self.count
+        self.count += n
+
+        self.ball[k : k + n] = ball
+        self.block[k : k + n] = block
+        self.x[k : k + n] = x
+        self.y[k : k + n] = y
+        self.impulse[k : k + n] = impulse
+
+    def clear(self):
+        self.count = 0
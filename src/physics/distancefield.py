@@ -0,0 +1,167 @@
+from math import ceil, floor
+
+import numpy as np
+import pygame
+
+from ..profiler import profiler
+
+NONE = np.iinfo(int).max  # The id of samples no block is within reach of
+
+
+class DistanceField:
+    """A signed distance field of the blocks, baked on a grid of samples.
+
+    Sample (row, column) holds the signed distance from (x + column * cell,
+    y + row * cell) to the closest block, negative inside, along with the
+    id of that block. Distances are clamped to reach: a block only writes
+    the samples within reach of its bounding box, so baking costs about the
+    area the blocks cover, and looking a point up costs the same whatever
+    the number of blocks.
+
+    The samples are split in square tiles. Removing blocks recomputes the
+    samples of the tiles within their reach which were closest to one of
+    them, from the blocks left near those samples. The others keep the
+    distance of a block still there.
+    """
+
+    def __init__(self, boundingRect, cell=4.0, reach=32.0, tile=16):
+        """
+        @param cell:
+            The distance between samples, in pixels.
+
+        @param reach:
+            The distance beyond which distances are clamped. Circles larger
+            than reach can't be collided.
+
+        @param tile:
+            The number of samples per side of a tile.
+        """
+        left, top, right, bottom = boundingRect
+        self.x = left
+        self.y = top
+        self.cell = cell
+        self.reach = reach
+        self.tile = tile
+
+        self.columns = int(ceil((right - left) / cell)) + 1
+        self.rows = int(ceil((bottom - top) / cell)) + 1
+        self.distance = np.full((self.rows, self.columns), reach)
+        self.ids = np.full((self.rows, self.columns), NONE)
+
+    def bake(self, blocks):
+        """Writes the distances of blocks, with their id attribute."""
+        for block in blocks:
+            self._splat(block, 0, 0, self.rows, self.columns)
+
+    def _splat(self, block, row0, column0, row1, column1):
+        # The samples within reach of block, in rows [row0, row1) and
+        # columns [column0, column1)
+        left, top, w, h = block.geom.aabb
+        reach = self.reach
+        cell = self.cell
+        row0 = max(row0, int(floor((top - reach - self.y) / cell)))
+        row1 = min(row1, int(ceil((top + h + reach - self.y) / cell)) + 1)
+        column0 = max(column0, int(floor((left - reach - self.x) / cell)))
+        column1 = min(column1, int(ceil((left + w + reach - self.x) / cell)) + 1)
+        if row0 >= row1 or column0 >= column1:
+            return
+
+        x = self.x + np.arange(column0, column1) * cell
+        y = self.y + np.arange(row0, row1) * cell
+        distance = block.geom.distance_array(x[np.newaxis, :], y[:, np.newaxis])
+        window = np.s_[row0:row1, column0:column1]
+        current = self.distance[window]
+        # Ties go to the lowest id, so the order blocks come in doesn't matter
+        closer = (distance < current) | (
+            (distance == current) & (block.id < self.ids[window])
+        )
+        self.distance[window][closer] = distance[closer]
+        self.ids[window][closer] = block.id
+
+    def remove(self, blocks, index):
+        """Recomputes the samples blocks were closest to, once removed.
+
+        @param index:
+            A spatial index of the blocks left, queried for the ones near
+            each tile.
+
+        Returns the number of tiles recomputed.
+        """
+        reach = self.reach
+        cell = self.cell
+        size = self.tile * cell
+        # Blocks writing a tile have their bounding box within reach, a cell
+        # more covers block rects rounding their box down
+        margin = reach + cell
+        tiles = set()
+        for block in blocks:
+            left, top, w, h = block.geom.aabb
+            i0 = max(int(floor((top - reach - self.y) / size)), 0)
+            i1 = int(floor((top + h + reach - self.y) / size))
+            j0 = max(int(floor((left - reach - self.x) / size)), 0)
+            j1 = int(floor((left + w + reach - self.x) / size))
+            for i in range(i0, min(i1, (self.rows - 1) // self.tile) + 1):
+                for j in range(j0, min(j1, (self.columns - 1) // self.tile) + 1):
+                    tiles.add((i, j))
+
+        removed = np.array([block.id for block in blocks])
+        recomputed = 0
+        for i, j in tiles:
+            row0 = i * self.tile
+            column0 = j * self.tile
+            window = np.s_[row0 : row0 + self.tile, column0 : column0 + self.tile]
+            stale = np.isin(self.ids[window], removed)
+            if not stale.any():
+                continue
+            recomputed += 1
+            self.distance[window][stale] = reach
+            self.ids[window][stale] = NONE
+
+            # Only the stale samples' bounding box needs the blocks left
+            rows, columns = np.nonzero(stale)
+            row1 = row0 + rows.max() + 1
+            column1 = column0 + columns.max() + 1
+            row0 += rows.min()
+            column0 += columns.min()
+            left = self.x + column0 * cell - margin
+            top = self.y + row0 * cell - margin
+            area = pygame.Rect(
+                int(floor(left)),
+                int(floor(top)),
+                int(ceil((column1 - 1 - column0) * cell + margin * 2.0)) + 2,
+                int(ceil((row1 - 1 - row0) * cell + margin * 2.0)) + 2,
+            )
+            for block in index.hit(area):
+                self._splat(block, row0, column0, row1, column1)
+
+        if profiler.enabled:
+            profiler.count("field tiles", recomputed)
+        return recomputed
+
+    def sample(self, x, y):
+        """Bilinear lookup at arrays of points.
+
+        Returns the distance and its gradient there, and the id of the
+        block closest to the nearest sample, NONE if none is within reach.
+        Points off the grid get the values at its border.
+        """
+        u = np.clip((x - self.x) / self.cell, 0.0, self.columns - 1.0)
+        v = np.clip((y - self.y) / self.cell, 0.0, self.rows - 1.0)
+        column = np.minimum(u.astype(int), self.columns - 2)
+        row = np.minimum(v.astype(int), self.rows - 2)
+        fu = u - column
+        fv = v - row
+
+        distance = self.distance
+        d00 = distance[row, column]
+        d01 = distance[row, column + 1]
+        d10 = distance[row + 1, column]
+        d11 = distance[row + 1, column + 1]
+        top = d00 + (d01 - d00) * fu
+        bottom = d10 + (d11 - d10) * fu
+        d = top + (bottom - top) * fv
+        gx = ((d01 - d00) * (1.0 - fv) + (d11 - d10) * fv) / self.cell
+        gy = (bottom - top) / self.cell
+
+        ids = self.ids[np.rint(v).astype(int), np.rint(u).astype(int)]
+        return d, gx, gy, ids
@@ -1,4 +1,6 @@
-from math import hypot
+from math import hypot, sqrt
+
+import numpy as np
 
 
 def point_on_line(Px, Py, Ax, Ay, Bx, By):
@@ -21,6 +23,15 @@ def point_on_segment(Px, Py, Ax, Ay, Bx, By):
     return Ax + ABx * d, Ay + ABy * d
 
 
+def point_on_segment_array(Px, Py, Ax, Ay, Bx, By):
+    """Point projection on a segment for arrays of points."""
+    ABx = Bx - Ax
+    ABy = By - Ay
+    d = ((Px - Ax) * ABx + (Py - Ay) * ABy) / (ABx ** 2 + ABy ** 2)
+    d = np.clip(d, 0.0, 1.0)
+    return Ax + ABx * d, Ay + ABy * d
+
+
 def point_on_circle(Px, Py, Cx, Cy, Cr):
     """Point projection on a circle."""
     dx = Px - Cx
@@ -33,3 +44,92 @@ def trilateration(Ax, Ay, Bx, By, Cx, Cy):
     """Returns the circle which intersects A B and C"""
     raise NotImplementedError
 
+
+def ray_circle_toi(Px, Py, dx, dy, Cx, Cy, R):
+    """Time of impact of point P, moving by (dx, dy), against a circle.
+
+    Returns (t, nx, ny): the first t in [0, 1] at which P enters the circle
+    and the outward unit normal there. Returns None if P misses the circle,
+    starts inside it or moves away from it.
+    """
+    fx = Px - Cx
+    fy = Py - Cy
+    a = dx ** 2 + dy ** 2
+    b = fx * dx + fy * dy
+    c = fx ** 2 + fy ** 2 - R ** 2
+    if c < 0.0 or b >= 0.0:
+        return None
+    discriminant = b ** 2 - a * c
+    if discriminant < 0.0:
+        return None
+    t = (-b - sqrt(discriminant)) / a
+    if t > 1.0:
+        return None
+    return t, (fx + dx * t) / R, (fy + dy * t) / R
+
+
+def ray_circle_exit_toi(Px, Py, dx, dy, Cx, Cy, R):
+    """Time at which point P, moving by (dx, dy), leaves a circle.
+
+    P may start inside the circle or cross it. Returns (t, nx, ny) with the
+    inward unit normal, or None if P isn't leaving the circle within [0, 1].
+    """
+    fx = Px - Cx
+    fy = Py - Cy
+    a = dx ** 2 + dy ** 2
+    if a == 0.0:
+        return None
+    b = fx * dx + fy * dy
+    c = fx ** 2 + fy ** 2 - R ** 2
+    discriminant = b ** 2 - a * c
+    if discriminant <= 0.0:
+        return None
+    t = (-b + sqrt(discriminant)) / a
+    if not 0.0 <= t <= 1.0:
+        return None
+    return t, -(fx + dx * t) / R, -(fy + dy * t) / R
+
+
+def ray_capsule_toi(Px, Py, dx, dy, Ax, Ay, Bx, By, R):
+    """Time of impact of point P, moving by (dx, dy), against a capsule.
+
+    The capsule is the segment AB grown by R. Returns (t, nx, ny) like
+    ray_circle_toi, or None.
+    """
+    if Ax == Bx and Ay == By:
+        Qx, Qy = Ax, Ay
+    else:
+        Qx, Qy = point_on_segment(Px, Py, Ax, Ay, Bx, By)
+    if (Px - Qx) ** 2 + (Py - Qy) ** 2 < R ** 2:  # Starts inside
+        return None
+
+    best = None
+
+    # Sides
+    ABx = Bx - Ax
+    ABy = By - Ay
+    square_length = ABx ** 2 + ABy ** 2
+    if square_length > 0.0:
+        length = sqrt(square_length)
+        nx = -ABy / length
+        ny = ABx / length
+        s0 = (Px - Ax) * nx + (Py - Ay) * ny
+        sd = dx * nx + dy * ny
+        if s0 < 0.0:  # Use the side facing P
+            nx, ny, s0, sd = -nx, -ny, -s0, -sd
+        if s0 >= R and sd < 0.0:
+            t = (s0 - R) / -sd
+            if t <= 1.0:
+                u = (
+                    (Px + dx * t - Ax) * ABx + (Py + dy * t - Ay) * ABy
+                ) / square_length
+                if 0.0 <= u <= 1.0:
+                    best = t, nx, ny
+
+    # Caps
+    for Cx, Cy in (Ax, Ay), (Bx, By):
+        hit = ray_circle_toi(Px, Py, dx, dy, Cx, Cy, R)
+        if hit and (best is None or hit[0] < best[0]):
+            best = hit
+
+    return best
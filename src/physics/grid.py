@@ -0,0 +1,236 @@
+from math import ceil
+
+import numpy as np
+
+from ..profiler import profiler
+from .spatialindex import SpatialIndex
+
+
+class UniformGrid(SpatialIndex):
+    """A uniform grid spatial index over flat NumPy arrays.
+
+    Every item is bucketed into each cell its rect overlaps. Buckets are laid
+    out back to back, sorted by cell: the items of cell c are
+    cellItems[cellStarts[c]:cellStarts[c + 1]]. Since cells are numbered row
+    by row, a query reads one contiguous slice per row it covers.
+
+    Insertions mark the grid dirty and it is rebuilt on the next query,
+    removals only clear the item's alive flag.
+    """
+
+    batched = True
+
+    def __init__(self, items=[], boundingRect=None, cellSize=32):
+        """Creates a uniform grid.
+
+        @param items:
+            A sequence of items to store in the grid.
+
+        @param boundingRect:
+            The (left, top, right, bottom) area covered by the cells. Items
+            outside of it fall in the border cells. Defaults to the bounding
+            rectangle of the items.
+
+        @param cellSize:
+            The side of the square cells, in pixels.
+        """
+        self.boundingRect = boundingRect
+        self.cellSize = cellSize
+
+        self.items = []
+        self.indices = {}  # item: index in items
+        self.bounds = np.zeros((0, 4), dtype=int)  # left, top, right, bottom
+        self.alive = np.zeros(0, dtype=bool)
+
+        self._pending = []
+        self._dirty = True
+        self.insert_many(items)
+
+    def insert(self, item):
+        self._pending.append(item)
+        self._dirty = True
+
+    def insert_many(self, items):
+        self._pending.extend(items)
+        self._dirty = True
+
+    def remove(self, item):
+        if item in self.indices:
+            self.alive[self.indices.pop(item)] = False
+        else:
+            self._pending.remove(item)
+
+    def _build(self):
+        # Compact the live items, then bucket them.
+        items = [item for item, alive in zip(self.items, self.alive) if alive]
+        items += self._pending
+        self._pending = []
+        self.items = items
+        self.indices = {item: i for i, item in enumerate(items)}
+        self.itemArray = np.empty(len(items), dtype=object)  # For hit_many
+        self.itemArray[:] = items
+        bounds = self.bounds = np.array(
+            [
+                (item.rect.left, item.rect.top, item.rect.right, item.rect.bottom)
+                for item in items
+            ],
+            dtype=int,
+        ).reshape(-1, 4)
+        self.alive = np.ones(len(items), dtype=bool)
+
+        if self.boundingRect:
+            l, t, r, b = self.boundingRect
+        elif items:
+            l, t = bounds[:, :2].min(axis=0).tolist()
+            r, b = bounds[:, 2:].max(axis=0).tolist()
+        else:
+            l = t = r = b = 0
+        self.l = l
+        self.t = t
+        cs = self.cellSize
+        cols = self.cols = max(1, int(ceil((r - l) / cs)))
+        rows = self.rows = max(1, int(ceil((b - t) / cs)))
+
+        c0 = np.clip((bounds[:, 0] - l) // cs, 0, cols - 1)
+        c1 = np.clip((bounds[:, 2] - 1 - l) // cs, c0, cols - 1)
+        r0 = np.clip((bounds[:, 1] - t) // cs, 0, rows - 1)
+        r1 = np.clip((bounds[:, 3] - 1 - t) // cs, r0, rows - 1)
+        spans = c1 - c0 + 1
+        counts = spans * (r1 - r0 + 1)
+
+        # One entry per (item, cell) pair
+        owners = np.repeat(np.arange(len(items)), counts)
+        k = np.arange(len(owners)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cells = (
+            (r0[owners] + k // spans[owners]) * cols + c0[owners] + k % spans[owners]
+        )
+
+        order = np.argsort(cells, kind="stable")
+        self.cellItems = owners[order]
+        self.cellStarts = np.zeros(cols * rows + 1, dtype=int)
+        np.cumsum(np.bincount(cells, minlength=cols * rows), out=self.cellStarts[1:])
+        self._dirty = False
+
+    def dump(self):
+        if self._dirty or not self.alive.all():
+            self._build()
+        grid = np.array([self.l, self.t, self.cols, self.rows, self.cellSize])
+        return (
+            self.items,
+            {
+                "bounds": self.bounds,
+                "cellItems": self.cellItems,
+                "cellStarts": self.cellStarts,
+                "grid": grid.astype(float),
+            },
+        )
+
+    def restore(self, items, arrays):
+        self.items = list(items)
+        self.indices = {item: i for i, item in enumerate(self.items)}
+        self.itemArray = np.empty(len(self.items), dtype=object)
+        self.itemArray[:] = self.items
+        self.bounds = np.array(arrays["bounds"], dtype=int)
+        self.alive = np.ones(len(self.items), dtype=bool)
+        self.cellItems = np.array(arrays["cellItems"], dtype=int)
+        self.cellStarts = np.array(arrays["cellStarts"], dtype=int)
+        l, t, cols, rows, cellSize = arrays["grid"].tolist()
+        self.l = l
+        self.t = t
+        self.cols = int(cols)
+        self.rows = int(rows)
+        self.cellSize = cellSize
+        self._pending = []
+        self._dirty = False
+
+    def _cell_range(self, left, top, right, bottom):
+        cs = self.cellSize
+        c0 = min(max(int((left - self.l) // cs), 0), self.cols - 1)
+        c1 = min(max(int((right - self.l) // cs), c0), self.cols - 1)
+        r0 = min(max(int((top - self.t) // cs), 0), self.rows - 1)
+        r1 = min(max(int((bottom - self.t) // cs), r0), self.rows - 1)
+        return c0, c1, r0, r1
+
+    def _candidates(self, c0, c1, r0, r1):
+        if profiler.enabled:
+            profiler.count("nodes", (c1 - c0 + 1) * (r1 - r0 + 1))
+        starts = self.cellStarts
+        cols = self.cols
+        slices = [
+            self.cellItems[starts[row * cols + c0] : starts[row * cols + c1 + 1]]
+            for row in range(r0, r1 + 1)
+        ]
+        return slices[0] if len(slices) == 1 else np.concatenate(slices)
+
+    def hitPoint(self, x, y):
+        if self._dirty:
+            self._build()
+        candidates = self._candidates(*self._cell_range(x, y, x, y))
+        b = self.bounds[candidates]
+        mask = (b[:, 0] <= x) & (x < b[:, 2]) & (b[:, 1] <= y) & (y < b[:, 3])
+        mask &= self.alive[candidates]
+        items = self.items
+        return set(items[i] for i in candidates[mask].tolist())
+
+    def hit(self, rect):
+        if self._dirty:
+            self._build()
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        candidates = self._candidates(
+            *self._cell_range(left, top, right - 1, bottom - 1)
+        )
+        b = self.bounds[candidates]
+        mask = (
+            (b[:, 0] < right) & (left < b[:, 2]) & (b[:, 1] < bottom) & (top < b[:, 3])
+        )
+        mask &= self.alive[candidates]
+        items = self.items
+        return set(items[i] for i in candidates[mask].tolist())
+
+    def hit_many(self, rects):
+        if self._dirty:
+            self._build()
+        rects = np.asarray(rects, dtype=int).reshape(-1, 4)
+        topLeft = rects[:, :2]
+        bottomRight = topLeft + rects[:, 2:]
+        left, top = topLeft.T
+        right, bottom = bottomRight.T
+        # As _cell_range, for every rect, columns then rows
+        origin = np.array([self.l, self.t])
+        last = np.array([self.cols - 1, self.rows - 1])
+        first = (topLeft - origin) // self.cellSize
+        first = np.minimum(np.maximum(first, 0), last)
+        end = (bottomRight - 1 - origin) // self.cellSize
+        end = np.minimum(np.maximum(end, first), last)
+        c0, r0 = first.astype(int).T
+        c1, r1 = end.astype(int).T
+        cols = self.cols
+        if profiler.enabled:
+            profiler.count("nodes", int(((c1 - c0 + 1) * (r1 - r0 + 1)).sum()))
+
+        # One slice of cellItems per (query, row) pair, as in _candidates
+        rowCounts = r1 - r0 + 1
+        rowQueries = np.repeat(np.arange(len(rects)), rowCounts)
+        k = np.arange(len(rowQueries)) - np.repeat(
+            np.cumsum(rowCounts) - rowCounts, rowCounts
+        )
+        row = r0[rowQueries] + k
+        starts = self.cellStarts[row * cols + c0[rowQueries]]
+        ends = self.cellStarts[row * cols + c1[rowQueries] + 1]
+        counts = ends - starts
+        queries = np.repeat(rowQueries, counts)
+        k = np.arange(len(queries)) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidates = self.cellItems[np.repeat(starts, counts) + k]
+
+        b = self.bounds[candidates]
+        mask = (
+            (b[:, 0] < right[queries])
+            & (left[queries] < b[:, 2])
+            & (b[:, 1] < bottom[queries])
+            & (top[queries] < b[:, 3])
+        )
+        mask &= self.alive[candidates]
+        # Items spanning several cells of a query come up once per cell
+        keys = np.unique(queries[mask] * len(self.items) + candidates[mask])
+        queries, candidates = np.divmod(keys, max(len(self.items), 1))
+        return queries, self.itemArray[candidates]
@@ -1,5 +1,9 @@
 from math import sin, cos, pi, atan2, sqrt, hypot
 
+import numpy as np
+
+from src.physics.geometry import ray_capsule_toi, ray_circle_toi, ray_circle_exit_toi
+
 
 class Arc:
     def __init__(self, x, y, r0, r1, angle0, angle1):
@@ -13,6 +17,7 @@ class Arc:
             r0, r1 = r1, r0
         self.r0 = r0
         self.r1 = r1
+        self.sweep = angle0, angle1  # As given, sanitizing loses the order
 
         # We sanitize angle values, but take into account their
         # "before-sanitation order" to preserve the expected swept area.
@@ -53,6 +58,23 @@ class Arc:
 
         self.angular_condition = special if self._special else normal
 
+        # The radial sides as angular_condition sees them, on atan2 angles in
+        # [-pi, pi]: (angle, whether the sweep lies counterclockwise of it).
+        if self._special:
+            intervals = [(-pi, self.angle0), (self.angle1, pi)]
+        else:
+            intervals = [(self.angle0, self.angle1)]
+        sides = []
+        for low, high in intervals:
+            low = max(low, -pi)
+            high = min(high, pi)
+            if low < high:
+                sides += [(low, True), (high, False)]
+        seam = [side for side in sides if abs(side[0]) == pi]
+        if len(seam) == 2:  # Swept on both of its edges, the seam is no side
+            sides = [side for side in sides if side not in seam]
+        self._sides = sides
+
         self.aabb = self.get_aabb()
 
     def hit(self, x, y):
@@ -62,6 +84,42 @@ class Arc:
         else:
             return False
 
+    def hit_array(self, x, y):
+        """Vectorized hit over broadcastable coordinate arrays."""
+        square_distance = (x - self.x) ** 2 + (y - self.y) ** 2
+        inside = (self.r0 ** 2 < square_distance) & (square_distance < self.r1 ** 2)
+        a = np.arctan2(y - self.y, x - self.x)
+        if self._special:
+            return inside & ((a < self.angle0) | (a > self.angle1))
+        return inside & (self.angle0 < a) & (a < self.angle1)
+
+    def distance_array(self, x, y):
+        """Exact signed distance over broadcastable coordinate arrays,
+        negative inside.
+
+        Within the sweep the closest border is a curved one or a side,
+        outside of it the closest point is always on a side.
+        """
+        dx = x - self.x
+        dy = y - self.y
+        a = np.arctan2(dy, dx)
+        if self._special:
+            angular = (a < self.angle0) | (a > self.angle1)
+        else:
+            angular = (self.angle0 < a) & (a < self.angle1)
+        radius = np.hypot(dx, dy)
+        radial = np.maximum(self.r0 - radius, radius - self.r1)
+
+        sides = np.full(np.broadcast(dx, dy).shape, np.inf)
+        for angle, ccw in self._sides:
+            ux = cos(angle)
+            uy = sin(angle)
+            along = np.clip(dx * ux + dy * uy, self.r0, self.r1)
+            np.minimum(sides, np.hypot(dx - ux * along, dy - uy * along), sides)
+
+        inside = np.maximum(radial, -sides)
+        return np.where(angular, np.where(radial > 0.0, radial, inside), sides)
+
     def hit_circle(self, x, y, r):
         if self.angular_condition(x, y):
             # Curved borders
@@ -82,6 +140,93 @@ class Arc:
 
         return None, None
 
+    def sweep_circle(self, x0, y0, x1, y1, r):
+        """Swept hit_circle for a circle moving from (x0, y0) to (x1, y1).
+
+        Returns (t, nx, ny): the fraction of the motion at which the circle
+        first touches this shape, and the contact normal pointing towards
+        the circle. Returns None if there is no contact, or if the circle
+        starts overlapping.
+        """
+        dx = x1 - x0
+        dy = y1 - y0
+        best = None
+
+        # Curved borders, as long as the contact lies within the sweep
+        for hit in (
+            ray_circle_toi(x0, y0, dx, dy, self.x, self.y, self.r1 + r),
+            ray_circle_exit_toi(x0, y0, dx, dy, self.x, self.y, self.r0 - r)
+            if self.r0 > r
+            else None,
+        ):
+            if hit and (best is None or hit[0] < best[0]):
+                if self.angular_condition(x0 + dx * hit[0], y0 + dy * hit[0]):
+                    best = hit
+
+        # Sides, segments grown by r: the circle touches one when its center
+        # comes within r of it, the ends of the side included
+        for angle, ccw in self._sides:
+            ux = cos(angle)
+            uy = sin(angle)
+            hit = ray_capsule_toi(
+                x0,
+                y0,
+                dx,
+                dy,
+                self.x + ux * self.r0,
+                self.y + uy * self.r0,
+                self.x + ux * self.r1,
+                self.y + uy * self.r1,
+                r,
+            )
+            if hit and (best is None or hit[0] < best[0]):
+                best = hit
+
+        return best
+
+    def hit_circles(self, x, y, r):
+        """Vectorized hit_circle for arrays of circles.
+
+        Returns the penetration vector arrays and the hit mask.
+        """
+        return self.hit_circle_packed(self.pack([self]), x, y, r)
+
+    def params(self):
+        """Returns the arguments rebuilding this shape."""
+        return (self.x, self.y, self.r0, self.r1) + self.sweep
+
+    @staticmethod
+    def pack(arcs):
+        """Returns the parameters of arcs as arrays."""
+        return tuple(
+            np.array([getattr(a, name) for a in arcs], dtype=float)
+            for name in ("x", "y", "r0", "r1", "angle0", "angle1")
+        ) + (np.array([a._special for a in arcs], dtype=bool),)
+
+    @staticmethod
+    def hit_circle_packed(params, x, y, r):
+        """hit_circle of packed arcs against circles, pairwise.
+
+        params comes from pack. Shapes and circles broadcast against each
+        other, so either side can be a single one.
+        """
+        cx, cy, r0, r1, angle0, angle1, special = params
+        a = np.arctan2(y - cy, x - cx)
+        angular = np.where(
+            special, (a < angle0) | (a > angle1), (angle0 < a) & (a < angle1)
+        )
+        square_distance = (x - cx) ** 2 + (y - cy) ** 2
+        hit = angular & ((r0 - r) ** 2 < square_distance)
+        hit &= square_distance < (r1 + r) ** 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distance = np.sqrt(square_distance)
+            penetration = np.where(
+                distance > (r0 + r1) / 2.0, r1 + r - distance, r0 - r - distance
+            )
+            dx = np.where(hit, (cx - x) / distance * penetration, 0.0)
+            dy = np.where(hit, (cy - y) / distance * penetration, 0.0)
+        return dx, dy, hit
+
     def get_aabb(self):
         """Samples a few points, returns their AABB. Crappy at best."""
         Ax = self.x + cos(self.angle0) * self.r0
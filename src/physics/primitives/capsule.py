@@ -1,6 +1,12 @@
 from math import sqrt
 
-from src.physics.geometry import point_on_segment
+import numpy as np
+
+from src.physics.geometry import (
+    point_on_segment,
+    point_on_segment_array,
+    ray_capsule_toi,
+)
 
 
 class Capsule:
@@ -18,6 +24,17 @@ class Capsule:
             return True
         return False
 
+    def hit_array(self, x, y):
+        """Vectorized hit over broadcastable coordinate arrays."""
+        Px, Py = point_on_segment_array(x, y, self.x0, self.y0, self.x1, self.y1)
+        return (x - Px) ** 2 + (y - Py) ** 2 < self.r ** 2
+
+    def distance_array(self, x, y):
+        """Exact signed distance over broadcastable coordinate arrays,
+        negative inside."""
+        Px, Py = point_on_segment_array(x, y, self.x0, self.y0, self.x1, self.y1)
+        return np.hypot(x - Px, y - Py) - self.r
+
     def hit_circle(self, x, y, r):
         Px, Py = point_on_segment(x, y, self.x0, self.y0, self.x1, self.y1)
         square_distance = (x - Px) ** 2 + (y - Py) ** 2
@@ -30,6 +47,55 @@ class Capsule:
             )
         return None, None
 
+    def sweep_circle(self, x0, y0, x1, y1, r):
+        """Swept hit_circle for a circle moving from (x0, y0) to (x1, y1).
+
+        Returns (t, nx, ny): the fraction of the motion at which the circle
+        first touches this shape, and the contact normal pointing towards
+        the circle. Returns None if there is no contact, or if the circle
+        starts overlapping.
+        """
+        return ray_capsule_toi(
+            x0, y0, x1 - x0, y1 - y0, self.x0, self.y0, self.x1, self.y1, self.r + r
+        )
+
+    def hit_circles(self, x, y, r):
+        """Vectorized hit_circle for arrays of circles.
+
+        Returns the penetration vector arrays and the hit mask.
+        """
+        return self.hit_circle_packed(self.pack([self]), x, y, r)
+
+    def params(self):
+        """Returns the arguments rebuilding this shape."""
+        return self.x0, self.y0, self.x1, self.y1, self.r
+
+    @staticmethod
+    def pack(capsules):
+        """Returns the parameters of capsules as arrays."""
+        return tuple(
+            np.array([getattr(c, name) for c in capsules], dtype=float)
+            for name in ("x0", "y0", "x1", "y1", "r")
+        )
+
+    @staticmethod
+    def hit_circle_packed(params, x, y, r):
+        """hit_circle of packed capsules against circles, pairwise.
+
+        params comes from pack. Shapes and circles broadcast against each
+        other, so either side can be a single one.
+        """
+        x0, y0, x1, y1, cr = params
+        Px, Py = point_on_segment_array(x, y, x0, y0, x1, y1)
+        square_distance = (x - Px) ** 2 + (y - Py) ** 2
+        hit = square_distance < (cr + r) ** 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distance = np.sqrt(square_distance)
+            penetration = cr + r - distance
+            dx = np.where(hit, (Px - x) / distance * penetration, 0.0)
+            dy = np.where(hit, (Py - y) / distance * penetration, 0.0)
+        return dx, dy, hit
+
     def get_aabb(self):
         return (
             min(self.x0, self.x1) - self.r,
@@ -1,5 +1,9 @@
 from math import sqrt
 
+import numpy as np
+
+from src.physics.geometry import ray_circle_toi
+
 
 class Circle:
     def __init__(self, x, y, r):
@@ -13,6 +17,15 @@ class Circle:
             return True
         return False
 
+    def hit_array(self, x, y):
+        """Vectorized hit over broadcastable coordinate arrays."""
+        return (x - self.x) ** 2 + (y - self.y) ** 2 < self.r ** 2
+
+    def distance_array(self, x, y):
+        """Exact signed distance over broadcastable coordinate arrays,
+        negative inside."""
+        return np.hypot(x - self.x, y - self.y) - self.r
+
     def hit_circle(self, x, y, r):
         square_distance = (x - self.x) ** 2 + (y - self.y) ** 2
         if square_distance < (self.r + r) ** 2:
@@ -24,5 +37,52 @@ class Circle:
             )
         return None, None
 
+    def sweep_circle(self, x0, y0, x1, y1, r):
+        """Swept hit_circle for a circle moving from (x0, y0) to (x1, y1).
+
+        Returns (t, nx, ny): the fraction of the motion at which the circle
+        first touches this shape, and the contact normal pointing towards
+        the circle. Returns None if there is no contact, or if the circle
+        starts overlapping.
+        """
+        return ray_circle_toi(x0, y0, x1 - x0, y1 - y0, self.x, self.y, self.r + r)
+
+    def hit_circles(self, x, y, r):
+        """Vectorized hit_circle for arrays of circles.
+
+        Returns the penetration vector arrays and the hit mask.
+        """
+        return self.hit_circle_packed(self.pack([self]), x, y, r)
+
+    def params(self):
+        """Returns the arguments rebuilding this shape."""
+        return self.x, self.y, self.r
+
+    @staticmethod
+    def pack(circles):
+        """Returns the parameters of circles as arrays."""
+        return (
+            np.array([c.x for c in circles], dtype=float),
+            np.array([c.y for c in circles], dtype=float),
+            np.array([c.r for c in circles], dtype=float),
+        )
+
+    @staticmethod
+    def hit_circle_packed(params, x, y, r):
+        """hit_circle of packed circles against circles, pairwise.
+
+        params comes from pack. Shapes and circles broadcast against each
+        other, so either side can be a single one.
+        """
+        cx, cy, cr = params
+        square_distance = (x - cx) ** 2 + (y - cy) ** 2
+        hit = square_distance < (cr + r) ** 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distance = np.sqrt(square_distance)
+            penetration = cr + r - distance
+            dx = np.where(hit, (cx - x) / distance * penetration, 0.0)
+            dy = np.where(hit, (cy - y) / distance * penetration, 0.0)
+        return dx, dy, hit
+
     def get_aabb(self):
         return self.x - self.r, self.y - self.r, self.r * 2.0, self.r * 2.0
@@ -1,6 +1,12 @@
 from math import sqrt
 
-from src.physics.geometry import point_on_segment
+import numpy as np
+
+from src.physics.geometry import (
+    point_on_segment,
+    point_on_segment_array,
+    ray_capsule_toi,
+)
 
 
 class Polygon:
@@ -26,6 +32,52 @@ class Polygon:
 
         return collision
 
+    def contains(self, x, y):
+        """Crossing number test, counting only edges that span y.
+
+        Unlike hit, it is exact outside of the bounding box too.
+        """
+        inside = False
+        for Ax, Ay, Bx, By in self.edges:
+            if (Ay <= y) != (By <= y):
+                if ((y - Ay) * (Bx - Ax)) / (By - Ay) + Ax > x:
+                    inside = not inside
+        return inside
+
+    def hit_array(self, x, y):
+        """Vectorized hit over broadcastable coordinate arrays."""
+        collision = np.zeros(np.broadcast(x, y).shape, dtype=bool)
+        for Ax, Ay, Bx, By in self.edges:
+            if Ay == By:
+                continue
+            Cx = ((y - Ay) * (Bx - Ax)) / (By - Ay) + Ax
+            collision ^= (Cx > x) & (
+                ((Ax <= Cx) & (Cx <= Bx)) | ((Bx <= Cx) & (Cx <= Ax))
+            )
+
+        return collision
+
+    def distance_array(self, x, y):
+        """Exact signed distance over broadcastable coordinate arrays,
+        negative inside.
+
+        The sign comes from the crossing number test of contains.
+        """
+        x, y = np.broadcast_arrays(x, y)
+        square_distance = np.full(x.shape, np.inf)
+        inside = np.zeros(x.shape, dtype=bool)
+        for Ax, Ay, Bx, By in self.edges:
+            if Ax == Bx and Ay == By:
+                continue
+            Px, Py = point_on_segment_array(x, y, Ax, Ay, Bx, By)
+            np.minimum(square_distance, (x - Px) ** 2 + (y - Py) ** 2, square_distance)
+            if Ay != By:
+                spans = (Ay <= y) != (By <= y)
+                inside ^= spans & (((y - Ay) * (Bx - Ax)) / (By - Ay) + Ax > x)
+
+        distance = np.sqrt(square_distance)
+        return np.where(inside, -distance, distance)
+
     def hit_circle(self, x, y, r):
         for Ax, Ay, Bx, By in self.edges:
             Px, Py = point_on_segment(x, y, Ax, Ay, Bx, By)
@@ -43,6 +95,93 @@ class Polygon:
 
         return None, None
 
+    def sweep_circle(self, x0, y0, x1, y1, r):
+        """Swept hit_circle for a circle moving from (x0, y0) to (x1, y1).
+
+        Returns (t, nx, ny): the fraction of the motion at which the circle
+        first touches this shape, and the contact normal pointing towards
+        the circle. Returns None if there is no contact, or if the circle
+        starts overlapping.
+        """
+        if self.contains(x0, y0):
+            return None
+        dx = x1 - x0
+        dy = y1 - y0
+        best = None
+        for Ax, Ay, Bx, By in self.edges:
+            hit = ray_capsule_toi(x0, y0, dx, dy, Ax, Ay, Bx, By, r)
+            if hit and (best is None or hit[0] < best[0]):
+                best = hit
+        return best
+
+    def hit_circles(self, x, y, r):
+        """Vectorized hit_circle for arrays of circles.
+
+        Returns the penetration vector arrays and the hit mask.
+        """
+        return self.hit_circle_packed(self.pack([self]), x, y, r)
+
+    def params(self):
+        """Returns the arguments rebuilding this shape."""
+        return self.points
+
+    @staticmethod
+    def pack(polygons):
+        """Returns the edges of polygons as four (polygons, edges) arrays.
+
+        Polygons with fewer edges are padded with degenerate edges sitting on
+        their first vertex, which neither hit circles nor cross test rays.
+        """
+        n = max(len(p.edges) for p in polygons)
+        edges = np.empty((len(polygons), n, 4))
+        for i, p in enumerate(polygons):
+            edges[i, : len(p.edges)] = p.edges
+            edges[i, len(p.edges) :] = p.points[0] * 2
+        return edges[..., 0], edges[..., 1], edges[..., 2], edges[..., 3]
+
+    @staticmethod
+    def hit_circle_packed(params, x, y, r):
+        """hit_circle of packed polygons against circles, pairwise.
+
+        params comes from pack. Shapes and circles broadcast against each
+        other, so either side can be a single one. Like hit_circle, the first
+        edge touched wins and a circle fully inside gets its own position
+        back as penetration vector.
+        """
+        Ax, Ay, Bx, By = params
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        r = np.asarray(r, dtype=float)
+        ex = x[..., np.newaxis]
+        ey = y[..., np.newaxis]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            Px, Py = point_on_segment_array(ex, ey, Ax, Ay, Bx, By)
+            square_distance = (ex - Px) ** 2 + (ey - Py) ** 2
+            edge_hit = square_distance < r[..., np.newaxis] ** 2
+            first = np.argmax(edge_hit, axis=-1)[..., np.newaxis]
+            Px = np.take_along_axis(Px, first, axis=-1)[..., 0]
+            Py = np.take_along_axis(Py, first, axis=-1)[..., 0]
+            distance = np.sqrt(np.take_along_axis(square_distance, first, -1)[..., 0])
+            penetration = r - distance
+            edge_hit = edge_hit.any(axis=-1)
+
+            # Ray casting, as in hit
+            Cx = ((ey - Ay) * (Bx - Ax)) / (By - Ay) + Ax
+            crossings = (
+                (Ay != By)
+                & (Cx > ex)
+                & (((Ax <= Cx) & (Cx <= Bx)) | ((Bx <= Cx) & (Cx <= Ax)))
+            )
+            inside = np.logical_xor.reduce(crossings, axis=-1)
+
+            dx = np.where(
+                edge_hit, (Px - x) / distance * penetration, np.where(inside, x, 0.0)
+            )
+            dy = np.where(
+                edge_hit, (Py - y) / distance * penetration, np.where(inside, y, 0.0)
+            )
+        return dx, dy, edge_hit | inside
+
     def get_aabb(self):
         x0 = min(p[0] for p in self.points)
         x1 = max(p[0] for p in self.points)
@@ -1,6 +1,31 @@
+import numpy as np
+
 from .polygon import Polygon
 
 
 class Rectangle(Polygon):
     def __init__(self, x, y, w, h):
         Polygon.__init__(self, (x, y), (x, y + h), (x + w, y + h), (x + w, y))
+        self.w = w
+        self.h = h
+
+    def get_aabb(self):
+        (x0, y0), (x1, y1) = self.points[0], self.points[2]
+        return min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0)
+
+    def distance_array(self, x, y):
+        """Exact signed distance over broadcastable coordinate arrays,
+        negative inside."""
+        left = min(p[0] for p in self.points)
+        top = min(p[1] for p in self.points)
+        w = abs(self.w) / 2.0
+        h = abs(self.h) / 2.0
+        qx = np.abs(x - (left + w)) - w
+        qy = np.abs(y - (top + h)) - h
+        outside = np.hypot(np.maximum(qx, 0.0), np.maximum(qy, 0.0))
+        return outside + np.minimum(np.maximum(qx, qy), 0.0)
+
+    def params(self):
+        """Returns the arguments rebuilding this shape."""
+        x, y = self.points[0]
+        return x, y, self.w, self.h
@@ -1,4 +1,8 @@
-class QuadTree(object):
+from ..profiler import profiler
+from .spatialindex import SpatialIndex
+
+
+class QuadTree(SpatialIndex):
     """An implementation of a quad-tree.
  
     This QuadTree started life as a version of [1] but found a life of its own
@@ -23,6 +27,7 @@ class QuadTree(object):
     Acknowledgements:
     [1] http://mu.arete.cc/pcr/syntax/quadtree/1/quadtree.py
     """
+
     def __init__(self, items=[], depth=6, boundingRect=None):
         """Creates a quad-tree.
  
@@ -41,14 +46,14 @@ class QuadTree(object):
         """
         # The sub-quadrants are empty to start with.
         self.nw = self.ne = self.se = self.sw = None
-        
+
         # If we've reached the maximum depth then insert all items into this
         # quadrant.
         self.depth = depth
         if self.depth == 0:
             self.items = items
             return
-        
+
         # Find this quadrant's centre.
         if boundingRect:
             l, t, r, b = self.l, self.t, self.r, self.b = boundingRect
@@ -60,7 +65,7 @@ class QuadTree(object):
             b = self.b = max(item.rect.bottom for item in items)
         cx = self.cx = (l + r) * 0.5
         cy = self.cy = (t + b) * 0.5
-        
+
         self.items = []
         if not items:
             return
@@ -68,35 +73,39 @@ class QuadTree(object):
         ne_items = []
         se_items = []
         sw_items = []
-        
+
         for item in items:
             # Which of the sub-quadrants does the item overlap?
             in_nw = item.rect.left <= cx and item.rect.top <= cy
             in_sw = item.rect.left <= cx and item.rect.bottom >= cy
             in_ne = item.rect.right >= cx and item.rect.top <= cy
             in_se = item.rect.right >= cx and item.rect.bottom >= cy
-                
+
             # If it overlaps all 4 quadrants then insert it at the current
             # depth, otherwise append it to a list to be inserted under every
             # quadrant that it overlaps.
             if in_nw and in_ne and in_se and in_sw:
                 self.items.append(item)
             else:
-                if in_nw: nw_items.append(item)
-                if in_ne: ne_items.append(item)
-                if in_se: se_items.append(item)
-                if in_sw: sw_items.append(item)
-            
+                if in_nw:
+                    nw_items.append(item)
+                if in_ne:
+                    ne_items.append(item)
+                if in_se:
+                    se_items.append(item)
+                if in_sw:
+                    sw_items.append(item)
+
         # Create the sub-quadrants, recursively.
         if nw_items:
-            self.nw = QuadTree(nw_items, self.depth-1, (l, t, cx, cy))
+            self.nw = QuadTree(nw_items, self.depth - 1, (l, t, cx, cy))
         if ne_items:
-            self.ne = QuadTree(ne_items, self.depth-1, (cx, t, r, cy))
+            self.ne = QuadTree(ne_items, self.depth - 1, (cx, t, r, cy))
         if se_items:
-            self.se = QuadTree(se_items, self.depth-1, (cx, cy, r, b))
+            self.se = QuadTree(se_items, self.depth - 1, (cx, cy, r, b))
         if sw_items:
-            self.sw = QuadTree(sw_items, self.depth-1, (l, cy, cx, b))
-    
+            self.sw = QuadTree(sw_items, self.depth - 1, (l, cy, cx, b))
+
     def insert(self, item):
         """Inserts an item in a quad-tree.
  
@@ -108,12 +117,12 @@ class QuadTree(object):
         if self.depth == 0:
             self.items.append(item)
             return
-        
+
         in_nw = item.rect.left <= self.cx and item.rect.top <= self.cy
         in_sw = item.rect.left <= self.cx and item.rect.bottom >= self.cy
         in_ne = item.rect.right >= self.cx and item.rect.top <= self.cy
         in_se = item.rect.right >= self.cx and item.rect.bottom >= self.cy
-        
+
         # If it overlaps all 4 quadrants then insert it at the current
         # depth, otherwise append it to the item list of every quadrant
         # that it overlaps.
@@ -124,30 +133,70 @@ class QuadTree(object):
                 if self.nw:
                     self.nw.insert(item)
                 else:
-                    self.nw = QuadTree([item], self.depth-1,
-                                       (self.l, self.t, self.cx, self.cy))
+                    self.nw = QuadTree(
+                        [item], self.depth - 1, (self.l, self.t, self.cx, self.cy)
+                    )
             if in_ne:
                 if self.ne:
                     self.ne.insert(item)
                 else:
-                    self.ne = QuadTree([item], self.depth-1,
-                                       (self.cx, self.t, self.r, self.cy))
+                    self.ne = QuadTree(
+                        [item], self.depth - 1, (self.cx, self.t, self.r, self.cy)
+                    )
             if in_se:
                 if self.se:
                     self.se.insert(item)
                 else:
-                    self.se = QuadTree([item], self.depth-1,
-                                       (self.cx, self.cy, self.r, self.b))
+                    self.se = QuadTree(
+                        [item], self.depth - 1, (self.cx, self.cy, self.r, self.b)
+                    )
             if in_sw:
                 if self.sw:
                     self.sw.insert(item)
                 else:
-                    self.sw = QuadTree([item], self.depth-1,
-                                       (self.l, self.cy, self.cx, self.b))
-    
+                    self.sw = QuadTree(
+                        [item], self.depth - 1, (self.l, self.cy, self.cx, self.b)
+                    )
+
+    def insert_many(self, items):
+        """Inserts several items in a quad-tree.
+
+        Equivalent to calling insert for each item, but items are split
+        among the sub-quadrants once per node instead of once per item.
+
+        @param items:
+            A sequence of items to store in the quad-tree.
+        """
+        # If we've reached the maximum depth then insert items in this quadrant.
+        if self.depth == 0:
+            self.items.extend(items)
+            return
+
+        own_items, nw_items, ne_items, se_items, sw_items = self._split(items)
+        self.items.extend(own_items)
+
+        for quadrant, quadrant_items, bounds in (
+            ("nw", nw_items, (self.l, self.t, self.cx, self.cy)),
+            ("ne", ne_items, (self.cx, self.t, self.r, self.cy)),
+            ("se", se_items, (self.cx, self.cy, self.r, self.b)),
+            ("sw", sw_items, (self.l, self.cy, self.cx, self.b)),
+        ):
+            if not quadrant_items:
+                continue
+            child = getattr(self, quadrant)
+            if child:
+                child.insert_many(quadrant_items)
+            else:
+                setattr(
+                    self, quadrant, QuadTree(quadrant_items, self.depth - 1, bounds)
+                )
+
     def remove(self, item):
         """Removes an item from a quad-tree.
  
+        Sub-quadrants left empty are pruned, so the tree shrinks back as
+        items go away.
+
         @param item:
             Whatever object was succesfully inserted in this tree
         """
@@ -155,12 +204,12 @@ class QuadTree(object):
         if self.depth == 0:
             self.items.remove(item)
             return
-        
+
         in_nw = item.rect.left <= self.cx and item.rect.top <= self.cy
         in_sw = item.rect.left <= self.cx and item.rect.bottom >= self.cy
         in_ne = item.rect.right >= self.cx and item.rect.top <= self.cy
         in_se = item.rect.right >= self.cx and item.rect.bottom >= self.cy
-        
+
         # If it overlaps all 4 quadrants remove it, otherwise
         # search the lower quadrants for it
         if in_nw and in_ne and in_se and in_sw:
@@ -174,11 +223,91 @@ class QuadTree(object):
                 self.se.remove(item)
             if in_sw and self.sw:
                 self.sw.remove(item)
-    
+            self._prune()
+
+    def remove_many(self, items):
+        """Removes several items from a quad-tree.
+
+        Equivalent to calling remove for each item, but the tree is walked
+        once for all of them.
+
+        @param items:
+            A collection of objects succesfully inserted in this tree
+        """
+        if not items:
+            return
+
+        # If we've reached the maximum depth remove the items from this
+        # quadrant in a single pass.
+        if self.depth == 0:
+            removed = set(items)
+            self.items = [item for item in self.items if item not in removed]
+            return
+
+        own_items, nw_items, ne_items, se_items, sw_items = self._split(items)
+        if own_items:
+            removed = set(own_items)
+            self.items = [item for item in self.items if item not in removed]
+        if nw_items and self.nw:
+            self.nw.remove_many(nw_items)
+        if ne_items and self.ne:
+            self.ne.remove_many(ne_items)
+        if se_items and self.se:
+            self.se.remove_many(se_items)
+        if sw_items and self.sw:
+            self.sw.remove_many(sw_items)
+        self._prune()
+
+    def is_empty(self):
+        """Whether this quadrant and all its sub-quadrants hold no items."""
+        return not (self.items or self.nw or self.ne or self.se or self.sw)
+
+    def _prune(self):
+        # Drop the sub-quadrants that have become empty. A quadrant whose
+        # sub-quadrants all go away collapses back into a leaf.
+        if self.nw and self.nw.is_empty():
+            self.nw = None
+        if self.ne and self.ne.is_empty():
+            self.ne = None
+        if self.se and self.se.is_empty():
+            self.se = None
+        if self.sw and self.sw.is_empty():
+            self.sw = None
+
+    def _split(self, items):
+        # Returns the items stored at this depth, those overlapping all 4
+        # sub-quadrants, followed by the items of each sub-quadrant.
+        cx = self.cx
+        cy = self.cy
+        own_items = []
+        nw_items = []
+        ne_items = []
+        se_items = []
+        sw_items = []
+        for item in items:
+            in_nw = item.rect.left <= cx and item.rect.top <= cy
+            in_sw = item.rect.left <= cx and item.rect.bottom >= cy
+            in_ne = item.rect.right >= cx and item.rect.top <= cy
+            in_se = item.rect.right >= cx and item.rect.bottom >= cy
+            if in_nw and in_ne and in_se and in_sw:
+                own_items.append(item)
+                continue
+            if in_nw:
+                nw_items.append(item)
+            if in_ne:
+                ne_items.append(item)
+            if in_se:
+                se_items.append(item)
+            if in_sw:
+                sw_items.append(item)
+        return own_items, nw_items, ne_items, se_items, sw_items
+
     def hitPoint(self, x, y):
+        if profiler.enabled:
+            profiler.count("nodes")
         # Find the hits at the current level.
         hits = set(item for item in self.items if item.rect.collidepoint((x, y)))
-        
+
         # Recursively check the lower quadrants.
         if self.nw and x <= self.cx and y <= self.cy:
             hits |= self.nw.hitPoint(x, y)
@@ -188,9 +317,9 @@ class QuadTree(object):
             hits |= self.ne.hitPoint(x, y)
         if self.se and x >= self.cx and y >= self.cy:
             hits |= self.se.hitPoint(x, y)
-        
+
         return hits
-    
+
     def hit(self, rect):
         """Returns the items that overlap a bounding rectangle.
  
@@ -201,9 +330,11 @@ class QuadTree(object):
             The bounding rectangle being tested against the quad-tree. This
             must be a pyGame Rect, or an object having one as its rect attribute.
         """
+        if profiler.enabled:
+            profiler.count("nodes")
         # Find the hits at the current level.
         hits = set(self.items[n] for n in rect.collidelistall(self.items))
-        
+
         # Recursively check the lower quadrants.
         if self.nw and rect.left <= self.cx and rect.top <= self.cy:
             hits |= self.nw.hit(rect)
@@ -213,5 +344,5 @@ class QuadTree(object):
             hits |= self.ne.hit(rect)
         if self.se and rect.right >= self.cx and rect.bottom >= self.cy:
             hits |= self.se.hit(rect)
- 
-        return hits
\ No newline at end of file
+
+        return hits
@@ -0,0 +1,66 @@
+import numpy as np
+
+from ..profiler import profiler
+
+
+class SortAndSweep:
+    """A broad phase for moving circles, sorting their extents along an axis.
+
+    Each step the circles are sorted by the low end of their extent along
+    the axis they are most spread over. A circle can only overlap the ones
+    starting before its high end, so the candidates of every circle are one
+    contiguous run of the sorted order, found by a binary search. Pairs are
+    then filtered on the other axis.
+
+    Sorting reuses the order of the last step, which circles moving a little
+    barely change, so the stable sort runs over nearly sorted data. The work
+    grows with the number of circles plus the number of pairs overlapping
+    along the sweep axis.
+    """
+
+    def __init__(self):
+        self.order = np.zeros(0, dtype=int)  # Sorted order of the last step
+        self.axis = 0
+
+    def pairs(self, x, y, r):
+        """Returns the arrays a and b of the circles whose bounding boxes
+        overlap, each pair once with a < b."""
+        n = len(x)
+        if n < 2:
+            self.order = np.arange(n)
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+        axis = int(np.ptp(y) > np.ptp(x))
+        u, v = (x, y) if axis == 0 else (y, x)
+        low = u - r
+
+        order = self.order
+        if len(order) != n or axis != self.axis:
+            order = np.arange(n)
+        order = order[np.argsort(low[order], kind="stable")]
+        self.order = order
+        self.axis = axis
+
+        # Circle k of the sorted order overlaps the ones after it, up to
+        # the first starting past its high end
+        sortedLow = low[order]
+        ends = np.searchsorted(sortedLow, sortedLow + 2.0 * r[order], "left")
+        counts = np.maximum(ends - np.arange(1, n + 1), 0)
+        total = int(counts.sum())
+        if profiler.enabled:
+            profiler.count("ball pairs", total)
+        if not total:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+        first = np.repeat(np.arange(n), counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        second = first + 1 + np.arange(total) - starts
+        a = order[first]
+        b = order[second]
+
+        near = np.abs(v[a] - v[b]) < r[a] + r[b]
+        a = a[near]
+        b = b[near]
+        swap = a > b
+        a[swap], b[swap] = b[swap], a[swap]
+        return a, b
@@ -0,0 +1,62 @@
+import numpy as np
+import pygame
+
+
+class SpatialIndex(object):
+    """The broad-phase interface shared by every spatial index backend.
+
+    Items being stored must possess a rect attribute, a pyGame Rect (or
+    anything exposing left, top, right and bottom), and they must be hashable.
+
+    Backends are built with SpatialIndex(items=[], boundingRect=None), where
+    boundingRect is (left, top, right, bottom). Queries return sets of items.
+    """
+
+    batched = False  # Whether hit_many answers every rect at once
+
+    def insert(self, item):
+        raise NotImplementedError
+
+    def insert_many(self, items):
+        for item in items:
+            self.insert(item)
+
+    def remove(self, item):
+        raise NotImplementedError
+
+    def remove_many(self, items):
+        for item in items:
+            self.remove(item)
+
+    def hitPoint(self, x, y):
+        """Returns the set of items whose rect contains the point (x, y)."""
+        raise NotImplementedError
+
+    def hit(self, rect):
+        """Returns the set of items whose rect overlaps rect."""
+        raise NotImplementedError
+
+    def hit_many(self, rects):
+        """Returns every item overlapping each of rects, as two arrays.
+
+        rects is an array of (left, top, width, height) rows. Item items[k]
+        overlaps rects[queries[k]], queries and items are returned.
+        """
+        queries = []
+        items = []
+        for i, rect in enumerate(np.asarray(rects).tolist()):
+            hits = self.hit(pygame.Rect(rect))
+            queries += [i] * len(hits)
+            items += hits
+        itemArray = np.empty(len(items), dtype=object)
+        itemArray[:] = items
+        return np.array(queries, dtype=int), itemArray
+
+    def dump(self):
+        """Returns the items and a dictionary of arrays describing the index,
+        or None when the index can't be stored as arrays."""
+        return None
+
+    def restore(self, items, arrays):
+        """Restores what dump returned, without rebuilding anything."""
+        raise NotImplementedError
@@ -0,0 +1,124 @@
+"""Per-frame timings and counters, kept for the last few hundred frames.
+
+Code being measured wraps its phases in profiler.phase(name) and bumps
+counters with profiler.count(name, n). Hot paths check profiler.enabled
+first, so a disabled profiler costs an attribute lookup.
+
+This module imports no pygame, so the physics can count into it. The graph
+and the exports are in profilerview.
+"""
+from collections import deque
+from timeit import default_timer
+
+from .settings import PROFILER, PROFILER_FRAMES
+
+
+class _Phase:
+    __slots__ = "profiler", "name", "start"
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.depth += 1
+        self.start = default_timer()
+        return self
+
+    def __exit__(self, *exc):
+        end = default_timer()
+        profiler = self.profiler
+        profiler.depth -= 1
+        profiler.phases.append(
+            (self.name, self.start, end - self.start, profiler.depth)
+        )
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Profiler:
+    """Records named phase timings and counters per frame.
+
+    frame() closes the current frame and opens the next one. Finished
+    frames go to a ring buffer of the last maxFrames frames, each a dict
+    with the frame start, its phases as (name, start, seconds, depth) and
+    its counters.
+    """
+
+    def __init__(self, maxFrames=PROFILER_FRAMES, enabled=PROFILER):
+        self.enabled = enabled
+        self.frames = deque(maxlen=maxFrames)
+        self.hud = False  # Whether the graph is shown, see profilerview
+        self.depth = 0  # Phases currently open
+        self._open()
+
+    def _open(self):
+        self.start = default_timer()
+        self.phases = []
+        self.counters = {}
+
+    def phase(self, name):
+        """Returns a context manager timing its block as phase name."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def count(self, name, n=1):
+        counters = self.counters
+        counters[name] = counters.get(name, 0) + n
+
+    def frame(self):
+        if not self.enabled:
+            return
+        self.frames.append(
+            {"start": self.start, "phases": self.phases, "counters": self.counters}
+        )
+        self._open()
+
+    def toggle(self):
+        """Shows or hides the graph, profiling only while it is shown."""
+        self.hud = self.enabled = not self.hud
+        self.frames.clear()
+        self._open()
+
+    def clear(self):
+        self.frames.clear()
+        self._open()
+
+    def totals(self, frame):
+        """Returns the seconds spent in each top level phase of frame."""
+        totals = {}
+        for name, start, seconds, depth in frame["phases"]:
+            if depth == 0:
+                totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def summary(self):
+        """Returns the mean milliseconds per frame of each phase and the
+        mean of each counter, over the buffered frames."""
+        frames = len(self.frames) or 1
+        phases = {}
+        counters = {}
+        for frame in self.frames:
+            for name, start, seconds, depth in frame["phases"]:
+                phases[name] = phases.get(name, 0.0) + seconds * 1000.0
+            for name, n in frame["counters"].items():
+                counters[name] = counters.get(name, 0) + n
+        return (
+            {name: ms / frames for name, ms in phases.items()},
+            {name: n / float(frames) for name, n in counters.items()},
+        )
+
+
+profiler = Profiler()
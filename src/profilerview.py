@@ -0,0 +1,113 @@
+"""Shows and exports what a Profiler recorded.
+
+draw puts the graph of the buffered frames on screen, export writes them
+to a file. They are kept out of profiler, which the physics imports.
+"""
+import json
+
+import pygame
+
+from .fonts import render_text
+from .settings import COLOR0, COLOR3
+
+GRAPH_W = 300
+GRAPH_H = 140
+GRAPH_MS = 33.3  # The time at the top of the graph
+PHASE_COLORS = [
+    (255, 127, 0),
+    (0, 127, 255),
+    (0, 191, 63),
+    (191, 0, 191),
+    (255, 0, 0),
+    (127, 127, 127),
+    (191, 191, 0),
+    (0, 191, 191),
+]
+
+colors = {}  # Phase name: graph color
+
+
+def to_json(profiler):
+    return {"frames": list(profiler.frames)}
+
+
+def to_chrome_trace(profiler):
+    """Returns the frames in Chrome's trace event format, for
+    chrome://tracing or Perfetto."""
+    events = []
+    for frame in profiler.frames:
+        ts = frame["start"] * 1e6
+        for name, start, seconds, depth in frame["phases"]:
+            events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": seconds * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                }
+            )
+        if frame["counters"]:
+            events.append(
+                {
+                    "name": "counters",
+                    "ph": "C",
+                    "ts": ts,
+                    "pid": 0,
+                    "args": frame["counters"],
+                }
+            )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export(profiler, path, chrome=False):
+    """Writes the buffered frames to path as JSON, or as a Chrome trace."""
+    with open(path, "w") as f:
+        json.dump(to_chrome_trace(profiler) if chrome else to_json(profiler), f)
+
+
+def color(name):
+    if name not in colors:
+        colors[name] = PHASE_COLORS[len(colors) % len(PHASE_COLORS)]
+    return colors[name]
+
+
+def draw(profiler, display, x=None, y=0):
+    """Draws the graph of the buffered frames, returns its rect.
+
+    Each column is a frame, stacking its top level phases.
+    """
+    if x is None:
+        x = display.get_width() - GRAPH_W
+    rect = pygame.Rect(x, y, GRAPH_W, GRAPH_H)
+    display.fill(COLOR0, rect)
+    display.set_clip(rect)
+    scale = GRAPH_H / GRAPH_MS * 1000.0
+
+    frames = list(profiler.frames)[-GRAPH_W:]
+    left = rect.right - len(frames)
+    for i, frame in enumerate(frames):
+        bottom = rect.bottom
+        for name, seconds in profiler.totals(frame).items():
+            h = int(seconds * scale + 0.5)
+            if h:
+                display.fill(color(name), (left + i, bottom - h, 1, h))
+                bottom -= h
+            if bottom <= rect.top:
+                break
+
+    phases, counters = profiler.summary()
+    lines = [
+        ("%s %.2f ms" % (name, ms), colors.get(name, COLOR3))
+        for name, ms in sorted(phases.items())
+    ]
+    lines += [("%s %.0f" % item, COLOR3) for item in sorted(counters.items())]
+    ty = rect.top + 2
+    for line, lineColor in lines:
+        image = render_text(line, 12, lineColor)
+        display.fill(COLOR0, image.get_rect(topleft=(rect.left + 2, ty)))
+        display.blit(image, (rect.left + 2, ty))
+        ty += image.get_height()
+    display.set_clip(None)
+    return rect
@@ -1,9 +1,11 @@
+import numpy as np
 import pygame
 
+from .fonts import render_text
+
 
 def render_string(s, color):
-    font = pygame.font.Font(None, 28)
-    return font.render(s, True, color)
+    return render_text(s, 28, color)
 
 
 def render_level(display, level):
@@ -40,3 +42,38 @@ def render_silhouette_multisampled(shape, color):
                 alphaArray[x // 2][y // 2] += 255 // 4
 
     return surface
+
+
+def rasterize_silhouette(shape, color, samples=1):
+    """Renders shape in one pass over the whole pixel grid.
+
+    Each pixel is sampled samples * samples times using shape.hit_array.
+    With samples=1 and samples=2 the output matches render_silhouette and
+    render_silhouette_multisampled respectively, pixel by pixel.
+    """
+    return colorize_silhouette(rasterize_coverage(shape, samples), color)
+
+
+def rasterize_coverage(shape, samples=1):
+    """Returns the alpha mask of shape as a (w, h) uint8 array."""
+    x0, y0, w, h = (int(val) for val in shape.aabb)
+    if w == 0 or h == 0:
+        return np.zeros((w, h), dtype=np.uint8)
+
+    xs = x0 + np.arange(w * samples) / float(samples)
+    ys = y0 + np.arange(h * samples) / float(samples)
+    hits = shape.hit_array(xs[:, np.newaxis], ys[np.newaxis, :])
+    counts = hits.reshape(w, samples, h, samples).sum(axis=(1, 3))
+    return (counts * (255 // samples ** 2)).astype(np.uint8)
+
+
+def colorize_silhouette(mask, color):
+    """Turns an alpha mask into a surface, colored where it is not clear."""
+    surface = pygame.Surface(mask.shape, pygame.SRCALPHA, 32)
+    if mask.size:
+        colorArray = pygame.surfarray.pixels3d(surface)
+        alphaArray = pygame.surfarray.pixels_alpha(surface)
+        colorArray[mask > 0] = color
+        alphaArray[...] = mask
+
+    return surface
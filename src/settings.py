@@ -1,5 +1,11 @@
 # Rendering
 ANTIALIASING = True
+SUPERSAMPLING = 2  # Samples per pixel side when antialiasing
+SILHOUETTE_CACHE_BYTES = 32 * 2 ** 20
+SILHOUETTE_CACHE_DIR = None  # A directory keeping silhouettes across runs
+TEXT_CACHE_BYTES = 4 * 2 ** 20
+ASSET_WORKERS = 0  # Threads baking level sprites behind the menu, 0 for one per core
+ASSET_BATCH = 64  # Items per job of AssetPipeline.submit_batches
 COLOR0 = 255, 255, 255
 COLOR1 = 255, 127, 0
 COLOR2 = 255, 0, 0
@@ -9,7 +15,33 @@ COLOR5 = 211, 211, 211
 
 # Gameplay
 MAX_BALL_BUMPS = 64
+MAX_PARTICLES = 1024
+PARTICLE_OVERFLOW = "recycle"  # reuse the particle nearest its end, or drop the new one
 
-# Dynamics
+# Physics
+SPATIAL_INDEX = "grid"  # Block broad-phase: quadtree, grid or bvh
+COLLISION_MODE = "discrete"  # discrete, swept to stop tunneling at any speed, or field
+MAX_SWEEP_BOUNCES = 4  # Block bounces per ball per step when swept
+FIELD_CELL = 4.0  # Pixels between distance field samples, in field mode
+FIELD_REACH = 32.0  # Distances clamped beyond, must exceed the ball radius
+FIELD_TILE = 16  # Samples per side of the tiles recomputed when blocks go
+BALL_COLLISIONS = False  # Whether balls bounce off each other, for multiball play
+CANDIDATE_CACHE = True  # Reuse each ball's block candidates while it stays near
+CANDIDATE_MARGIN = 4  # Pixels a cached query region reaches around a ball
+CANDIDATE_LOOKAHEAD = 4  # Steps of motion a cached query region reaches ahead
+BATCHED_QUERY_BALLS = 64  # Balls from which a batched index is asked for all at once
+SCALAR_BALLS = 32  # Balls below which discrete steps run on floats, not arrays
+
+# Dynamics, per tick
 GRAVITY = 0.04
 FRICTION = 0.003
+
+# Profiling
+PROFILER = False  # Record phase timings from the start, F3 toggles it anyway
+PROFILER_FRAMES = 300  # Frames kept
+
+# Timing
+FPS_LIMIT = 60
+TIMESTEP = 1.0 / 60.0  # Seconds per physics tick
+SUBSTEPS = 2  # Physics substeps per tick, more of them stop fast balls tunneling
+MAX_TICKS_PER_FRAME = 5  # Catch-up cap, any time beyond it is dropped
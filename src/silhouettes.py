@@ -0,0 +1,100 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+from .cache import LRUCache, surface_bytes
+from .render import colorize_silhouette, rasterize_coverage
+
+QUANTUM = 1e-3  # Shape parameters closer than this share a silhouette
+
+
+class SilhouetteCache:
+    """Silhouette surfaces, cached in memory and optionally on disk.
+
+    Silhouettes are keyed on the shape type, its quantized parameters and
+    the number of samples. The alpha mask of a shape is rasterized once:
+    every color of it, like the touched variant of a block, is produced by
+    coloring that mask. Masks are also kept as .npy files in directory,
+    when given, so they survive restarts.
+
+    Silhouettes may be made from several threads at once, see assets.
+    Two threads asking for the same new silhouette both rasterize it.
+    """
+
+    def __init__(self, maxBytes=32 * 2 ** 20, directory=None):
+        self.masks = LRUCache(maxBytes // 2, lambda mask: mask.nbytes)
+        self.surfaces = LRUCache(maxBytes // 2, surface_bytes)
+        self.directory = directory
+        self.lock = threading.Lock()  # Guards the caches and the counts
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.hits = 0  # Silhouettes found in memory
+        self.loads = 0  # Masks found on disk
+        self.rasterizations = 0
+
+    @staticmethod
+    def key(shape, samples):
+        kind = type(shape)
+        params = np.concatenate([np.ravel(p) for p in kind.pack([shape])])
+        quantized = np.round(params / QUANTUM).astype(np.int64)
+        return kind.__name__, tuple(quantized.tolist()), samples
+
+    def get(self, shape, color, samples=1):
+        """Returns the silhouette of shape, like rasterize_silhouette."""
+        key = self.key(shape, samples)
+        surfaceKey = key + (tuple(color),)
+        with self.lock:
+            surface = self.surfaces.get(surfaceKey)
+            if surface is not None:
+                self.hits += 1
+                return surface
+
+        surface = colorize_silhouette(self.mask(shape, samples, key), color)
+        with self.lock:
+            self.surfaces.put(surfaceKey, surface)
+        return surface
+
+    def mask(self, shape, samples=1, key=None):
+        """Returns the alpha mask of shape, rasterizing it if need be."""
+        if key is None:
+            key = self.key(shape, samples)
+        with self.lock:
+            mask = self.masks.get(key)
+        if mask is not None:
+            return mask
+
+        path = self._path(key)
+        if path and os.path.exists(path):
+            mask = np.load(path)
+            loaded = True
+        else:
+            mask = rasterize_coverage(shape, samples)
+            loaded = False
+            if path:
+                # Write then rename, so a half written file is never loaded.
+                # The name is per thread, as two may write the same mask.
+                tmp = "%s.%i.tmp.npy" % (path, threading.get_ident())
+                np.save(tmp, mask)
+                os.replace(tmp, path)
+        with self.lock:
+            if loaded:
+                self.loads += 1
+            else:
+                self.rasterizations += 1
+            self.masks.put(key, mask)
+        return mask
+
+    def _path(self, key):
+        if not self.directory:
+            return None
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest + ".npy")
+
+    def clear(self):
+        """Empties the memory cache, leaving the disk store alone."""
+        with self.lock:
+            self.masks.clear()
+            self.surfaces.clear()
@@ -0,0 +1,58 @@
+"""Times starting up: imports, building contexts and the first frame.
+
+Stages are always recorded, they cost a timer call each. With
+--startup-profile, mustyqatse.py prints them after the first frame, and
+after the first frame of every context built later on.
+"""
+import sys
+from timeit import default_timer
+
+
+class _Stage:
+    __slots__ = "timer", "name", "start"
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer.depth += 1
+        self.start = default_timer()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = default_timer() - self.start
+        timer = self.timer
+        timer.depth -= 1
+        timer.stages.append((self.name, self.start, seconds, timer.depth))
+
+
+class StartupTimer:
+    def __init__(self):
+        self.start = default_timer()
+        self.enabled = False  # Whether report prints
+        self.stages = []  # (name, start, seconds, depth), not yet reported
+        self.depth = 0
+
+    def stage(self, name):
+        """Returns a context manager timing its block as stage name."""
+        return _Stage(self, name)
+
+    def report(self, file=sys.stdout):
+        """Prints the stages recorded since the last report, nested stages
+        indented under theirs, then forgets them."""
+        if not self.stages:
+            return
+        now = default_timer()
+        if self.enabled:
+            # Stages are recorded as they end, so put them back in start order
+            stages = sorted(self.stages, key=lambda stage: stage[1])
+            for name, start, seconds, depth in stages:
+                print(
+                    "%8.1f ms  %s%s" % (seconds * 1000.0, "  " * depth, name), file=file
+                )
+            print("%8.1f ms  since launch" % ((now - self.start) * 1000.0), file=file)
+        self.stages = []
+
+
+startup = StartupTimer()
@@ -0,0 +1,31 @@
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed ticks.
+
+    Frame time is accumulated and spent dt at a time. When a frame is so long
+    that more than maxTicks would be due, the excess is dropped: the game
+    slows down instead of spiralling into ever longer catch-up frames.
+    """
+
+    def __init__(self, dt=1.0 / 60.0, maxTicks=5):
+        self.dt = dt
+        self.maxTicks = maxTicks
+        self.accumulator = 0.0
+
+    def advance(self, elapsed):
+        """Adds elapsed seconds, returns how many ticks to simulate."""
+        self.accumulator += elapsed
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.maxTicks:
+            ticks = self.maxTicks
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.dt
+        return ticks
+
+    @property
+    def alpha(self):
+        """How far, from 0 to 1, the next tick is. Useful to interpolate."""
+        return self.accumulator / self.dt
+
+    def reset(self):
+        self.accumulator = 0.0
@@ -0,0 +1,115 @@
+from math import pi
+
+import numpy as np
+
+EASING_STEPS = 1024
+
+# Easing curves sampled over t in [0, 1], one row each
+_t = np.linspace(0.0, 1.0, EASING_STEPS)
+CURVES = np.stack([_t, np.sin(_t * pi * 0.5), _t * _t * (3.0 - 2.0 * _t)])
+EASINGS = {"linear": 0, "sin": 1, "smooth": 2}
+del _t
+
+
+def ease(easing, t):
+    """Looks up easing curves at times t, arrays of the same shape.
+
+    easing holds indices of CURVES, t values from 0 to 1.
+    """
+    return CURVES[easing, (np.asarray(t) * (EASING_STEPS - 1) + 0.5).astype(int)]
+
+
+class Tweens:
+    """Every running tween, advanced together one tick at a time.
+
+    A tween goes from start to end over a number of ticks along an easing
+    curve. Its current value is value(handle). When tweens end, their
+    callbacks are called after the whole tick is done, in one batch, so a
+    callback may start new tweens.
+    """
+
+    def __init__(self, capacity=16):
+        self.active = np.zeros(capacity, dtype=bool)
+        self.start = np.zeros(capacity)
+        self.delta = np.zeros(capacity)
+        self.values = np.zeros(capacity)
+        self.step = np.zeros(capacity, dtype=int)
+        self.steps = np.ones(capacity, dtype=int)
+        self.easing = np.zeros(capacity, dtype=int)
+        self.callbacks = [None] * capacity
+
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return int(self.active.sum())
+
+    def _grow(self):
+        capacity = len(self.active)
+        for name in "active", "start", "delta", "values", "step", "steps", "easing":
+            old = getattr(self, name)
+            new = np.ones(capacity * 2, dtype=old.dtype)
+            new[:capacity] = old
+            setattr(self, name, new)
+        self.active[capacity:] = False
+        self.callbacks += [None] * capacity
+        self.free = list(range(capacity * 2 - 1, capacity - 1, -1))
+
+    def add(self, start, end, steps, easing="sin", on_done=None):
+        """Starts a tween of steps ticks, returns its handle.
+
+        @param easing:
+            The name of the curve, a key of EASINGS.
+
+        @param on_done:
+            Called without arguments once the tween reaches end.
+        """
+        if not self.free:
+            self._grow()
+        i = self.free.pop()
+        self.active[i] = True
+        self.start[i] = self.values[i] = start
+        self.delta[i] = end - start
+        self.step[i] = 0
+        self.steps[i] = max(int(steps), 1)
+        self.easing[i] = EASINGS[easing]
+        self.callbacks[i] = on_done
+        return i
+
+    def value(self, handle):
+        return self.values[handle].item()
+
+    def cancel(self, handle):
+        """Stops a running tween without calling its callback."""
+        if self.active[handle]:
+            self.active[handle] = False
+            self.callbacks[handle] = None
+            self.free.append(handle)
+
+    def tick(self):
+        running = np.flatnonzero(self.active)
+        if not len(running):
+            return
+        step = self.step[running] + 1
+        self.step[running] = step
+        t = step / self.steps[running]
+        self.values[running] = self.start[running] + self.delta[running] * ease(
+            self.easing[running], t
+        )
+
+        done = running[step >= self.steps[running]].tolist()
+        if not done:
+            return
+        self.active[done] = False
+        callbacks = []
+        for i in done:
+            if self.callbacks[i] is not None:
+                callbacks.append(self.callbacks[i])
+                self.callbacks[i] = None
+            self.free.append(i)
+        for callback in callbacks:
+            callback()
+
+    def clear(self):
+        self.active[:] = False
+        self.callbacks = [None] * len(self.active)
+        self.free = list(range(len(self.active) - 1, -1, -1))